@@ -0,0 +1,40 @@
+"""add_seller_sku_registered_at_index_to_pc_preco_historico
+
+Revision ID: d4b1e7a9c3f2
+Revises: 2f0cdc100f14
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b1e7a9c3f2'
+down_revision: Union[str, None] = '2f0cdc100f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'idx_preco_historico_sellerid_sku_registered_at'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não roda dentro de uma transação e não bloqueia as escritas no histórico.
+    # O id, desempate da ordenação das listagens, entra no fim para que o índice já entregue a ordem completa.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            'pc_preco_historico',
+            ['seller_id', 'sku', sa.text('registered_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='pc_preco_historico', postgresql_concurrently=True, if_exists=True)
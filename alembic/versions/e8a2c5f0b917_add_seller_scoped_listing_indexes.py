@@ -0,0 +1,42 @@
+"""add_seller_scoped_listing_indexes
+
+Revision ID: e8a2c5f0b917
+Revises: d4b1e7a9c3f2
+Create Date: 2026-10-17 11:03:27.540612
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c5f0b917'
+down_revision: Union[str, None] = 'd4b1e7a9c3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices de busca e ordenação das listagens, que são sempre de um seller: seller_id vem primeiro e o id
+# (desempate da ordenação) por último, para que o filtro e a ordenação saiam de uma única varredura do índice.
+# Não são de cobertura: as páginas selecionam todas as colunas e seguem lendo as linhas na tabela (index scan).
+INDEXES = (
+    ('idx_preco_sellerid_por', 'pc_preco', ['seller_id', 'por', 'id']),
+    ('idx_preco_sellerid_de', 'pc_preco', ['seller_id', 'de', 'id']),
+    ('idx_alertas_sellerid', 'pc_alertas', ['seller_id', 'id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Um bloco autocommit para os três índices (como em d4b1e7a9c3f2): pc_preco e pc_alertas seguem recebendo
+    # escritas enquanto cada um é construído
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
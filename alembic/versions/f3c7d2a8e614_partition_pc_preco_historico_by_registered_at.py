@@ -0,0 +1,102 @@
+"""partition_pc_preco_historico_by_registered_at
+
+Revision ID: f3c7d2a8e614
+Revises: e8a2c5f0b917
+Create Date: 2026-10-17 14:26:09.177452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c7d2a8e614'
+down_revision: Union[str, None] = 'e8a2c5f0b917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'pc_preco_historico'
+OLD_TABLE = 'pc_preco_historico_legado'
+SEQUENCE = 'pc_preco_historico_id_seq'
+INDEX_NAME = 'idx_preco_historico_sellerid_sku_registered_at'
+INDEX_COLUMNS = ['seller_id', 'sku', sa.text('registered_at DESC'), sa.text('id DESC')]
+COLUMNS = 'id, sku, de, por, seller_id, registered_at, created_by, updated_by'
+# Meses criados à frente do atual; os seguintes ficam a cargo da tarefa de manutenção do worker
+MONTHS_AHEAD = 3
+
+
+def history_columns() -> list[sa.Column]:
+    return [
+        # A sequência da tabela original continua gerando os ids
+        sa.Column('id', sa.Integer(), server_default=sa.text(f"nextval('{SEQUENCE}'::regclass)"), nullable=False),
+        sa.Column('sku', sa.String(), nullable=False),
+        sa.Column('de', sa.Integer(), nullable=False),
+        sa.Column('por', sa.Integer(), nullable=False),
+        sa.Column('seller_id', sa.String(), nullable=False),
+        sa.Column('registered_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('created_by', postgresql.JSONB, nullable=False, server_default='{}'),
+        sa.Column('updated_by', postgresql.JSONB, nullable=False, server_default='{}'),
+    ]
+
+
+def replace_table(primary_key: list[str], **table_kwargs) -> None:
+    """
+    Recria pc_preco_historico com a chave e as opções informadas, copiando os registros da tabela atual.
+    """
+    op.rename_table(TABLE, OLD_TABLE)
+    op.execute(f'ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {OLD_TABLE}_pkey')
+    op.execute(f'ALTER INDEX IF EXISTS {INDEX_NAME} RENAME TO {INDEX_NAME}_legado')
+
+    op.create_table(TABLE, *history_columns(), sa.PrimaryKeyConstraint(*primary_key), **table_kwargs)
+    # A sequência passa para a nova tabela, para não ser removida junto com a antiga
+    op.execute(f'ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+
+
+def copy_rows_and_drop_old_table() -> None:
+    op.execute(f'INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}')
+    op.create_index(INDEX_NAME, TABLE, INDEX_COLUMNS)
+    op.drop_table(OLD_TABLE)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Em uma tabela particionada, a chave primária precisa incluir a coluna de particionamento
+    replace_table(['id', 'registered_at'], postgresql_partition_by='RANGE (registered_at)')
+
+    # Partições mensais (UTC) do mês do registro mais antigo até MONTHS_AHEAD meses à frente do atual,
+    # com o nome pc_preco_historico_pAAAAMM
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            mes timestamp := date_trunc(
+                'month', coalesce((SELECT min(registered_at) FROM {OLD_TABLE}), now()) AT TIME ZONE 'UTC'
+            );
+            fim timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD + 1} months';
+        BEGIN
+            WHILE mes < fim LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {TABLE} FOR VALUES FROM (%L) TO (%L)',
+                    '{TABLE}_p' || to_char(mes, 'YYYYMM'),
+                    mes AT TIME ZONE 'UTC',
+                    (mes + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                mes := mes + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+    # Recebe os registros fora das partições mensais (ex.: a tarefa de manutenção parada), em vez de recusá-los
+    op.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    copy_rows_and_drop_old_table()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Remover a tabela particionada remove também as partições
+    replace_table(['id'])
+    copy_rows_and_drop_old_table()
@@ -17,10 +17,22 @@ def create_app(
     @asynccontextmanager
     async def _lifespan(_app: FastAPI):
         # Qualquer ação necessária na inicialização
-        ...
+        container = getattr(_app, "container", None)
+        price_cache = container.price_cache_service() if container is not None else None
+        if price_cache is not None:
+            price_cache.start_invalidation_listener()
+        history_writer = None
+        if container is not None:
+            await container.sql_client().prewarm(settings.app_db_pool_prewarm)
+            history_writer = container.price_history_writer()
+            history_writer.start()
         yield
         # Limpando a bagunça antes de terminar
-        ...
+        if history_writer is not None:
+            # Grava o histórico ainda em buffer antes de encerrar
+            await history_writer.stop()
+        if price_cache is not None:
+            await price_cache.stop_invalidation_listener()
 
     app = FastAPI(
         lifespan=_lifespan,
@@ -4,6 +4,7 @@ from fastapi import Header
 
 from app.api.common.schemas.response import ErrorDetail
 from app.common.exceptions import BadRequestException
+from app.integrations.database.sqlalchemy_client import set_read_your_writes_key
 
 
 async def get_required_seller_id(
@@ -21,4 +22,6 @@ async def get_required_seller_id(
             )
         ]
         raise BadRequestException(details=details)
+    # Depois de uma escrita do seller, as suas leituras não vão às réplicas enquanto elas podem estar atrasadas
+    set_read_your_writes_key(seller_id)
     return seller_id
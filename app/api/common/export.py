@@ -0,0 +1,213 @@
+import csv
+import io
+from contextlib import aclosing
+from datetime import datetime
+from types import UnionType
+from typing import Any, AsyncGenerator, AsyncIterator, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from app.common.exceptions.export_exceptions import ExportFormatUnavailableException
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependência opcional (requirements/parquet.txt)
+    pa = pq = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Tamanho aproximado de cada bloco enviado ao cliente nas exportações
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Linhas por row group nas exportações em Parquet: cada row group é enviado ao cliente assim que fica completo
+PARQUET_ROW_GROUP_ROWS = 10_000
+
+
+async def ndjson_stream(
+    items: AsyncGenerator[BaseModel, None], schema: type[BaseModel], chunk_bytes: int = EXPORT_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Codifica os itens em NDJSON (um objeto JSON por linha) à medida que são lidos, em blocos de cerca de
+    chunk_bytes: a memória usada não depende da quantidade de itens.
+    Se o envio for interrompido (ex.: o cliente desconectou), o iterador de itens é fechado, liberando a consulta.
+
+    :param items: Itens a exportar (ex.: CrudService.stream).
+    :param schema: Schema de resposta; somente os campos dele são exportados.
+    :param chunk_bytes: Tamanho aproximado de cada bloco.
+    """
+    fields = set(schema.model_fields)
+    buffer = bytearray()
+    async with aclosing(items):
+        async for item in items:
+            buffer += item.model_dump_json(include=fields).encode()
+            buffer += b"\n"
+            if len(buffer) >= chunk_bytes:
+                yield bytes(buffer)
+                buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def export_columns(schema: type[BaseModel]) -> list[tuple[str, tuple[str, ...], type]]:
+    """
+    Colunas tabulares (CSV e Parquet) do schema: os campos dele, com os campos dos modelos aninhados achatados
+    em "campo.subcampo" (ex.: created_by.name).
+
+    :param schema: Schema de resposta.
+    :return: Lista de (nome da coluna, caminho do valor no item, tipo do valor).
+    """
+    columns = []
+    for name, field in schema.model_fields.items():
+        annotation = _unwrap_optional(field.annotation)
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            columns += [(f"{name}.{column}", (name, *path), kind) for column, path, kind in export_columns(annotation)]
+        else:
+            columns.append((name, (name,), annotation))
+    return columns
+
+
+def _row_values(item: BaseModel, columns: list[tuple[str, tuple[str, ...], type]], fields: set[str]) -> list:
+    data = item.model_dump(include=fields)
+    values = []
+    for _, path, _ in columns:
+        value: Any = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(value)
+    return values
+
+
+async def csv_stream(
+    items: AsyncGenerator[BaseModel, None], schema: type[BaseModel], chunk_bytes: int = EXPORT_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Codifica os itens em CSV, com cabeçalho, à medida que são lidos, em blocos de cerca de chunk_bytes
+    (ver ndjson_stream). As colunas seguem export_columns; datas no formato ISO 8601 e valores ausentes vazios.
+
+    :param items: Itens a exportar (ex.: CrudService.stream).
+    :param schema: Schema de resposta; somente os campos dele são exportados.
+    :param chunk_bytes: Tamanho aproximado de cada bloco.
+    """
+    columns = export_columns(schema)
+    fields = set(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([name for name, _, _ in columns])
+    async with aclosing(items):
+        async for item in items:
+            writer.writerow(
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in _row_values(item, columns, fields)
+                ]
+            )
+            if buffer.tell() >= chunk_bytes:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def parquet_available() -> bool:
+    """
+    Indica se a exportação em Parquet está disponível (pyarrow instalado, ver requirements/parquet.txt).
+    """
+    return pa is not None
+
+
+class _ParquetSink(io.RawIOBase):
+    """
+    Destino em memória do ParquetWriter, esvaziado a cada bloco enviado ao cliente.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _arrow_type(kind: type):
+    types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), datetime: pa.timestamp("us", tz="UTC")}
+    return types.get(kind, pa.string())
+
+
+def _record_batch(values: list[list], arrow_schema):
+    arrays = []
+    for column_values, field in zip(values, arrow_schema):
+        if pa.types.is_string(field.type):
+            column_values = [
+                value if value is None or isinstance(value, str) else str(value) for value in column_values
+            ]
+        arrays.append(pa.array(column_values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+async def _parquet_chunks(
+    items: AsyncGenerator[BaseModel, None], schema: type[BaseModel], row_group_rows: int
+) -> AsyncIterator[bytes]:
+    columns = export_columns(schema)
+    fields = set(schema.model_fields)
+    arrow_schema = pa.schema([pa.field(name, _arrow_type(kind)) for name, _, kind in columns])
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, arrow_schema)
+    values: list[list] = [[] for _ in columns]
+    try:
+        async with aclosing(items):
+            async for item in items:
+                for column_values, value in zip(values, _row_values(item, columns, fields)):
+                    column_values.append(value)
+                if len(values[0]) >= row_group_rows:
+                    writer.write_batch(_record_batch(values, arrow_schema))
+                    values = [[] for _ in columns]
+                    yield sink.drain()
+        if values[0]:
+            writer.write_batch(_record_batch(values, arrow_schema))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def parquet_stream(
+    items: AsyncGenerator[BaseModel, None], schema: type[BaseModel], row_group_rows: int = PARQUET_ROW_GROUP_ROWS
+) -> AsyncIterator[bytes]:
+    """
+    Codifica os itens em Parquet à medida que são lidos: cada row_group_rows linhas formam um row group,
+    enviado assim que fica completo; o rodapé do arquivo segue no último bloco. A memória usada é a de um
+    row group. As colunas seguem export_columns, com tipos do Parquet (textos para os tipos sem correspondência).
+
+    :param items: Itens a exportar (ex.: CrudService.stream).
+    :param schema: Schema de resposta; somente os campos dele são exportados.
+    :param row_group_rows: Linhas por row group.
+    :raises ExportFormatUnavailableException: Se o pyarrow não estiver instalado (antes de iniciar a resposta).
+    """
+    if not parquet_available():
+        raise ExportFormatUnavailableException(export_format="parquet")
+    return _parquet_chunks(items, schema, row_group_rows)
@@ -7,6 +7,11 @@ from starlette import status
 from app.container import Container
 
 if TYPE_CHECKING:
+    from app.integrations.cache.cache_metrics import CacheMetrics
+    from app.integrations.cache.local_cache_adapter import LocalCacheAdapter
+    from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
+    from app.services.price_cache_service import PriceCacheService
+    from app.services.price_history_writer import PriceHistoryWriter
     from app.settings import AppSettings
 
 
@@ -51,4 +56,45 @@ def add_health_check_router(app: FastAPI, prefix: str = "/api") -> None:
             "service": "Gerenciamento de Preços do Marketplace",
         }
 
+    @health_router.get(
+        path="/cache",
+        summary="Estatísticas do cache de preços",
+        include_in_schema=False,
+        operation_id="get_cache_stats",
+        name="Verificar acertos e falhas do cache de preços",
+        description="Retorna os contadores de acerto e falha de cada nível do cache de preços desta réplica",
+        status_code=200,
+    )
+    @inject
+    async def cache_stats(
+        price_cache: "PriceCacheService" = Depends(Provide[Container.price_cache_service]),
+    ):
+        return price_cache.stats()
+
+    @health_router.get(
+        path="/metrics",
+        summary="Métricas do cache",
+        include_in_schema=False,
+        operation_id="get_cache_metrics",
+        name="Verificar métricas do cache por família de chaves",
+        description=(
+            "Retorna, por família de chaves (price, price-list, suggestion), os contadores de acertos, falhas, "
+            "gravações e invalidações e os histogramas de latência de leitura e de carga desta réplica, "
+            "além da ocupação do pool de conexões com o banco, do tempo de espera por uma conexão e da gravação "
+            "do histórico de preços (registros em buffer e gravados)"
+        ),
+        status_code=200,
+    )
+    @inject
+    async def cache_metrics(
+        metrics: "CacheMetrics" = Depends(Provide[Container.cache_metrics]),
+        local_cache: "LocalCacheAdapter" = Depends(Provide[Container.local_cache]),
+        sql_client: "SQLAlchemyClient" = Depends(Provide[Container.sql_client]),
+        history_writer: "PriceHistoryWriter" = Depends(Provide[Container.price_history_writer]),
+    ):
+        return {
+            "cache": {"local": local_cache.stats(), "families": metrics.snapshot()},
+            "database": {"pool": sql_client.pool_stats(), "history_writer": history_writer.stats()},
+        }
+
     app.include_router(health_router)
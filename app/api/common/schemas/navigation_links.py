@@ -24,16 +24,34 @@ class NavigationLinks(BaseModel):
         has_next: bool = False,
         filters: str | None = None,
         sorting: str | None = None,
+        cursor: str | None = None,
+        next_cursor: str | None = None,
     ):
+        """
+        :param cursor: Cursor da página atual, se ela foi obtida por cursor (o offset é ignorado).
+        :param next_cursor: Cursor da próxima página; quando informado, o link next o utiliza no lugar do offset.
+            Páginas obtidas por cursor não têm página anterior calculável: previous aponta para a primeira página.
+        """
         filters = f"&{filters}" if filters else ""
         sorting = f"&_sort={sorting}" if sorting else ""
         query_params = f"{filters}{sorting}"
         request_path = request_path or ""
+        if cursor:
+            offset = 0
+            current = f"{request_path}?_cursor={cursor}&_limit={limit}{query_params}"
+        else:
+            current = f"{request_path}?_offset={offset}&_limit={limit}{query_params}"
         prev_offset = offset - limit if offset - limit >= 0 else 0
+        if next_cursor:
+            next_link = f"{request_path}?_cursor={next_cursor}&_limit={limit}{query_params}"
+        elif has_next and not cursor:
+            next_link = f"{request_path}?_offset={offset + limit}&_limit={limit}{query_params}"
+        else:
+            next_link = None
         return cls(
             previous=(f"{request_path}?_offset={prev_offset}&_limit={limit}{query_params}"),
-            next=(f"{request_path}?_offset={offset + limit}&_limit={limit}{query_params}" if has_next else None),
-            current=f"{request_path}?_offset={offset}&_limit={limit}{query_params}",
+            next=next_link,
+            current=current,
         )
 
 
@@ -1,18 +1,60 @@
+import base64
+import binascii
+import json
 from typing import Sequence
 from urllib.parse import urlencode
 
 from fastapi import Query
 from pydantic import BaseModel, Field
+from pydantic_core import to_jsonable_python
 from starlette.requests import Request
 
 from app.settings import api_settings
 
 from .navigation_links import NavigationLinks
-from .response import ListResponse, PageResponse, get_list_response
+from .response import CountMode, ListResponse, PageResponse, get_list_response
 
 PAGE_DEFAULT_LIMIT = api_settings.pagination.default_limit
 PAGE_MAX_LIMIT = api_settings.pagination.max_limit
 
+# Parâmetros de paginação: não são repetidos como filtros nos links de navegação
+PAGINATION_PARAMS = ("_limit", "_offset", "_sort", "_cursor", "_count", "limit", "offset")
+
+
+def encode_cursor(keys: dict, sort: str | None) -> str:
+    """
+    Gera o cursor opaco de uma página: os valores de ordenação e o id do último registro entregue,
+    junto com a ordenação em que foram obtidos.
+
+    :param keys: Dicionário campo -> valor do último registro (campos de ordenação e "id").
+    :param sort: Ordenação da listagem (ex: "por:desc").
+    :return: Cursor em base64 url-safe, sem padding.
+    """
+    payload = json.dumps({"s": sort or "", "k": to_jsonable_python(keys)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str | None) -> dict:
+    """
+    Lê um cursor gerado por encode_cursor.
+
+    :param cursor: Cursor recebido no parâmetro _cursor.
+    :param sort: Ordenação da requisição atual; deve ser a mesma do cursor.
+    :return: Dicionário campo -> valor do último registro da página anterior.
+    :raises InvalidCursorException: Se o cursor for inválido ou de outra ordenação.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        keys = payload["k"]
+        valid = payload["s"] == (sort or "") and isinstance(keys, dict) and "id" in keys
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        from app.common.exceptions.pagination_exceptions import InvalidCursorException
+
+        raise InvalidCursorException(cursor)
+    return keys
+
 
 class Paginator(BaseModel):
     """
@@ -33,6 +75,36 @@ class Paginator(BaseModel):
     sort: str | None = Field(
         default=None, description="Campos e direção de ordenação (ex: 'campo:asc,outro_campo:desc')"
     )
+    cursor: str | None = Field(
+        default=None, description="Cursor da página (link next); quando informado, o offset é ignorado"
+    )
+    query_filters: dict[str, str] = Field(
+        default_factory=dict, description="Demais parâmetros da requisição, repetidos nos links de navegação"
+    )
+    count: CountMode | None = Field(
+        default=None, description="Modo de contagem do total de registros dos filtros; sem ele, o total não é obtido"
+    )
+    total: int | None = Field(default=None, description="Total de registros dos filtros, preenchido pela consulta")
+
+    @property
+    def fetch_limit(self) -> int:
+        """
+        Quantidade de registros a buscar: a página e um registro a mais, que indica se há uma próxima página
+        (ver has_next) e não é entregue.
+        """
+        return self.limit + 1
+
+    def has_next(self, results: Sequence[BaseModel] | None) -> bool:
+        """
+        Indica se há uma próxima página, pelo registro a mais buscado além da página (ver fetch_limit).
+        """
+        return results is not None and len(results) > self.limit
+
+    def page(self, results: Sequence[BaseModel] | None) -> list:
+        """
+        Registros da página, sem o registro a mais de fetch_limit.
+        """
+        return list(results[: self.limit]) if results else []
 
     def get_sort_order(self) -> dict[str, int] | None:
         if not self.sort:
@@ -47,41 +119,74 @@ class Paginator(BaseModel):
             sort_data[field_key] = order
         return sort_data
 
+    def get_cursor_keys(self) -> dict | None:
+        """
+        :return: Valores de ordenação e id do último registro da página anterior, ou None sem cursor.
+        :raises InvalidCursorException: Se o cursor for inválido.
+        """
+        if not self.cursor:
+            return None
+        return decode_cursor(self.cursor, self.sort)
+
+    def next_cursor(self, results: Sequence[BaseModel] | None) -> str | None:
+        """
+        Cursor da página seguinte, a partir do último registro da página atual.
+        A consulta da próxima página parte desses valores (keyset), sem OFFSET: o custo é o mesmo em qualquer
+        profundidade. Só é gerado se houver uma próxima página (ver has_next).
+        """
+        if results is None or not self.has_next(results):
+            return None
+        last = results[self.limit - 1]
+        keys = {field: getattr(last, field) for field in self.get_sort_order() or {} if hasattr(last, field)}
+        keys["id"] = getattr(last, "id", None)
+        if keys["id"] is None:
+            return None
+        return encode_cursor(keys, self.sort)
+
+    def get_links(self, results: Sequence[BaseModel] | None = None, filters: dict | None = None) -> NavigationLinks:
+        """
+        Links de navegação da página. O link next usa o cursor da próxima página.
+
+        :param filters: Filtros repetidos nos links. Se None, utiliza os parâmetros da própria requisição.
+        """
+        if filters is None:
+            filters = self.query_filters
+        filters_str = urlencode(
+            {attr: value for attr, value in filters.items() if attr not in PAGINATION_PARAMS and value is not None}
+        )
+        return NavigationLinks.build(
+            request_path=self.request_path,
+            offset=self.offset,
+            limit=self.limit,
+            filters=filters_str,
+            sorting=self.sort,
+            has_next=self.has_next(results),
+            cursor=self.cursor,
+            next_cursor=self.next_cursor(results),
+        )
+
     def paginate(
         self,
         results: Sequence[BaseModel] | None = None,
         filters: dict | None = None,
     ) -> ListResponse:
-        count = len(results) if results else 0
-        results = results[: self.limit] if results else []
-        has_next = count > self.limit
-        filters_str = (
-            urlencode(
-                {
-                    attr: value
-                    for attr, value in filters.items()
-                    if attr not in ("limit", "offset") and value is not None
-                }
-            )
-            if filters
-            else ""
-        )
+        """
+        Resposta da listagem a partir dos registros buscados com fetch_limit: entrega somente a página e usa o
+        registro a mais para o link next.
+        """
+        links = self.get_links(results, filters)
+        results = self.page(results)
 
         return get_list_response(
             results=results,
             page=PageResponse(
                 limit=self.limit,
                 offset=self.offset,
-                count=count - 1 if has_next else count,
-            ),
-            links=NavigationLinks.build(
-                request_path=self.request_path,
-                offset=self.offset,
-                limit=self.limit,
-                has_next=has_next,
-                filters=filters_str,
-                sorting=self.sort,
+                count=len(results),
+                total=self.total,
+                total_mode=self.count if self.total is not None else None,
             ),
+            links=links,
         )
 
 
@@ -107,5 +212,28 @@ def get_request_pagination(
             " Ex: name:asc,email:desc."
         ),
     ),
+    _cursor: str | None = Query(
+        default=None,
+        description=(
+            "Cursor da página, obtido no link next da página anterior. Substitui o _offset e mantém o mesmo"
+            " custo em qualquer profundidade da listagem."
+        ),
+    ),
+    _count: CountMode | None = Query(
+        default=None,
+        description=(
+            "Inclui o total de registros dos filtros em meta.page.total: estimated (estimativa do banco, sem"
+            " percorrer os registros) ou exact (contagem exata, na mesma consulta da página)."
+        ),
+    ),
 ):
-    return Paginator(request_path=request.url.path, limit=_limit, offset=_offset, sort=_sort)
+    query_filters = {key: value for key, value in request.query_params.items() if key not in PAGINATION_PARAMS}
+    return Paginator(
+        request_path=request.url.path,
+        limit=_limit,
+        offset=_offset,
+        sort=_sort,
+        cursor=_cursor,
+        count=_count,
+        query_filters=query_filters,
+    )
@@ -12,6 +12,9 @@ T = TypeVar("T")
 
 PAGE_MAX_LIMIT = api_settings.pagination.max_limit
 
+# Modos de contagem do total de registros: estimativa do planejador do banco ou contagem exata
+CountMode = Literal["estimated", "exact"]
+
 
 class PageResponse(BaseModel):
     """
@@ -34,6 +37,12 @@ class PageResponse(BaseModel):
         description=("Posição do registro de referência, a partir dele serão retornados os próximos N registros."),
     )
     count: int | None = Field(default=0, description="Quantidade de registros que foi retornada nessa página.")
+    total: int | None = Field(
+        default=None, description="Total de registros dos filtros, quando solicitado pelo parâmetro _count."
+    )
+    total_mode: CountMode | None = Field(
+        default=None, description="Como o total foi obtido: estimated (estimativa do banco) ou exact."
+    )
     max_limit: int | None = Field(
         default=PAGE_MAX_LIMIT,
         description="Refere-se ao valor máximo que pode ser utilizado no campo limit.",
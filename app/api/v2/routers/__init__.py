@@ -1,2 +1,3 @@
 PRICE_PREFIX = "/precos"
+PRICE_EXPORT_PREFIX = "/precos-export"
 ALERTA_PREFIX = "/alertas"
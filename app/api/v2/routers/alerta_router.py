@@ -44,6 +44,7 @@ async def get(
     )
 
     filters = {
+        "seller_id": seller_id,
         "sku": sku,
     }
 
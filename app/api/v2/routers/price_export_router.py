@@ -0,0 +1,109 @@
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Literal, Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.common.auth_handler import do_auth
+from app.api.common.dependencies import get_required_seller_id
+from app.api.common.export import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    csv_stream,
+    ndjson_stream,
+    parquet_stream,
+)
+from app.api.common.responses.price_responses import BAD_REQUEST_RESPONSE, MISSING_HEADER_RESPONSE
+from app.api.v2.schemas.price_history_schema import PriceHistoryResponse
+from app.api.v2.schemas.price_schema import PriceResponse
+from app.container import Container
+from app.services.price_history_service import PriceHistoryService
+
+from . import PRICE_EXPORT_PREFIX
+
+if TYPE_CHECKING:
+    from app.services import PriceService
+
+
+# Fora de PRICE_PREFIX: em /precos/export e /precos/historico/export, as rotas /{sku} e /historico/{sku}
+# impediriam o acesso a um sku chamado "export"
+router = APIRouter(prefix=PRICE_EXPORT_PREFIX, tags=["Preços (v2)"], dependencies=[Depends(do_auth)])
+
+logger = logging.getLogger(__name__)
+
+
+# Exporta todas as precificações de um "seller_id"
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exportar todas as precificações de um seller (NDJSON)",
+    responses={
+        200: {
+            "description": "Uma precificação por linha (NDJSON), ordenadas por sku, enviadas à medida que são lidas",
+            "content": {NDJSON_MEDIA_TYPE: {}},
+        },
+        400: MISSING_HEADER_RESPONSE,
+    },
+)
+@inject
+async def export(
+    price_service: "PriceService" = Depends(Provide[Container.price_service]),
+    seller_id: str = Depends(get_required_seller_id),
+):
+    logger.info(
+        "Exportando precificações para seller_id: %s",
+        seller_id,
+        extra={"trace-id": "N/A"},
+    )
+
+    # As linhas são lidas por um cursor no servidor e codificadas em blocos: a memória não cresce com o catálogo
+    return StreamingResponse(
+        ndjson_stream(price_service.export_catalog(seller_id=seller_id), PriceResponse), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+# Exporta o histórico de precificação de um "seller_id"
+@router.get(
+    "/historico",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exportar o histórico de precificação de um seller (CSV ou Parquet)",
+    responses={
+        200: {
+            "description": "Histórico ordenado por sku e registro (mais recente primeiro), enviado à medida que é lido",
+            "content": {CSV_MEDIA_TYPE: {}, PARQUET_MEDIA_TYPE: {}},
+        },
+        400: BAD_REQUEST_RESPONSE,
+    },
+)
+@inject
+async def export_history(
+    price_history_service: "PriceHistoryService" = Depends(Provide[Container.price_history_service]),
+    seller_id: str = Depends(get_required_seller_id),
+    sku: Optional[list[str]] = Query(None, description="Restringir aos skus informados (pode ser repetido)"),
+    inicio: Optional[datetime] = Query(None, description="Início do período de registro (inclusive)"),
+    fim: Optional[datetime] = Query(None, description="Fim do período de registro (exclusive)"),
+    formato: Literal["csv", "parquet"] = Query("csv", description="Formato do arquivo exportado"),
+):
+    logger.info(
+        "Exportando histórico de precificação para seller_id: %s, formato: %s",
+        seller_id,
+        formato,
+        extra={"trace-id": "N/A"},
+    )
+
+    history = price_history_service.export(seller_id=seller_id, skus=sku, start=inicio, end=fim)
+    if formato == "parquet":
+        content, media_type = parquet_stream(history, PriceHistoryResponse), PARQUET_MEDIA_TYPE
+    else:
+        content, media_type = csv_stream(history, PriceHistoryResponse), CSV_MEDIA_TYPE
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="historico_precos.{formato}"'},
+    )
@@ -2,7 +2,7 @@ import logging
 from typing import TYPE_CHECKING, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from app.api.common.auth_handler import UserAuthInfo, do_auth, get_current_user
 from app.api.common.dependencies import get_required_seller_id
@@ -15,7 +15,18 @@ from app.api.common.responses.price_responses import (
 )
 from app.api.common.schemas import ListResponse, Paginator, get_request_pagination
 from app.api.v2.schemas.price_history_schema import PriceHistoryListResponse
-from app.api.v2.schemas.price_schema import PriceCreate, PricePatch, PriceResponse, PriceUpdate
+from app.api.v2.schemas.price_schema import (
+    PriceBatchGetItem,
+    PriceBatchGetRequest,
+    PriceBatchGetResponse,
+    PriceBatchUpsertRequest,
+    PriceBatchUpsertResponse,
+    PriceBatchUpsertResult,
+    PriceCreate,
+    PricePatch,
+    PriceResponse,
+    PriceUpdate,
+)
 from app.api.v2.schemas.price_suggestion_schema import PriceSuggestionResponse
 from app.container import Container
 from app.models import Price
@@ -65,6 +76,7 @@ async def get(
     )
 
     filters = {
+        "seller_id": seller_id,
         "de__lt": preco_de_less_than,
         "de__gt": preco_de_greater_than,
         "por__lt": preco_por_less_than,
@@ -77,6 +89,83 @@ async def get(
     return paginator.paginate(results=results)
 
 
+# Busca precificações de vários "sku" de um "seller_id"
+@router.post(
+    "/batch-get",
+    response_model=PriceBatchGetResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Recuperar precificações de vários skus de um seller",
+    responses={400: MISSING_HEADER_RESPONSE, 422: UNPROCESSABLE_ENTITY_RESPONSE},
+)
+@inject
+async def batch_get(
+    batch: PriceBatchGetRequest,
+    price_service: "PriceService" = Depends(Provide[Container.price_service]),
+    seller_id: str = Depends(get_required_seller_id),
+):
+    logger.info(
+        "Recuperando precificações em lote para seller_id: %s, quantidade de skus: %d",
+        seller_id,
+        len(batch.skus),
+        extra={"trace-id": "N/A"},
+    )
+
+    prices = await price_service.get_by_seller_id_and_skus(seller_id=seller_id, skus=batch.skus)
+
+    return PriceBatchGetResponse(
+        results=[
+            PriceBatchGetItem(
+                sku=sku,
+                found=price is not None,
+                price=PriceResponse.model_validate(price.model_dump()) if price is not None else None,
+            )
+            for sku, price in prices.items()
+        ]
+    )
+
+
+# Cria ou atualiza precificações de vários "sku" de um "seller_id"
+@router.post(
+    "/batch-upsert",
+    response_model=PriceBatchUpsertResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Criar ou atualizar precificações de vários skus de um seller",
+    responses={400: MISSING_HEADER_RESPONSE, 422: UNPROCESSABLE_ENTITY_RESPONSE},
+)
+@inject
+async def batch_upsert(
+    batch: PriceBatchUpsertRequest,
+    price_service: "PriceService" = Depends(Provide[Container.price_service]),
+    seller_id: str = Depends(get_required_seller_id),
+    user_info: UserAuthInfo = Depends(get_current_user),
+):
+    logger.info(
+        "Gravando precificações em lote para seller_id: %s, quantidade de itens: %d",
+        seller_id,
+        len(batch.items),
+        extra={"trace-id": user_info.trace_id},
+    )
+
+    prices = [
+        Price(**item.model_dump(), seller_id=seller_id, created_by=user_info.user, updated_by=user_info.user)
+        for item in batch.items
+    ]
+
+    results = await price_service.upsert_batch(seller_id=seller_id, prices=prices)
+
+    return PriceBatchUpsertResponse(
+        results=[
+            PriceBatchUpsertResult(
+                sku=result.sku,
+                status=result.status,
+                price=PriceResponse.model_validate(result.price.model_dump()) if result.price is not None else None,
+                errors=result.details or None,
+            )
+            for result in results
+        ]
+    )
+
+
 # Busca precificação por "seller_id" e "sku"
 @router.get(
     "/{sku}",
@@ -222,6 +311,7 @@ async def delete(
 @inject
 async def get_history_by_seller_id_and_sku(
     sku: str,
+    response: Response,
     price_history_service: "PriceHistoryService" = Depends(Provide[Container.price_history_service]),
     seller_id: str = Depends(get_required_seller_id),
     paginator: Paginator = Depends(get_request_pagination),
@@ -233,7 +323,16 @@ async def get_history_by_seller_id_and_sku(
         extra={"trace-id": "N/A"},
     )
 
-    return await price_history_service.get_by_seller_id_and_sku(seller_id=seller_id, sku=sku, paginator=paginator)
+    results = await price_history_service.get_by_seller_id_and_sku(seller_id=seller_id, sku=sku, paginator=paginator)
+
+    # O corpo continua sendo a lista do histórico: o cursor da próxima página segue no cabeçalho Link
+    next_link = paginator.get_links(results).next
+    if next_link:
+        response.headers["Link"] = f'<{next_link}>; rel="next"'
+    if paginator.total is not None:
+        response.headers["X-Total-Count"] = str(paginator.total)
+
+    return paginator.page(results)
 
 
 @router.post(
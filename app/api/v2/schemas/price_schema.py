@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 
 from app.api.common.schemas import ResponseEntity, SchemaType
-from app.api.common.schemas.response import ErrorResponse
+from app.api.common.schemas.response import ErrorDetail, ErrorResponse
+from app.models import PriceBatchStatus
 
 from .base_schema import SellerSkuBaseModel, SkuBaseModel
 
@@ -73,6 +74,72 @@ class PricePatch(SchemaType):
         json_schema_extra = {"example": {"de": 1000}}
 
 
+BATCH_GET_MAX_SKUS = 500
+
+
+class PriceBatchGetRequest(SchemaType):
+    """Lista de skus a consultar de uma só vez"""
+
+    skus: list[str] = Field(
+        ..., min_length=1, max_length=BATCH_GET_MAX_SKUS, description="Skus do seller a serem consultados"
+    )
+
+    class Config:
+        json_schema_extra = {"example": {"skus": ["sku001", "sku002"]}}
+
+
+class PriceBatchGetItem(SchemaType):
+    """Resultado da consulta de um sku"""
+
+    sku: str = Field(..., description="ID do produto do seller")
+    found: bool = Field(..., description="Indica se existe precificação para o sku")
+    price: PriceResponse | None = Field(None, description="Precificação encontrada")
+
+
+class PriceBatchGetResponse(SchemaType):
+    """Resultado da consulta em lote, um item por sku na ordem informada"""
+
+    results: list[PriceBatchGetItem] = Field(..., description="Resultado de cada sku")
+
+
+BATCH_UPSERT_MAX_ITEMS = 1000
+
+
+class PriceBatchUpsertItem(SkuBaseModel):
+    """Preço de um sku a criar ou atualizar no lote"""
+
+    de: int = Field(..., description="Preço de custo do produto")
+    por: int = Field(..., description="Preço de venda do produto")
+
+
+class PriceBatchUpsertRequest(SchemaType):
+    """Preços a criar ou atualizar de uma só vez, no máximo um item por sku"""
+
+    items: list[PriceBatchUpsertItem] = Field(
+        ..., min_length=1, max_length=BATCH_UPSERT_MAX_ITEMS, description="Preços a gravar"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {"items": [{"sku": "sku001", "de": 1000, "por": 800}, {"sku": "sku002", "de": 500, "por": 450}]}
+        }
+
+
+class PriceBatchUpsertResult(SchemaType):
+    """Resultado da gravação de um sku"""
+
+    sku: str = Field(..., description="ID do produto do seller")
+    status: PriceBatchStatus = Field(..., description="created, updated ou rejected")
+    price: PriceResponse | None = Field(None, description="Precificação gravada")
+    errors: list[ErrorDetail] | None = Field(None, description="Motivos da rejeição do item")
+
+
+class PriceBatchUpsertResponse(SchemaType):
+    """Resultado da gravação em lote, um item por sku na ordem informada"""
+
+    results: list[PriceBatchUpsertResult] = Field(..., description="Resultado de cada sku")
+
+
 class PriceErrorResponse(ErrorResponse):
     """Schema para erros de preços"""
 
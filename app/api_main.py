@@ -29,6 +29,7 @@ def init() -> FastAPI:
     # Autowiring
     container.wire(modules=["app.api.common.routers.health_check_routers"])
     container.wire(modules=["app.api.v2.routers.price_router"])
+    container.wire(modules=["app.api.v2.routers.price_export_router"])
     container.wire(modules=["app.api.v2.routers.alerta_router"])
 
     return app_api
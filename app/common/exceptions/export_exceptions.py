@@ -0,0 +1,40 @@
+from typing import TYPE_CHECKING
+
+from app.common.exceptions import BadRequestException
+
+if TYPE_CHECKING:
+    from app.api.common.schemas.response import ErrorDetail
+
+
+class ExportFormatUnavailableException(BadRequestException):
+    def __init__(self, export_format: str, details: list["ErrorDetail"] | None = None):
+        if details is None:
+            from app.api.common.schemas.response import ErrorDetail
+
+            details = [
+                ErrorDetail(
+                    message="Formato de exportação indisponível neste servidor.",
+                    location="query",
+                    slug="formato_indisponivel",
+                    field="formato",
+                    ctx={"value": export_format},
+                )
+            ]
+        super().__init__(details=details)
+
+
+class InvalidExportPeriodException(BadRequestException):
+    def __init__(self, start, end, details: list["ErrorDetail"] | None = None):
+        if details is None:
+            from app.api.common.schemas.response import ErrorDetail
+
+            details = [
+                ErrorDetail(
+                    message="O início do período deve ser anterior ao fim.",
+                    location="query",
+                    slug="periodo_invalido",
+                    field="inicio",
+                    ctx={"inicio": str(start), "fim": str(end)},
+                )
+            ]
+        super().__init__(details=details)
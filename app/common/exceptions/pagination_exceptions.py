@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from app.common.exceptions import BadRequestException
+
+if TYPE_CHECKING:
+    from app.api.common.schemas.response import ErrorDetail
+
+
+class InvalidCursorException(BadRequestException):
+    def __init__(self, cursor: str | None = None, details: list["ErrorDetail"] | None = None):
+        if details is None:
+            from app.api.common.schemas.response import ErrorDetail
+
+            details = [
+                ErrorDetail(
+                    message="Cursor de paginação inválido ou gerado para outra ordenação.",
+                    location="query",
+                    slug="cursor_invalido",
+                    field="_cursor",
+                    ctx={"value": cursor} if cursor is not None else {},
+                )
+            ]
+        super().__init__(details=details)
@@ -0,0 +1,32 @@
+from bisect import bisect_left
+
+# Limites superiores (ms) das faixas dos histogramas de latência
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com faixas fixas, no formato cumulativo usado pelo Prometheus.
+    """
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        # Uma posição por faixa e uma final para os valores acima da maior faixa
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds: float):
+        elapsed_ms = seconds * 1000
+        self._counts[bisect_left(self.buckets_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.sum_ms += elapsed_ms
+
+    def snapshot(self) -> dict:
+        buckets = {}
+        cumulative = 0
+        for limit, count in zip(self.buckets_ms, self._counts):
+            cumulative += count
+            buckets[f"le_{limit:g}ms"] = cumulative
+        buckets["le_inf"] = self.count
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": buckets}
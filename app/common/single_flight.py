@@ -0,0 +1,28 @@
+import asyncio
+from typing import Any, Callable, Coroutine
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes pela mesma chave: somente a primeira executa a função,
+    as demais aguardam e recebem o mesmo resultado (ou a mesma exceção).
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def do(self, key: str, fn: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # O shield evita que o cancelamento de quem chamou interrompa a carga compartilhada
+        return await asyncio.shield(task)
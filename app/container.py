@@ -1,13 +1,19 @@
 from dependency_injector import containers, providers
 
 from app.integrations.auth.keycloak_adapter import KeycloakAdapter
+from app.integrations.cache.cache_metrics import CacheMetrics
+from app.integrations.cache.cache_policy import CachePolicyRegistry
+from app.integrations.cache.codecs import get_codec
+from app.integrations.cache.local_cache_adapter import LocalCacheAdapter
 from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 from app.integrations.queue.rabbitmq_adapter import RabbitMQProducer
 from app.repositories import AlertRepository, PriceRepository
 from app.repositories.price_history_repository import PriceHistoryRepository
 from app.services import AlertService, HealthCheckService, PriceService
+from app.services.price_cache_service import PriceCacheService
 from app.services.price_history_service import PriceHistoryService
+from app.services.price_history_writer import PriceHistoryWriter
 from app.settings import AppSettings
 
 
@@ -16,14 +22,36 @@ class Container(containers.DeclarativeContainer):
 
     settings = providers.Singleton(AppSettings)
 
-    # Cliente SQLAlchemy
-    sql_client = providers.Singleton(SQLAlchemyClient, config.app_db_url)
-
     # Keycloak
     keycloak_adapter = providers.Singleton(KeycloakAdapter, config.app_openid_wellknown)
 
     # Redis
-    redis_adapter = providers.Singleton(RedisAsyncioAdapter, config.app_redis_url)
+    redis_adapter = providers.Singleton(
+        RedisAsyncioAdapter, config.app_redis_url, codec=providers.Singleton(get_codec, config.app_cache_codec)
+    )
+
+    # Cliente SQLAlchemy
+    sql_client = providers.Singleton(
+        SQLAlchemyClient,
+        config.app_db_url,
+        pool_size=config.app_db_pool_size,
+        max_overflow=config.app_db_max_overflow,
+        pool_recycle_seconds=config.app_db_pool_recycle_seconds,
+        pool_pre_ping=config.app_db_pool_pre_ping,
+        pool_timeout_seconds=config.app_db_pool_timeout_seconds,
+        replica_urls=config.app_db_replica_urls,
+        read_your_writes_seconds=config.app_db_read_your_writes_seconds,
+        prepared_statement_cache_size=config.app_db_prepared_statement_cache_size,
+        write_positions=redis_adapter,
+    )
+
+    cache_policies = providers.Singleton(CachePolicyRegistry, config.app_cache_policies)
+    cache_metrics = providers.Singleton(CacheMetrics)
+    local_cache = providers.Singleton(
+        LocalCacheAdapter,
+        max_size=config.app_local_cache_max_size,
+        ttl_seconds=config.app_local_cache_ttl_seconds,
+    )
 
     # Fila
     alert_queue_producer = providers.Factory(RabbitMQProducer, config.app_queue_url, config.app_alert_queue_name)
@@ -32,9 +60,11 @@ class Container(containers.DeclarativeContainer):
     )
 
     # Repositórios
-    price_repository = providers.Singleton(PriceRepository, sql_client)
-    price_history_repository = providers.Singleton(PriceHistoryRepository, sql_client)
-    alert_repository = providers.Singleton(AlertRepository, sql_client)
+    price_repository = providers.Singleton(PriceRepository, sql_client, core_reads=config.app_db_core_reads)
+    price_history_repository = providers.Singleton(
+        PriceHistoryRepository, sql_client, core_reads=config.app_db_core_reads
+    )
+    alert_repository = providers.Singleton(AlertRepository, sql_client, core_reads=config.app_db_core_reads)
 
     # Serviços
     health_check_service = providers.Singleton(
@@ -44,6 +74,29 @@ class Container(containers.DeclarativeContainer):
     price_history_service = providers.Singleton(
         PriceHistoryService,
         repository=price_history_repository,
+        export_batch_size=config.app_export_batch_size,
+        retention_months=config.app_history_retention_months,
+    )
+
+    price_history_writer = providers.Singleton(
+        PriceHistoryWriter,
+        price_history_service=price_history_service,
+        mode=config.app_history_write_mode,
+        batch_size=config.app_history_batch_size,
+        max_buffer_size=config.app_history_buffer_max_size,
+        flush_seconds=config.app_history_flush_seconds,
+        max_batch_retries=config.app_history_max_batch_retries,
+    )
+
+    price_cache_service = providers.Singleton(
+        PriceCacheService,
+        redis_adapter=redis_adapter,
+        local_cache=local_cache,
+        lock_enabled=config.app_cache_lock_enabled,
+        lock_lease_seconds=config.app_cache_lock_lease_seconds,
+        tombstone_ttl_seconds=config.app_cache_tombstone_ttl_seconds,
+        policies=cache_policies,
+        metrics=cache_metrics,
     )
 
     price_service = providers.Singleton(
@@ -54,6 +107,11 @@ class Container(containers.DeclarativeContainer):
         suggestion_queue_producer=suggestion_queue_producer,
         price_history_repo=price_history_repository,
         price_history_service=price_history_service,
+        price_cache=price_cache_service,
+        cache_policies=cache_policies,
+        cache_metrics=cache_metrics,
+        export_batch_size=config.app_export_batch_size,
+        history_writer=price_history_writer,
     )
 
     alert_service = providers.Singleton(AlertService, alert_repository=alert_repository)
@@ -0,0 +1,58 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.common.latency_histogram import LatencyHistogram
+
+
+class CacheMetrics:
+    """
+    Contadores e histogramas de latência do cache, por família de chaves (ver CachePolicyRegistry).
+
+    Eventos contados: hits e misses (leituras no Redis), sets, invalidations e refreshes.
+    Operações medidas: get (leitura no Redis) e load (carga na origem após uma falha).
+    Os valores são desta réplica e zeram a cada reinício.
+    """
+
+    def __init__(self):
+        self._counters: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._latencies: dict[str, dict[str, LatencyHistogram]] = defaultdict(dict)
+
+    def incr(self, family: str, event: str, amount: int = 1):
+        self._counters[family][event] += amount
+
+    def count(self, family: str, event: str) -> int:
+        return self._counters.get(family, {}).get(event, 0)
+
+    def observe(self, family: str, operation: str, seconds: float):
+        histogram = self._latencies[family].get(operation)
+        if histogram is None:
+            histogram = self._latencies[family][operation] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, family: str, operation: str) -> Iterator[None]:
+        """
+        Mede a duração do bloco, mesmo que ele falhe.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(family, operation, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """
+        :return: Dicionário família -> {"counters": {...}, "latency": {operação: histograma}}.
+        """
+        families = sorted(set(self._counters) | set(self._latencies))
+        return {
+            family: {
+                "counters": dict(self._counters.get(family, {})),
+                "latency": {
+                    operation: histogram.snapshot() for operation, histogram in self._latencies.get(family, {}).items()
+                },
+            }
+            for family in families
+        }
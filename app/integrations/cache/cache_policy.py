@@ -0,0 +1,84 @@
+import random
+from typing import Mapping
+
+from pydantic import BaseModel, Field
+
+
+class CachePolicy(BaseModel):
+    """
+    Política de expiração de uma família de chaves do cache.
+    """
+
+    ttl_seconds: int = Field(default=300, ge=0, title="Tempo de vida (s) das entradas (0 desabilita o cache)")
+    jitter_seconds: int = Field(
+        default=0, ge=0, title="Variação aleatória (s) somada ao tempo de vida, para espalhar as expirações"
+    )
+    refresh_ahead_seconds: int = Field(
+        default=0, ge=0, title="Tempo restante (s) abaixo do qual uma entrada lida é recarregada em segundo plano"
+    )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def expires_in(self) -> int:
+        """
+        Tempo de vida de uma nova entrada: o TTL da família mais uma variação aleatória,
+        para que entradas gravadas juntas (deploy, aquecimento do cache) não expirem juntas.
+        """
+        if not self.jitter_seconds:
+            return self.ttl_seconds
+        return self.ttl_seconds + random.randint(0, self.jitter_seconds)
+
+    def should_refresh(self, remaining_seconds: float | None) -> bool:
+        """
+        Indica se uma entrada lida está perto de expirar e deve ser recarregada antes disso.
+
+        :param remaining_seconds: Tempo restante da entrada ou None se não houver expiração.
+        """
+        return remaining_seconds is not None and 0 <= remaining_seconds < self.refresh_ahead_seconds
+
+
+DEFAULT_CACHE_POLICIES: dict[str, CachePolicy] = {
+    "price": CachePolicy(ttl_seconds=300, jitter_seconds=60, refresh_ahead_seconds=30),
+    "price-list": CachePolicy(ttl_seconds=60, jitter_seconds=15),
+    "suggestion": CachePolicy(ttl_seconds=300, jitter_seconds=60),
+}
+
+
+class CachePolicyRegistry:
+    """
+    Políticas de expiração por família de chaves. A família é o prefixo da chave até o primeiro ":"
+    (ex.: "price:1:A" pertence à família "price"); famílias sem política usam a política padrão.
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, CachePolicy | dict] | None = None,
+        default: CachePolicy | None = None,
+    ):
+        """
+        :param policies: Políticas por família. Aceita dicionários, como os lidos das configurações.
+            As famílias não informadas mantêm a política de DEFAULT_CACHE_POLICIES.
+        :param default: Política das famílias sem configuração.
+        """
+        self.policies = dict(DEFAULT_CACHE_POLICIES)
+        for family, policy in (policies or {}).items():
+            self.policies[family] = CachePolicy.model_validate(policy)
+        self.default = default if default is not None else CachePolicy()
+
+    @staticmethod
+    def family_of(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def for_family(self, family: str) -> CachePolicy:
+        return self.policies.get(family, self.default)
+
+    def for_key(self, key: str) -> CachePolicy:
+        return self.for_family(self.family_of(key))
+
+    def expires_in(self, key: str) -> int:
+        """
+        Tempo de vida, com variação, de uma nova entrada na chave informada.
+        """
+        return self.for_key(key).expires_in()
@@ -0,0 +1,90 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+import msgpack
+import orjson
+
+
+class Codec(ABC):
+    """
+    Serialização dos valores gravados no Redis.
+    """
+
+    name: str
+
+    @abstractmethod
+    def encode(self, value: Any) -> str | bytes:
+        """
+        Converte o valor para o formato gravado no Redis.
+        """
+
+    @abstractmethod
+    def decode(self, data: str | bytes) -> Any:
+        """
+        Reconstrói o valor lido do Redis.
+
+        :raises ValueError: Se o conteúdo não estiver no formato do codec.
+        """
+
+
+class JsonCodec(Codec):
+    """
+    JSON da biblioteca padrão. Mantém o formato legível gravado pelas versões anteriores.
+    """
+
+    name = "json"
+
+    def encode(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def decode(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """
+    JSON via orjson: mesmo formato do JsonCodec (compacto), com codificação e decodificação mais rápidas.
+    """
+
+    name = "orjson"
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def decode(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """
+    MessagePack: formato binário, menor que JSON e sem conversão de texto.
+    """
+
+    name = "msgpack"
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value)
+
+    def decode(self, data: str | bytes) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        try:
+            return msgpack.unpackb(data)
+        except (msgpack.UnpackException, msgpack.ExtraData) as exc:
+            raise ValueError(str(exc)) from exc
+
+
+CODECS: dict[str, type[Codec]] = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Instancia o codec pelo nome configurado.
+
+    :raises ValueError: Se o nome não corresponder a um codec conhecido.
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Codec de cache desconhecido: {name}. Opções: {', '.join(CODECS)}")
+    return codec()
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class LocalCacheAdapter:
+    """
+    Cache em memória do processo, limitado por quantidade de entradas (LRU) e por tempo de vida (TTL).
+
+    Não é compartilhado entre réplicas: cada instância da API mantém o seu, por isso o TTL deve ser curto
+    e a invalidação entre réplicas é responsabilidade de quem utiliza o adaptador.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 5.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float | None = None):
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
@@ -1,15 +1,108 @@
-import json
+import logging
 from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+from uuid import uuid4
 
 from pydantic import RedisDsn
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+
+from .codecs import Codec, JsonCodec
+
+logger = logging.getLogger(__name__)
+
+# Remove o lock somente se ainda pertencer a quem o adquiriu (o lease pode ter expirado e sido readquirido)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Grava o valor somente se a versão informada não for anterior à versão já registrada para a chave.
+# KEYS: chave do valor, chave da versão | ARGV: valor, versão, expiração em segundos (0 = sem expiração)
+_SET_IF_NEWER_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]))
+if current and tonumber(ARGV[2]) < current then
+    return 0
+end
+local ttl = tonumber(ARGV[3])
+if ttl > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ttl)
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# Como _SET_IF_NEWER_SCRIPT, mas ignora a versão registrada quando a chave não tem valor ou guarda o valor
+# de ausência informado (ex.: uma lápide): a versão de uma remoção anterior não impede a recriação da chave.
+# KEYS: chave do valor, chave da versão | ARGV: valor, versão, expiração em segundos (0 = sem expiração),
+# valor de ausência
+_SET_IF_NEWER_OR_ABSENT_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if stored and stored ~= ARGV[4] then
+    local current = tonumber(redis.call('GET', KEYS[2]))
+    if current and tonumber(ARGV[2]) < current then
+        return 0
+    end
+end
+local ttl = tonumber(ARGV[3])
+if ttl > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ttl)
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# Remove o valor e registra a versão da remoção, impedindo que gravações de versões anteriores o recriem.
+# KEYS: chave do valor, chave da versão | ARGV: versão, expiração em segundos (0 = sem expiração)
+_DELETE_IF_NEWER_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]))
+if current and tonumber(ARGV[1]) < current then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+local ttl = tonumber(ARGV[2])
+if ttl > 0 then
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ttl)
+else
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+return 1
+"""
 
 
 class RedisAsyncioAdapter:
 
-    def __init__(self, redis_url: RedisDsn):
+    def __init__(self, redis_url: RedisDsn, codec: Codec | None = None):
+        """
+        :param redis_url: URL de conexão com o Redis.
+        :param codec: Serialização dos valores dos métodos *_json. Se None, utiliza JSON da biblioteca padrão.
+        """
         self.redis_url = str(redis_url)
         self.redis_client = Redis.from_url(self.redis_url)
+        self.codec = codec if codec is not None else JsonCodec()
+        self._scripts: dict[str, AsyncScript] = {}
+
+    def _script(self, source: str):
+        """
+        Registra o script Lua uma única vez; as chamadas seguintes usam EVALSHA.
+        """
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis_client.register_script(source)
+        return script
+
+    @staticmethod
+    def version_key(key: str) -> str:
+        return f"version:{key}"
 
     async def aclose(self):
         await self.redis_client.aclose()
@@ -35,11 +128,18 @@ class RedisAsyncioAdapter:
 
         await self.redis_client.set(k, v, expires_in_seconds)
 
+    def _decode(self, key: str, data: bytes | None) -> dict | list | int | None:
+        if data is None:
+            return None
+        try:
+            return self.codec.decode(data)
+        except ValueError:
+            # Valor gravado com outro codec (ex.: durante a troca de configuração): tratado como ausente
+            logger.warning("Valor ilegível para o codec %s", self.codec.name, extra={"cache_key": key})
+            return None
+
     async def get_json(self, key: str) -> dict | list | int | None:
-        v = await self.get_str(key)
-        if v is not None:
-            v = json.loads(v)
-        return v
+        return self._decode(key, await self.redis_client.get(key))
 
     async def set_json(
         self,
@@ -47,9 +147,254 @@ class RedisAsyncioAdapter:
         v: dict | list | int | None,
         expires_in_seconds: int | None = None,
     ):
-        if v is not None:
-            v = json.dumps(v)
-        await self.set_str(key, v, expires_in_seconds)
+        if v is None:
+            await self.delete(key)
+            return
+        await self.redis_client.set(key, self.codec.encode(v), expires_in_seconds)
+
+    async def mget_json(self, keys: list[str]) -> list[dict | list | int | None]:
+        """
+        Busca várias chaves em uma única ida ao Redis (MGET).
+
+        :return: Valores na mesma ordem das chaves, com None para as ausentes.
+        """
+        if not keys:
+            return []
+        values = await self.redis_client.mget(keys)
+        return [self._decode(key, v) for key, v in zip(keys, values)]
+
+    async def mset_json(
+        self,
+        items: dict[str, dict | list | int],
+        expires_in_seconds: int | dict[str, int | None] | None = None,
+        nx: bool = False,
+    ) -> list[bool]:
+        """
+        Grava várias chaves em uma única ida ao Redis (pipeline).
+
+        :param expires_in_seconds: Tempo de expiração de todas as chaves ou dicionário chave -> tempo de expiração
+            (chaves ausentes do dicionário não expiram).
+        :param nx: Grava somente as chaves que ainda não existem.
+        :return: Indicação de gravação de cada chave, na ordem do dicionário.
+        """
+        if not items:
+            return []
+        async with self.pipeline() as pipe:
+            for key, v in items.items():
+                ttl = expires_in_seconds.get(key) if isinstance(expires_in_seconds, dict) else expires_in_seconds
+                pipe.set_json(key, v, ttl, nx=nx)
+        return pipe.results
+
+    async def set_json_if_newer(
+        self,
+        key: str,
+        v: dict | list | int,
+        version: int,
+        expires_in_seconds: int | None = None,
+    ) -> bool:
+        """
+        Grava o valor somente se a versão não for anterior à última versão gravada (ou removida) na chave,
+        de forma que um valor antigo nunca sobrescreva um mais novo.
+
+        :return: True se o valor foi gravado.
+        """
+        stored = await self._script(_SET_IF_NEWER_SCRIPT)(
+            keys=[key, self.version_key(key)], args=[self.codec.encode(v), version, expires_in_seconds or 0]
+        )
+        return bool(stored)
+
+    async def mset_json_if_newer(
+        self,
+        items: dict[str, tuple[dict | list | int, int]],
+        expires_in_seconds: int | None = None,
+    ) -> list[bool]:
+        """
+        Versão em lote de set_json_if_newer, com uma única ida ao Redis (pipeline).
+
+        :param items: Dicionário chave -> (valor, versão).
+        :return: Indicação de gravação de cada chave, na ordem do dicionário.
+        """
+        if not items:
+            return []
+        async with self.pipeline() as pipe:
+            for key, (v, version) in items.items():
+                pipe.set_json_if_newer(key, v, version, expires_in_seconds)
+        return pipe.results
+
+    async def delete_if_newer(self, key: str, version: int, expires_in_seconds: int | None = None) -> bool:
+        """
+        Remove o valor e registra a versão da remoção, para que gravações atrasadas de versões anteriores
+        não o recriem.
+
+        :return: True se o valor foi removido.
+        """
+        deleted = await self._script(_DELETE_IF_NEWER_SCRIPT)(
+            keys=[key, self.version_key(key)], args=[version, expires_in_seconds or 0]
+        )
+        return bool(deleted)
 
     async def delete(self, key: str):
         await self.redis_client.delete(key)
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """
+        Remove várias chaves com um único DEL.
+
+        :return: Quantidade de chaves removidas.
+        """
+        if not keys:
+            return 0
+        return await self.redis_client.delete(*keys)
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator["RedisPipeline"]:
+        """
+        Agrupa comandos em uma única ida ao Redis. Os comandos são enviados na saída do bloco
+        e os retornos ficam em results, na ordem em que foram enfileirados:
+
+            async with redis_adapter.pipeline() as pipe:
+                pipe.set_json_if_newer(key, valor, versao)
+                pipe.publish(canal, key)
+            gravado = pipe.results[0]
+
+        Se o bloco lançar uma exceção, nenhum comando é enviado.
+        """
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            batch = RedisPipeline(self, pipe)
+            yield batch
+            await batch.execute()
+
+    async def acquire_lock(self, key: str, lease_seconds: float) -> str | None:
+        """
+        Tenta adquirir um lock com tempo de concessão (lease), sem bloquear.
+
+        :return: Token do lock, necessário para liberá-lo, ou None se outro processo o detém.
+        """
+        token = uuid4().hex
+        acquired = await self.redis_client.set(key, token, px=int(lease_seconds * 1000), nx=True)
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        released = await self._script(_RELEASE_LOCK_SCRIPT)(keys=[key], args=[token])
+        return bool(released)
+
+    async def publish(self, channel: str, message: str) -> int:
+        """
+        Publica uma mensagem em um canal de pub/sub do Redis.
+
+        :return: Quantidade de assinantes que receberam a mensagem.
+        """
+        return await self.redis_client.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], Awaitable[None] | None]):
+        """
+        Assina um canal de pub/sub e repassa cada mensagem recebida para o handler.
+        Bloqueia até a tarefa ser cancelada ou a conexão cair.
+        """
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = message["data"]
+                result = handler(data.decode() if isinstance(data, bytes) else data)
+                if result is not None:
+                    await result
+        finally:
+            await pubsub.aclose()
+
+
+class RedisPipeline:
+    """
+    Comandos enfileirados por RedisAsyncioAdapter.pipeline(). Os métodos espelham os do adaptador,
+    mas não aguardam o Redis: os retornos ficam em results após o envio.
+    """
+
+    def __init__(self, adapter: RedisAsyncioAdapter, pipe: Pipeline):
+        self._adapter = adapter
+        self._pipe = pipe
+        # Conversão do retorno de cada comando e se ele foi de fato enviado ao Redis
+        self._parsers: list[tuple[Callable[[Any], Any], bool]] = []
+        self.results: list = []
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+    def _queue_script(self, source: str, keys: list[str], args: list):
+        script = self._adapter._script(source)
+        # Carregado pelo pipeline antes do envio, caso o Redis ainda não conheça o script
+        self._pipe.scripts.add(script)
+        self._pipe.evalsha(script.sha, len(keys), *keys, *args)
+
+    def get_json(self, key: str):
+        self._pipe.get(key)
+        self._parsers.append((lambda data: self._adapter._decode(key, data), True))
+
+    def set_json(self, key: str, v: dict | list | int, expires_in_seconds: int | None = None, nx: bool = False):
+        self._pipe.set(key, self._adapter.codec.encode(v), expires_in_seconds, nx=nx)
+        self._parsers.append((bool, True))
+
+    def delete_many(self, keys: list[str]):
+        if not keys:
+            self._parsers.append((lambda _: 0, False))
+            return
+        self._pipe.delete(*keys)
+        self._parsers.append((int, True))
+
+    def set_json_if_newer(self, key: str, v: dict | list | int, version: int, expires_in_seconds: int | None = None):
+        self._queue_script(
+            _SET_IF_NEWER_SCRIPT,
+            [key, self._adapter.version_key(key)],
+            [self._adapter.codec.encode(v), version, expires_in_seconds or 0],
+        )
+        self._parsers.append((bool, True))
+
+    def set_json_if_newer_or_absent(
+        self,
+        key: str,
+        v: dict | list | int,
+        version: int,
+        absent_value: dict | list | int,
+        expires_in_seconds: int | None = None,
+    ):
+        """
+        Grava o valor se a chave não tiver valor, se guardar absent_value ou se version não for anterior à
+        versão registrada. Usado para chaves recém-criadas, que substituem uma remoção de versão mais nova.
+        """
+        codec = self._adapter.codec
+        self._queue_script(
+            _SET_IF_NEWER_OR_ABSENT_SCRIPT,
+            [key, self._adapter.version_key(key)],
+            [codec.encode(v), version, expires_in_seconds or 0, codec.encode(absent_value)],
+        )
+        self._parsers.append((bool, True))
+
+    def delete_if_newer(self, key: str, version: int, expires_in_seconds: int | None = None):
+        self._queue_script(
+            _DELETE_IF_NEWER_SCRIPT, [key, self._adapter.version_key(key)], [version, expires_in_seconds or 0]
+        )
+        self._parsers.append((bool, True))
+
+    def ttl(self, key: str):
+        """
+        Tempo restante da chave em segundos; None se a chave não existir ou não expirar.
+        """
+        self._pipe.pttl(key)
+        self._parsers.append((lambda ms: ms / 1000 if ms >= 0 else None, True))
+
+    def incr(self, key: str):
+        self._pipe.incr(key)
+        self._parsers.append((int, True))
+
+    def publish(self, channel: str, message: str):
+        self._pipe.publish(channel, message)
+        self._parsers.append((int, True))
+
+    async def execute(self) -> list:
+        """
+        Envia os comandos enfileirados. Chamado automaticamente na saída do bloco de pipeline().
+        """
+        raw = iter(await self._pipe.execute() if any(sent for _, sent in self._parsers) else [])
+        self.results = [parser(next(raw) if sent else None) for parser, sent in self._parsers]
+        return self.results
@@ -1,41 +1,372 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Sequence
 
 from pydantic import PostgresDsn
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import Delete, Select, delete, make_url, select, text
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.common.latency_histogram import LatencyHistogram
+from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
+# Sessão da unidade de trabalho em andamento na tarefa atual, com o cliente que a abriu
+_current_unit_of_work: ContextVar[tuple["SQLAlchemyClient", AsyncSession] | None] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+# Chave, em session.info, das funções a executar após o commit da unidade de trabalho (ver after_commit)
+_AFTER_COMMIT = "after_commit"
+
+# Cliente (ex.: o seller da requisição) cujas leituras devem enxergar as próprias escritas
+_read_your_writes_key: ContextVar[str | None] = ContextVar("read_your_writes_key", default=None)
+
+# Posição do WAL do primário após o commit, e se a réplica já a aplicou (NULL fora de uma réplica: sem atraso)
+_CURRENT_WAL_LSN = text("SELECT pg_current_wal_lsn()::text")
+_REPLICA_CAUGHT_UP = text("SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), true)")
+
+
+def set_read_your_writes_key(key: str | None):
+    """
+    Identifica o cliente da tarefa atual (requisição). Depois de uma escrita dele, as suas leituras só vão a
+    uma réplica que já tenha aplicado a escrita (ver SQLAlchemyClient.make_read_session).
+    """
+    _read_your_writes_key.set(key)
+
 
 class SQLAlchemyClient:
-    def __init__(self, db_url: PostgresDsn):
+    def __init__(
+        self,
+        db_url: PostgresDsn,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_recycle_seconds: int = 1800,
+        pool_pre_ping: bool = True,
+        pool_timeout_seconds: float = 30.0,
+        replica_urls: Sequence[PostgresDsn] | None = None,
+        read_your_writes_seconds: float = 60.0,
+        prepared_statement_cache_size: int = 100,
+        write_positions: RedisAsyncioAdapter | None = None,
+    ):
+        """
+        :param db_url: URI do banco de dados (primário).
+        :param pool_size: Conexões mantidas abertas no pool.
+        :param max_overflow: Conexões extras abertas sob demanda além de pool_size.
+        :param pool_recycle_seconds: Idade máxima de uma conexão antes de ser reaberta (-1 desabilita).
+        :param pool_pre_ping: Verifica a conexão antes de entregá-la, descartando as encerradas pelo banco.
+        :param pool_timeout_seconds: Espera máxima por uma conexão livre quando o pool está esgotado.
+        :param replica_urls: URIs das réplicas de leitura, usadas em rodízio por make_read_session.
+            Cada réplica tem o seu pool, com as mesmas configurações do primário.
+        :param read_your_writes_seconds: Tempo em que a posição (LSN) da última escrita de um cliente
+            (ver set_read_your_writes_key) é mantida. Enquanto mantida, as leituras dele só vão a uma réplica que
+            já tenha aplicado a escrita; depois, a réplica é usada sem verificação.
+        :param prepared_statement_cache_size: Prepared statements mantidos por conexão pelo asyncpg (0 desabilita).
+            Cada SQL distinto é preparado uma vez por conexão e reexecutado sem nova análise pelo banco.
+        :param write_positions: Redis onde as posições das escritas são mantidas, compartilhadas por todas as
+            instâncias da aplicação. Sem ele, ficam na memória do processo.
+        """
         self.db_url = db_url
-        self.engine = create_async_engine(str(db_url))
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        engine_options: dict[str, Any] = dict(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle_seconds,
+            pool_pre_ping=pool_pre_ping,
+            pool_timeout=pool_timeout_seconds,
+        )
+        if make_url(str(db_url)).get_driver_name() == "asyncpg":
+            engine_options["connect_args"] = {"prepared_statement_cache_size": prepared_statement_cache_size}
+        self.engine = create_async_engine(str(db_url), **engine_options)
+        self.replica_engines: list[AsyncEngine] = [
+            create_async_engine(str(url), **engine_options) for url in replica_urls or ()
+        ]
+        self._replica_cycle = itertools.cycle(self.replica_engines)
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.write_positions = write_positions
+        # Sem Redis: cliente -> (LSN da última escrita, instante time.monotonic em que deixa de ser mantido)
+        self._recent_writes: dict[str, tuple[str, float]] = {}
+        self.replica_fallbacks = 0
+        self.replica_lagging_reads = 0
         self.session_maker = sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.checkout_latency = LatencyHistogram()
+        self.checkout_timeouts = 0
 
-    def close(self):
+    async def prewarm(self, connections: int):
         """
-        Fecha a conexão com o banco de dados.
+        Abre conexões antecipadamente, para que as primeiras requisições não paguem o custo de abri-las.
+        Falhas são registradas e não impedem a inicialização: as conexões serão abertas sob demanda.
+
+        :param connections: Quantidade de conexões (limitada a pool_size).
+        """
+        connections = min(connections, self.pool_size)
+        if connections <= 0:
+            return
+        opened = await asyncio.gather(*(self._open_connection() for _ in range(connections)), return_exceptions=True)
+        # As conexões devolvidas permanecem abertas no pool
+        await asyncio.gather(*(conn.close() for conn in opened if isinstance(conn, AsyncConnection)))
+        failures = [error for error in opened if isinstance(error, BaseException)]
+        if failures:
+            logger.warning(
+                "Falha ao pré-abrir %d de %d conexões com o banco", len(failures), connections, exc_info=failures[0]
+            )
+        else:
+            logger.info("Pool de conexões com o banco pré-aquecido com %d conexões", connections)
+
+    async def _open_connection(self) -> AsyncConnection:
+        return await self.engine.connect().start()
+
+    async def close(self):
+        """
+        Fecha as conexões com o banco de dados (primário e réplicas). As sessões são sempre abertas em blocos
+        async with e já estão fechadas ao fim deles.
         """
         try:
-            self.session_maker.close_all()
-            self.engine.dispose()
+            await asyncio.gather(self.engine.dispose(), *(replica.dispose() for replica in self.replica_engines))
         finally:
             self.engine = None
+            self.replica_engines = []
+
+    def _active_session(self) -> AsyncSession | None:
+        current = _current_unit_of_work.get()
+        if current is None or current[0] is not self:
+            return None
+        session = current[1]
+        # Tarefas criadas dentro do bloco herdam o contexto e podem rodar após o fim da unidade
+        return session if session.in_transaction() else None
+
+    def in_unit_of_work(self) -> bool:
+        """
+        Indica se há uma unidade de trabalho deste cliente em andamento na tarefa atual.
+        """
+        return self._active_session() is not None
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[AsyncSession]:
+        """
+        Abre uma sessão e uma transação compartilhadas por todas as operações dos repositórios executadas
+        dentro do bloco: uma única conexão do pool e um único commit, na saída do bloco.
+        Se o bloco falhar, nada é gravado. Blocos aninhados participam da transação mais externa.
+        :return: AsyncSession
+        """
+        session = self._active_session()
+        if session is not None:
+            yield session
+            return
+
+        async with self.make_session() as session:
+            async with session.begin():
+                token = _current_unit_of_work.set((self, session))
+                try:
+                    yield session
+                finally:
+                    _current_unit_of_work.reset(token)
+            callbacks = session.info.pop(_AFTER_COMMIT, [])
+            await self._mark_write(session)
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Executa callback após o commit da unidade de trabalho em andamento (na ordem de registro), ou na hora,
+        fora de uma. Se a unidade for desfeita, callback não é executado.
+        """
+        session = self._active_session()
+        if session is None:
+            callback()
+            return
+        session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+    @asynccontextmanager
+    async def begin(self, session: AsyncSession) -> AsyncIterator[None]:
+        """
+        Transação de uma operação do repositório. Dentro de uma unidade de trabalho, participa da transação
+        dela: as alterações são enviadas ao banco (flush) e confirmadas somente no fim da unidade.
+        """
+        if session is self._active_session():
+            yield
+            await session.flush()
+            return
+        async with session.begin():
+            yield
+        await self._mark_write(session)
+
+    @staticmethod
+    def _write_position_key(key: str) -> str:
+        return f"read_your_writes:{key}"
+
+    async def _mark_write(self, session: AsyncSession):
+        """
+        Registra a posição do WAL do primário após a escrita confirmada do cliente atual, lida na mesma
+        conexão: as suas próximas leituras só vão a uma réplica que já a tenha aplicado.
+        Falhas são registradas e não desfazem a escrita, já confirmada.
+        """
+        key = _read_your_writes_key.get()
+        if key is None or not self.replica_engines:
+            return
+        try:
+            lsn = (await session.execute(_CURRENT_WAL_LSN)).scalar_one()
+            if self.write_positions is not None:
+                await self.write_positions.set_str(
+                    self._write_position_key(key), lsn, expires_in_seconds=math.ceil(self.read_your_writes_seconds)
+                )
+                return
+        except Exception:
+            logger.warning("Falha ao registrar a posição da escrita para read-your-writes", exc_info=True)
+            return
+        now = time.monotonic()
+        if len(self._recent_writes) >= 10_000:
+            self._recent_writes = {k: entry for k, entry in self._recent_writes.items() if entry[1] > now}
+        self._recent_writes[key] = (lsn, now + self.read_your_writes_seconds)
+
+    async def _write_position(self) -> str | None:
+        """
+        Posição (LSN) da última escrita do cliente atual ainda mantida, ou None.
+        """
+        key = _read_your_writes_key.get()
+        if key is None:
+            return None
+        if self.write_positions is not None:
+            return await self.write_positions.get_str(self._write_position_key(key))
+        lsn, until = self._recent_writes.get(key, (None, 0.0))
+        return lsn if until > time.monotonic() else None
+
+    async def _replica_caught_up(self, connection: AsyncConnection, lsn: str) -> bool:
+        caught_up = (await connection.execute(_REPLICA_CAUGHT_UP, {"lsn": lsn})).scalar_one()
+        # Encerra a transação da verificação: a sessão abre a sua
+        await connection.rollback()
+        return bool(caught_up)
+
+    async def _open_replica_connection(self) -> AsyncConnection | None:
+        """
+        Abre uma conexão com a próxima réplica do rodízio. Retorna None se ela estiver indisponível ou, após
+        uma escrita do cliente atual, se ainda não a tiver aplicado (read-your-writes).
+        """
+        try:
+            lsn = await self._write_position()
+        except Exception:
+            # Sem saber se houve escrita, somente o primário garante a leitura das próprias escritas
+            logger.warning("Falha ao ler a posição da escrita para read-your-writes, lendo do primário", exc_info=True)
+            return None
+        connection = next(self._replica_cycle).connect()
+        try:
+            await connection.start()
+        except (OSError, SQLAlchemyError):
+            self.replica_fallbacks += 1
+            logger.warning("Réplica indisponível, lendo do primário", exc_info=True)
+            return None
+        if lsn is None:
+            return connection
+        try:
+            caught_up = await self._replica_caught_up(connection, lsn)
+        except (OSError, SQLAlchemyError):
+            self.replica_fallbacks += 1
+            logger.warning("Falha ao verificar a réplica, lendo do primário", exc_info=True)
+            caught_up = False
+        else:
+            if not caught_up:
+                self.replica_lagging_reads += 1
+        if not caught_up:
+            await connection.close()
+            return None
+        return connection
+
+    @asynccontextmanager
+    async def make_read_session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Sessão para consultas somente de leitura: em uma réplica, em rodízio. Usa o primário dentro de
+        uma unidade de trabalho, sem réplicas, se a réplica não puder ser aberta ou se ainda não tiver
+        aplicado a última escrita do mesmo cliente (read-your-writes).
+        :return: AsyncSession
+        """
+        if self._active_session() is not None or not self.replica_engines:
+            async with self.make_session() as session:
+                yield session
+            return
+
+        connection = await self._open_replica_connection()
+        if connection is None:
+            async with self.make_session() as session:
+                yield session
+            return
+        try:
+            async with self.session_maker(bind=connection) as session:
+                yield session
+        finally:
+            await connection.close()
 
     @asynccontextmanager
     async def make_session(self) -> AsyncIterator[AsyncSession]:
         """
         Cria um contexto assíncrono para gerenciar a sessão do banco de dados.
+        Dentro de uma unidade de trabalho, retorna a sessão dela.
         :return: AsyncSession
         """
-        async with self.session_maker() as session:
+        session = self._active_session()
+        if session is not None:
             yield session
+            return
+
+        # A conexão é obtida de imediato (e não no primeiro comando) para medir a espera no pool.
+        # Sem iniciar transação: a sessão continua livre para abrir a sua com session.begin().
+        connection = self.engine.connect()
+        start = time.perf_counter()
+        try:
+            await connection.start()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_latency.observe(time.perf_counter() - start)
+        try:
+            async with self.session_maker(bind=connection) as session:
+                yield session
+        finally:
+            await connection.close()
+
+    def pool_stats(self) -> dict:
+        """
+        Ocupação do pool de conexões e tempo de espera para obter uma conexão.
+        """
+        pool = self.engine.pool
+        max_connections = self.pool_size + self.max_overflow
+        stats: dict = {"max_connections": max_connections}
+        if isinstance(pool, QueuePool):
+            checked_out = pool.checkedout()
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=checked_out,
+                overflow=max(pool.overflow(), 0),
+                saturation=round(checked_out / max_connections, 3) if max_connections else 0.0,
+            )
+        else:
+            # Pools sem contadores de ocupação (ex.: NullPool): somente a descrição do próprio pool
+            stats["status"] = pool.status()
+        return {
+            **stats,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait": self.checkout_latency.snapshot(),
+            "replicas": len(self.replica_engines),
+            "replica_fallbacks": self.replica_fallbacks,
+            "replica_lagging_reads": self.replica_lagging_reads,
+        }
 
     @staticmethod
-    def init_select(base_class) -> select:
+    def init_select(base_class) -> Select:
         """
         Inicializa uma consulta SELECT para a tabela de preços.
         :param base_class: Classe base do modelo de dados.
@@ -45,7 +376,7 @@ class SQLAlchemyClient:
         return s
 
     @staticmethod
-    def init_delete(base_class) -> delete:
+    def init_delete(base_class) -> Delete:
         """
         Inicializa uma consulta DELETE para a tabela de preços.
         :param base_class: Classe base do modelo de dados.
@@ -54,6 +385,16 @@ class SQLAlchemyClient:
         d = delete(base_class)
         return d
 
+    @staticmethod
+    def init_insert(base_class) -> Insert:
+        """
+        Inicializa um INSERT do PostgreSQL, que aceita ON CONFLICT (on_conflict_do_nothing/on_conflict_do_update).
+        :param base_class: Classe base do modelo de dados.
+        :return: Consulta INSERT configurada.
+        """
+        i = insert(base_class)
+        return i
+
     @staticmethod
     def to_dict(base) -> dict | None:
         """
@@ -63,7 +404,8 @@ class SQLAlchemyClient:
         """
         if base is None:
             return None
-        d = base.__dict__
+        # Cópia: remover o estado do próprio objeto o desligaria da sessão (unidade de trabalho)
+        d = dict(base.__dict__)
         d.pop("_sa_instance_state", None)
         return d
 
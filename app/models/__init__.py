@@ -9,7 +9,9 @@ from .base import (
     UuidPersistableEntity,
     UuidType,
 )
+from .price_batch_model import PriceBatchResult, PriceBatchStatus
 from .price_filter_model import PriceFilter
+from .price_history_filter_model import PriceHistoryFilter
 from .price_model import Price
 from .query import QueryModel
 
@@ -19,8 +21,11 @@ __all__ = [
     "UuidModel",
     "UuidType",
     "Price",
+    "PriceBatchResult",
+    "PriceBatchStatus",
     "Alert",
     "PriceFilter",
+    "PriceHistoryFilter",
     "QueryModel",
     "IntModel",
     "UuidPersistableEntity",
@@ -4,4 +4,5 @@ from app.models import QueryModel
 
 
 class AlertFilter(QueryModel):
+    seller_id: Optional[str] = None
     sku: Optional[str] = None
@@ -0,0 +1,23 @@
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .price_model import Price
+
+
+class PriceBatchStatus(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    REJECTED = "rejected"
+
+
+class PriceBatchResult(BaseModel):
+    """
+    Resultado da gravação em lote de um sku.
+    """
+
+    sku: str
+    status: PriceBatchStatus
+    price: Price | None = None
+    details: list[Any] = Field(default_factory=list, description="Detalhes do erro (ErrorDetail) de um item rejeitado")
@@ -4,6 +4,7 @@ from app.models.query import QueryModel
 
 
 class PriceFilter(QueryModel):
+    seller_id: Optional[str] = None
     de__lt: Optional[int] = None
     de__gt: Optional[int] = None
     por__lt: Optional[int] = None
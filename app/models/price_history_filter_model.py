@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Optional
+
+from app.models.query import QueryModel
+
+
+class PriceHistoryFilter(QueryModel):
+    seller_id: Optional[str] = None
+    sku: Optional[str] = None
+    sku__in: Optional[list[str]] = None
+    registered_at__ge: Optional[datetime] = None
+    registered_at__lt: Optional[datetime] = None
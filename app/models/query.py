@@ -5,6 +5,7 @@ _query_mapper = {
     "__gt": "$gt",
     "__le": "$lte",
     "__lt": "$lt",
+    "__in": "$in",
 }
 
 
@@ -18,6 +19,7 @@ class QueryModel(BaseModel):
     - `__gt`: maior que.
     - `__le`: menor ou igual.
     - `__lt`: menor que.
+    - `__in`: contido na lista.
     """
 
     def to_query_dict(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 
@@ -9,18 +9,22 @@ from .base.sqlalchemy_entity_base import CreatedAtMixin, IdEntityBase, SellerIdM
 
 class AlertBase(IdEntityBase, SellerIdMixin, SkuMixin, CreatedAtMixin, UpdatedAtMixin):
     __tablename__ = "pc_alertas"
+    # Busca e ordenação da listagem dos alertas de um seller na ordem padrão (id), sem cobertura das colunas;
+    # criado pela migração e8a2c5f0b917
+    __table_args__ = (Index("idx_alertas_sellerid", "seller_id", "id"),)
 
     mensagem = Column(String, nullable=False)
     status = Column(String, nullable=False)
 
 
 class AlertRepository(SQLAlchemyCrudRepository[Alert, AlertBase]):
-    def __init__(self, sql_client: SQLAlchemyClient):
+    def __init__(self, sql_client: SQLAlchemyClient, core_reads: bool = False):
         """
         Inicializa o repositório de alertas com o cliente SQLAlchemy.
         :param sql_client: Instância do cliente SQLAlchemy.
+        :param core_reads: Leituras pelo SQLAlchemy Core, mapeando as linhas direto para o modelo.
         """
-        super().__init__(sql_client=sql_client, model_class=Alert, entity_base_class=AlertBase)
+        super().__init__(sql_client=sql_client, model_class=Alert, entity_base_class=AlertBase, core_reads=core_reads)
 
 
 __all__ = ["AlertRepository"]
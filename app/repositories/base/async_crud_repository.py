@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncContextManager, AsyncGenerator, Callable, Generic, TypeVar
+
+from app.models import QueryModel
 
 T = TypeVar("T")
-Q = TypeVar("Q")
+Q = TypeVar("Q", bound=QueryModel)
 
 
 class AsyncCrudRepository(ABC, Generic[T]):
@@ -16,6 +18,31 @@ class AsyncCrudRepository(ABC, Generic[T]):
         Salva uma entidade no repositório.
         """
 
+    @abstractmethod
+    async def insert_if_absent(self, entity: T) -> T | None:
+        """
+        Salva uma entidade se ainda não existir outra com o mesmo seller_id e sku.
+        Retorna None se já existir.
+        """
+
+    @abstractmethod
+    async def upsert(self, entity: T) -> T:
+        """
+        Salva uma entidade ou atualiza a existente com o mesmo seller_id e sku.
+        """
+
+    @abstractmethod
+    async def upsert_many(self, entities: list[T]) -> list[T]:
+        """
+        Salva ou atualiza várias entidades de uma só vez, retornando-as na ordem informada.
+        """
+
+    @abstractmethod
+    async def insert_many(self, entities: list[T]) -> int:
+        """
+        Salva várias entidades de uma só vez, retornando a quantidade salva.
+        """
+
     @abstractmethod
     async def find_by_seller_id_and_sku(self, seller_id: str, sku: str) -> T | None:
         """
@@ -23,9 +50,40 @@ class AsyncCrudRepository(ABC, Generic[T]):
         """
 
     @abstractmethod
-    async def find(self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None) -> list[T]:
+    async def find_by_seller_id_and_skus(self, seller_id: str, skus: list[str]) -> list[T]:
+        """
+        Busca as entidades de um seller para uma lista de skus.
+        """
+
+    @abstractmethod
+    async def find(
+        self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None, after: dict | None = None
+    ) -> list[T]:
         """
         Busca entidades no repositório, utilizando filtros e paginação.
+        Com `after` (cursor), retorna os registros posteriores a ele na ordenação, ignorando o offset.
+        """
+
+    @abstractmethod
+    async def find_with_total(
+        self,
+        filters: Q,
+        limit: int = 20,
+        offset: int = 0,
+        sort: dict | None = None,
+        after: dict | None = None,
+        count: str = "exact",
+    ) -> tuple[list[T], int | None]:
+        """
+        Como find, retornando também o total de registros dos filtros, independente da página e do cursor:
+        exato (count="exact") ou estimado (count="estimated").
+        """
+
+    @abstractmethod
+    def stream(self, filters: Q, sort: dict | None = None, batch_size: int = 1000) -> AsyncGenerator[T, None]:
+        """
+        Percorre todas as entidades dos filtros, na ordenação informada, sem carregá-las de uma só vez:
+        são lidas do banco em lotes de batch_size à medida que o iterador é consumido.
         """
 
     @abstractmethod
@@ -39,3 +97,17 @@ class AsyncCrudRepository(ABC, Generic[T]):
         """
         Remove uma entidade pelo seu identificador único.
         """
+
+    @abstractmethod
+    def unit_of_work(self) -> AsyncContextManager[Any]:
+        """
+        Agrupa as operações executadas dentro do bloco (neste e nos demais repositórios do mesmo banco)
+        em uma única transação, confirmada na saída do bloco e desfeita se ele falhar.
+        """
+
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Executa callback após o commit da unidade de trabalho em andamento, ou na hora, fora de uma.
+        Se a unidade for desfeita, callback não é executado.
+        """
@@ -1,8 +1,17 @@
+import json
 import logging
+import operator
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from functools import cached_property
+from typing import Any, AsyncGenerator, Callable, Generic, Sequence, TypeVar, overload
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Integer, and_, bindparam, func, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import ReturningInsert
 
 from app.common.datetime import utcnow
+from app.common.exceptions.pagination_exceptions import InvalidCursorException
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 from app.models import PersistableEntity, Price, QueryModel
 
@@ -15,21 +24,53 @@ Q = TypeVar("Q", bound=QueryModel)
 
 CAMPOS_IMUTAVEIS = {"created_by", "created_at"}
 
+# Operadores aceitos nos filtros de find ($eq: igualdade, para valores simples); os demais são ignorados
+OPERADORES_FILTRO = {
+    "$eq": operator.eq,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$in": lambda column, values: column.in_(values),
+}
+
 logger = logging.getLogger(__name__)
 
 
 class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
     """
     Implementação de AsyncCrudRepository com o SQLAlchemy.
-    Ponto de atenção: Cada método possui uma transação única.
+    Ponto de atenção: Cada método possui uma transação única, exceto dentro de uma unidade de trabalho
+    (ver unit_of_work), em que todos compartilham a sessão e a transação dela.
+
+    insert_if_absent e upsert dependem de um índice único sobre unique_fields na tabela.
+
+    As leituras (find, find_by_seller_id_and_sku e find_by_seller_id_and_skus) usam make_read_session e podem ser
+    atendidas por uma réplica; as escritas sempre vão ao primário.
+
+    Com core_reads, as leituras selecionam as colunas da tabela e mapeiam cada linha direto para o modelo
+    (ver _row_mapper), sem criar entidades do ORM. Dentro de uma unidade de trabalho, find_by_seller_id_and_sku
+    continua no ORM, pois as escritas seguintes reaproveitam a entidade lida.
 
+    As consultas de find são montadas uma vez por formato (campos e operadores dos filtros, ordenação e cursor)
+    e reaproveitadas com os valores como parâmetros (ver _find_template): o mesmo SQL a cada chamada, que o
+    SQLAlchemy não recompila e o asyncpg executa pelo prepared statement já preparado na conexão.
     """
 
-    def __init__(self, sql_client: SQLAlchemyClient, model_class: T, entity_base_class: B):
+    unique_fields: tuple[str, ...] = ("seller_id", "sku")
+    # Desempate da ordenação das listagens (ver _keyset); None utiliza a chave primária. Deve conter somente "id",
+    # o campo que Paginator.next_cursor grava no cursor além dos de ordenação
+    keyset_fields: tuple[str, ...] | None = None
+    # Formatos de consulta de find mantidos em cache (a lista é esvaziada ao atingir o limite)
+    find_templates_max: int = 256
+
+    def __init__(self, sql_client: SQLAlchemyClient, model_class: T, entity_base_class: B, core_reads: bool = False):
         self.sql_client = sql_client
         self.model_class = model_class
         self.entity_base_class = entity_base_class
+        self.core_reads = core_reads
         self.pk_fields = self.sql_client.get_pk_fields(self.entity_base_class)
+        self._find_templates: dict[tuple, object] = {}
 
     def to_base(self, model: T) -> B:
         """
@@ -43,6 +84,12 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
                 setattr(base, field, value)
         return base
 
+    @overload
+    def to_model(self, base: B) -> T: ...
+
+    @overload
+    def to_model(self, base: None) -> None: ...
+
     def to_model(self, base: B | None) -> T | None:
         """
         Converte uma entidade base para um modelo. (SQLAlchemy -> Pydantic)
@@ -55,6 +102,59 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
         model = self.model_class.model_validate(base_dict)
         return model
 
+    @cached_property
+    def _row_columns(self) -> list:
+        """
+        Colunas da tabela que são campos do modelo, na ordem em que são selecionadas nas leituras pelo Core.
+        """
+        fields = self.model_class.model_fields
+        return [column for column in self.entity_base_class.__table__.columns if column.key in fields]
+
+    @cached_property
+    def _row_mapper(self) -> Callable[[Sequence], T]:
+        """
+        Mapeador pré-compilado de uma linha (colunas de _row_columns) para o modelo: monta o dicionário pelos
+        nomes das colunas, já resolvidos, e chama diretamente o validador compilado do modelo (pydantic-core).
+        Mais barato que model_construct, implementado em Python, e ainda converte os campos JSON em modelos.
+        """
+        keys = [column.key for column in self._row_columns]
+        validate = self.model_class.__pydantic_validator__.validate_python
+
+        def map_row(row: Sequence) -> T:
+            return validate(dict(zip(keys, row)))
+
+        return map_row
+
+    def _read_statement(self, stmt):
+        """
+        Ajusta uma consulta de entidades para _fetch_models: com core_reads, seleciona somente as colunas.
+        """
+        return stmt.with_only_columns(*self._row_columns) if self.core_reads else stmt
+
+    async def _fetch_models(self, session, stmt, params: dict | None = None) -> list[T]:
+        """
+        Executa uma consulta de entidades (já ajustada por _read_statement) e as converte em modelos, pelo ORM ou,
+        com core_reads, mapeando as linhas direto para o modelo.
+        """
+        result = await session.execute(stmt, params)
+        if self.core_reads:
+            map_row = self._row_mapper
+            return [map_row(row) for row in result.all()]
+        return [self.to_model(base) for base in result.scalars().all()]
+
+    def unit_of_work(self):
+        """
+        Unidade de trabalho do cliente SQLAlchemy: repositórios que compartilham o cliente
+        participam da mesma sessão e transação dentro do bloco.
+        """
+        return self.sql_client.unit_of_work()
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Executa callback após o commit da unidade de trabalho do cliente SQLAlchemy (ver SQLAlchemyClient.after_commit).
+        """
+        self.sql_client.after_commit(callback)
+
     async def create(self, model: T) -> T:
         """
         Salva uma entidade no repositório.
@@ -63,20 +163,149 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
         base = self.to_base(model)  # Converte o modelo pydantic para a entidade base do SQLAlchemy
 
         async with self.sql_client.make_session() as session:
-            async with session.begin():
+            async with self.sql_client.begin(session):
                 session.add(base)
         logger.debug("Entidade criada no banco", extra={"dados": str(base)})
         created_model = self.to_model(base)
         return created_model
 
+    def _insert_values(self, model: T) -> dict:
+        """
+        Valores do INSERT a partir do modelo: somente colunas da tabela, omitindo os valores None
+        de colunas com valor padrão (chave gerada pelo banco, datas de auditoria).
+        """
+        model_dict = model.model_dump()
+        values = {}
+        for column in self.entity_base_class.__table__.columns:
+            if column.name not in model_dict:
+                continue
+            value = model_dict[column.name]
+            if value is None and (column.primary_key or column.default is not None):
+                continue
+            values[column.name] = value
+        return values
+
+    async def insert_if_absent(self, model: T) -> T | None:
+        """
+        Insere a entidade se ainda não existir outra com a mesma chave única (unique_fields), em um único
+        comando (INSERT ... ON CONFLICT DO NOTHING RETURNING). A duplicidade é detectada pelo próprio banco,
+        sem consulta prévia e sem janela de concorrência entre a verificação e a inserção.
+
+        :return: A entidade criada ou None se já existir.
+        """
+        logger.info("Inserindo entidade se inexistente", extra={"dados": model.model_dump()})
+        stmt: ReturningInsert[Any] = (
+            self.sql_client.init_insert(self.entity_base_class)
+            .values(**self._insert_values(model))
+            .on_conflict_do_nothing(index_elements=list(self.unique_fields))
+            .returning(self.entity_base_class)
+        )
+        async with self.sql_client.make_session() as session:
+            async with self.sql_client.begin(session):
+                result = await session.execute(stmt)
+                base = result.scalar_one_or_none()
+        if base is None:
+            logger.warning("Entidade já existente", extra={"dados": model.model_dump(include=set(self.unique_fields))})
+        return self.to_model(base)
+
+    def _upsert_updates(self, stmt, fields) -> dict:
+        """
+        Campos atualizados quando a linha já existe: os valores propostos (excluded) dos campos mutáveis,
+        e a data de atualização.
+        """
+        updates = {
+            field: stmt.excluded[field]
+            for field in fields
+            if field not in CAMPOS_IMUTAVEIS and field not in self.pk_fields and field not in self.unique_fields
+        }
+        if hasattr(self.entity_base_class, "updated_at"):
+            updates["updated_at"] = utcnow()
+        return updates
+
+    async def upsert(self, model: T) -> T:
+        """
+        Insere a entidade ou, se já existir outra com a mesma chave única (unique_fields), atualiza os campos
+        mutáveis dela, em um único comando (INSERT ... ON CONFLICT DO UPDATE RETURNING).
+
+        :return: A entidade criada ou atualizada.
+        """
+        logger.info("Inserindo ou atualizando entidade", extra={"dados": model.model_dump()})
+        values = self._insert_values(model)
+        insert = self.sql_client.init_insert(self.entity_base_class).values(**values)
+        stmt: ReturningInsert[Any] = (
+            insert.on_conflict_do_update(
+                index_elements=list(self.unique_fields), set_=self._upsert_updates(insert, values)
+            )
+            .returning(self.entity_base_class)
+            .execution_options(populate_existing=True)
+        )
+        async with self.sql_client.make_session() as session:
+            async with self.sql_client.begin(session):
+                result = await session.execute(stmt)
+                base = result.scalar_one()
+        return self.to_model(base)
+
+    async def upsert_many(self, models: list[T]) -> list[T]:
+        """
+        Versão em lote do upsert: todas as entidades em um único INSERT de várias linhas
+        (ON CONFLICT DO UPDATE RETURNING), na ordem informada.
+        As entidades não podem repetir a chave única: o PostgreSQL não atualiza a mesma linha duas vezes
+        no mesmo comando.
+
+        :return: As entidades criadas ou atualizadas, na ordem informada.
+        """
+        logger.info("Inserindo ou atualizando %d entidades", len(models), extra={"quantidade": len(models)})
+        if not models:
+            return []
+
+        rows = [self._insert_values(model) for model in models]
+        fields = {field for row in rows for field in row}
+        insert = self.sql_client.init_insert(self.entity_base_class)
+        stmt: ReturningInsert[Any] = (
+            insert.on_conflict_do_update(
+                index_elements=list(self.unique_fields), set_=self._upsert_updates(insert, fields)
+            )
+            .returning(self.entity_base_class, sort_by_parameter_order=True)
+            .execution_options(populate_existing=True)
+        )
+        async with self.sql_client.make_session() as session:
+            async with self.sql_client.begin(session):
+                result = await session.execute(stmt, rows)
+                bases = result.scalars().all()
+        return [self.to_model(base) for base in bases]
+
+    async def insert_many(self, models: list[T]) -> int:
+        """
+        Insere várias entidades em um único INSERT de várias linhas, sem retornar as linhas criadas.
+
+        :return: Quantidade de entidades inseridas.
+        """
+        logger.info("Inserindo %d entidades", len(models), extra={"quantidade": len(models)})
+        if not models:
+            return 0
+
+        rows = [self._insert_values(model) for model in models]
+        async with self.sql_client.make_session() as session:
+            async with self.sql_client.begin(session):
+                await session.execute(self.sql_client.init_insert(self.entity_base_class), rows)
+        return len(rows)
+
     async def _find_base_by_seller_id_sku_on_session(self, seller_id: str, sku: str, session) -> B | None:
         """
         Busca uma entidade base pelo seller_id e sku.
+        Na mesma sessão (unidade de trabalho), a entidade já lida é reaproveitada sem nova consulta.
         """
+        loaded_key = (self.entity_base_class, seller_id, sku)
+        base = session.info.get(loaded_key)
+        if base is not None:
+            return base
+
         preco = self.sql_client.init_select(self.entity_base_class)
         preco = preco.where(self.entity_base_class.seller_id == seller_id).where(self.entity_base_class.sku == sku)
         scalar = await session.execute(preco)
         base = scalar.scalar_one_or_none()
+        if base is not None:
+            session.info[loaded_key] = base
         return base
 
     async def find_by_seller_id_and_sku(self, seller_id: str, sku: str) -> T | None:
@@ -86,15 +315,43 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
         logger.info(
             "Buscando entidade por seller_id=%s, sku=%s", seller_id, sku, extra={"seller_id": seller_id, "sku": sku}
         )
-        async with self.sql_client.make_session() as session:
-            base = await self._find_base_by_seller_id_sku_on_session(seller_id, sku, session)
-        model = self.to_model(base)
+        if self.core_reads and not self.sql_client.in_unit_of_work():
+            stmt = self.sql_client.init_select(self.entity_base_class)
+            stmt = stmt.where(self.entity_base_class.seller_id == seller_id).where(self.entity_base_class.sku == sku)
+            async with self.sql_client.make_read_session() as session:
+                models = await self._fetch_models(session, self._read_statement(stmt))
+            model = models[0] if models else None
+        else:
+            async with self.sql_client.make_read_session() as session:
+                base = await self._find_base_by_seller_id_sku_on_session(seller_id, sku, session)
+            model = self.to_model(base)
         if model:
             logger.debug("Entidade encontrada", extra={"dados": model.model_dump()})
         else:
             logger.warning("Nenhuma entidade encontrada para seller_id=%s, sku=%s", seller_id, sku)
         return model
 
+    async def find_by_seller_id_and_skus(self, seller_id: str, skus: list[str]) -> list[T]:
+        """
+        Busca as entidades de um seller para uma lista de skus em uma única consulta (sku IN (...)).
+        Skus inexistentes são simplesmente omitidos do resultado.
+        """
+        logger.info(
+            "Buscando entidades por seller_id=%s e %d skus",
+            seller_id,
+            len(skus),
+            extra={"seller_id": seller_id, "skus": skus},
+        )
+        if not skus:
+            return []
+
+        async with self.sql_client.make_read_session() as session:
+            stmt = self.sql_client.init_select(self.entity_base_class)
+            stmt = stmt.where(self.entity_base_class.seller_id == seller_id).where(self.entity_base_class.sku.in_(skus))
+            models = await self._fetch_models(session, self._read_statement(stmt))
+        logger.info("Encontradas %d entidades para os skus informados.", len(models), extra={"quantidade": len(models)})
+        return models
+
     def _apply_sort(self, stmt, sort: dict):
         for field, direction in sort.items():
             if hasattr(self.entity_base_class, field):
@@ -102,50 +359,319 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
                 stmt = stmt.order_by(column.desc() if direction == -1 else column.asc())
         return stmt
 
-    async def find(self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None) -> list[T]:
+    def _keyset(self, sort: dict | None) -> list[tuple[str, int]]:
+        """
+        Chave de ordenação completa da listagem: os campos de ordenação existentes na entidade, seguidos do
+        desempate (keyset_fields ou a chave primária, na direção do último campo), para que a ordem seja total e
+        estável entre páginas.
+        """
+        keyset = [
+            (field, direction) for field, direction in (sort or {}).items() if hasattr(self.entity_base_class, field)
+        ]
+        tiebreak_direction = keyset[-1][1] if keyset else 1
+        tiebreak = self.keyset_fields or self.pk_fields
+        keyset += [(field, tiebreak_direction) for field in tiebreak if field not in dict(keyset)]
+        return keyset
+
+    def _keyset_value(self, field: str, value):
+        """
+        Converte o valor lido do cursor (JSON) para o tipo da coluna.
+
+        :raises InvalidCursorException: Se o valor não for compatível com a coluna.
+        """
+        column = getattr(self.entity_base_class, field)
+        try:
+            return TypeAdapter(column.type.python_type).validate_python(value)
+        except NotImplementedError:
+            return value
+        except ValidationError as exc:
+            raise InvalidCursorException() from exc
+
+    def _keyset_params(self, keyset: list[tuple[str, int]], after: dict) -> dict:
+        """
+        Parâmetros do cursor para a consulta montada por _apply_keyset.
+
+        :raises InvalidCursorException: Se o cursor não tiver os campos do keyset ou os valores forem incompatíveis.
+        """
+        params = {}
+        for index, (field, _) in enumerate(keyset):
+            if field not in after:
+                raise InvalidCursorException()
+            params[f"after_{index}"] = self._keyset_value(field, after[field])
+        return params
+
+    def _apply_keyset(self, stmt, keyset: list[tuple[str, int]]):
+        """
+        Restringe a consulta aos registros posteriores ao cursor na ordem do keyset (paginação por cursor), com os
+        valores do cursor como parâmetros after_<posição no keyset> (ver _keyset_params).
+        Com todas as direções iguais, usa a comparação de tuplas (a, b) > (x, y), atendida por uma única
+        varredura de intervalo no índice; com direções mistas, a expansão equivalente com OR.
+        """
+        keys: list[tuple[Any, int, Any]] = []
+        for index, (field, direction) in enumerate(keyset):
+            column = getattr(self.entity_base_class, field)
+            # Tipo explícito: na comparação de tuplas o parâmetro não herda o tipo da coluna
+            keys.append((column, direction, bindparam(f"after_{index}", type_=column.type)))
+
+        # Limite simples no primeiro campo, implícito na comparação abaixo: permite ao banco descartar partições
+        # (ex.: as do histórico, por registered_at) e delimitar a varredura do índice
+        first_column, first_direction, first_value = keys[0]
+        stmt = stmt.where(first_column >= first_value if first_direction == 1 else first_column <= first_value)
+
+        if len({direction for _, direction, _ in keys}) == 1:
+            columns = tuple_(*(column for column, _, _ in keys))
+            values = tuple_(*(value for _, _, value in keys))
+            return stmt.where(columns > values if keys[0][1] == 1 else columns < values)
+
+        conditions = []
+        for index, (column, direction, value) in enumerate(keys):
+            previous = [previous_column == previous_value for previous_column, _, previous_value in keys[:index]]
+            conditions.append(and_(*previous, column > value if direction == 1 else column < value))
+        return stmt.where(or_(*conditions))
+
+    def _filter_params(self, filters: Q) -> tuple[tuple[tuple[str, str], ...], dict]:
+        """
+        Separa os filtros em formato (campo e operador de cada condição, na ordem) e valores (parâmetros
+        filter_<posição>). Campos inexistentes na entidade e operadores desconhecidos são ignorados.
+        """
+        shape: list[tuple[str, str]] = []
+        params = {}
+        for field, value in filters.to_query_dict().items():
+            if not hasattr(self.entity_base_class, field):
+                logger.debug(f"Campo '{field}' não existe em {self.entity_base_class.__name__}, ignorando filtro.")
+                continue
+            conditions = value.items() if isinstance(value, dict) else [("$eq", value)]
+            for op, v in conditions:
+                if op in OPERADORES_FILTRO:
+                    params[f"filter_{len(shape)}"] = v
+                    shape.append((field, op))
+        return tuple(shape), params
+
+    def _cached_template(self, key: tuple, build: Callable):
+        """
+        Consulta do cache de formatos (ver find_templates_max), montada por build na primeira vez.
+        """
+        template = self._find_templates.get(key)
+        if template is None:
+            if len(self._find_templates) >= self.find_templates_max:
+                self._find_templates.clear()
+            template = self._find_templates[key] = build()
+        return template
+
+    def _filter_conditions(self, filter_shape: tuple[tuple[str, str], ...]) -> list:
+        """
+        Condições dos filtros no formato informado, com os valores nos parâmetros filter_<n> (ver _filter_params).
+        Em "$in" o parâmetro recebe a lista inteira, expandida na execução: o formato não depende do tamanho dela.
+        """
+        conditions = []
+        for index, (field, op) in enumerate(filter_shape):
+            column = getattr(self.entity_base_class, field)
+            conditions.append(OPERADORES_FILTRO[op](column, bindparam(f"filter_{index}", expanding=op == "$in")))
+        return conditions
+
+    def _find_template(
+        self,
+        filter_shape: tuple[tuple[str, str], ...],
+        keyset: list[tuple[str, int]],
+        cursor: bool,
+        with_total: bool = False,
+    ):
+        """
+        Consulta de find para o formato informado, montada na primeira vez e reaproveitada nas seguintes.
+        Os valores entram como parâmetros: filter_<n> (ver _filter_params), after_<n> (ver _keyset_params),
+        limit e, sem cursor, offset.
+
+        :param with_total: Acrescenta a coluna total, com a contagem dos filtros (ver _count_template).
+        """
+
+        def build():
+            stmt = self.sql_client.init_select(self.entity_base_class)
+            for condition in self._filter_conditions(filter_shape):
+                stmt = stmt.where(condition)
+
+            stmt = self._apply_sort(stmt, dict(keyset))
+            if cursor:
+                stmt = self._apply_keyset(stmt, keyset).limit(bindparam("limit", type_=Integer))
+            else:
+                stmt = stmt.limit(bindparam("limit", type_=Integer)).offset(bindparam("offset", type_=Integer))
+            stmt = self._read_statement(stmt)
+            if with_total:
+                # Subconsulta escalar não correlacionada: o banco a executa uma única vez (InitPlan), sem
+                # impedir que a página pare no limit
+                stmt = stmt.add_columns(self._count_template(filter_shape).scalar_subquery().label("total"))
+            return stmt
+
+        return self._cached_template((filter_shape, tuple(keyset), cursor, self.core_reads, with_total), build)
+
+    def _count_template(self, filter_shape: tuple[tuple[str, str], ...]):
+        """
+        Contagem dos registros dos filtros no formato informado (parâmetros filter_<n>).
+        """
+
+        def build():
+            stmt = select(func.count()).select_from(self.entity_base_class)
+            for condition in self._filter_conditions(filter_shape):
+                stmt = stmt.where(condition)
+            return stmt
+
+        return self._cached_template(("count", filter_shape), build)
+
+    def _find_query(
+        self,
+        filters: Q,
+        limit: int = 20,
+        offset: int = 0,
+        sort: dict | None = None,
+        after: dict | None = None,
+        with_total: bool = False,
+    ) -> tuple:
+        """
+        Consulta de `find` (ver _find_template) e os parâmetros para executá-la.
+
+        :raises InvalidCursorException: Se o cursor não corresponder à ordenação.
+        """
+        filter_shape, params = self._filter_params(filters)
+        keyset = self._keyset(sort)
+        params["limit"] = limit
+        if after is not None:
+            params.update(self._keyset_params(keyset, after))
+        else:
+            params["offset"] = offset
+        return self._find_template(filter_shape, keyset, after is not None, with_total), params
+
+    def _find_statement(
+        self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None, after: dict | None = None
+    ):
+        """
+        Monta a consulta de `find` com os valores já associados, sem executá-la (usada para inspecionar o plano
+        de execução).
+        """
+        stmt, params = self._find_query(filters, limit=limit, offset=offset, sort=sort, after=after)
+        return stmt.params(**params)
+
+    async def find(
+        self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None, after: dict | None = None
+    ) -> list[T]:
         """
         Busca uma lista de entidades com base nos filtros, limite, offset e ordenação.
+        A ordenação sempre termina no desempate (ver _keyset). Com `after` (valores de ordenação e desempate do
+        último registro da página anterior), a página é obtida por keyset no lugar do offset.
         """
         logger.info(
             "Buscando entidades",
-            extra={"filtros": filters.to_query_dict(), "limit": limit, "offset": offset, "sort": sort},
+            extra={
+                "filtros": filters.to_query_dict(),
+                "limit": limit,
+                "offset": offset,
+                "sort": sort,
+                "after": after,
+            },
         )
 
-        def apply_operator(stmt, column, op, v):
-            if op == "$lt":
-                return stmt.where(column < v)
-            elif op == "$lte":
-                return stmt.where(column <= v)
-            elif op == "$gt":
-                return stmt.where(column > v)
-            elif op == "$gte":
-                return stmt.where(column >= v)
-            return stmt
+        stmt, params = self._find_query(filters, limit=limit, offset=offset, sort=sort, after=after)
+        async with self.sql_client.make_read_session() as session:
+            models = await self._fetch_models(session, stmt, params)
+        logger.info(
+            "Encontradas %d entidades para os filtros informados.", len(models), extra={"quantidade": len(models)}
+        )
+        return models
 
-        async with self.sql_client.make_session() as session:
-            stmt = self.sql_client.init_select(self.entity_base_class)
+    async def find_with_total(
+        self,
+        filters: Q,
+        limit: int = 20,
+        offset: int = 0,
+        sort: dict | None = None,
+        after: dict | None = None,
+        count: str = "exact",
+    ) -> tuple[list[T], int | None]:
+        """
+        Como find, retornando também o total de registros dos filtros, independente da página e do cursor.
 
-            for field, value in filters.to_query_dict().items():
-                if not hasattr(self.entity_base_class, field):
-                    logger.debug(f"Campo '{field}' não existe em {self.entity_base_class.__name__}, ignorando filtro.")
-                    continue
-                column = getattr(self.entity_base_class, field)
-                if isinstance(value, dict):
-                    for op, v in value.items():
-                        stmt = apply_operator(stmt, column, op, v)
+        - exact: contagem na mesma consulta da página (coluna total, ver _find_template). Somente uma página
+          vazia além do início, que não traz a coluna, exige a contagem à parte.
+        - estimated: estimativa do planejador para os filtros (EXPLAIN, a partir das estatísticas de pg_class e
+          pg_statistic), sem percorrer os registros. Aproximada, e tão atual quanto o último ANALYZE da tabela.
+        """
+        logger.info(
+            "Buscando entidades com o total",
+            extra={"filtros": filters.to_query_dict(), "limit": limit, "offset": offset, "sort": sort, "count": count},
+        )
+        exact = count == "exact"
+        stmt, params = self._find_query(filters, limit=limit, offset=offset, sort=sort, after=after, with_total=exact)
+        filter_shape, filter_params = self._filter_params(filters)
+        async with self.sql_client.make_read_session() as session:
+            if not exact:
+                models = await self._fetch_models(session, stmt, params)
+                total = await self._estimate_count(session, filter_shape, filter_params)
+            else:
+                result = await session.execute(stmt, params)
+                rows = result.all()
+                if self.core_reads:
+                    # A coluna total vem após as colunas do modelo, que são as mapeadas por _row_mapper
+                    map_row = self._row_mapper
+                    models = [map_row(row) for row in rows]
+                else:
+                    models = [self.to_model(row[0]) for row in rows]
+                if rows:
+                    total = rows[0][-1]
+                elif offset == 0 and after is None:
+                    total = 0
                 else:
-                    stmt = stmt.where(column == value)
+                    count_result = await session.execute(self._count_template(filter_shape), filter_params)
+                    total = count_result.scalar_one()
+        logger.info("Encontradas %d entidades de %s.", len(models), total, extra={"quantidade": len(models)})
+        return models, total
 
-            if sort:
-                stmt = self._apply_sort(stmt, sort)
+    async def _estimate_count(self, session, filter_shape: tuple[tuple[str, str], ...], params: dict) -> int:
+        """
+        Quantidade de registros dos filtros estimada pelo planejador do banco (linhas previstas no plano).
+        """
+        stmt = select(*(getattr(self.entity_base_class, pk) for pk in self.pk_fields))
+        for condition in self._filter_conditions(filter_shape):
+            stmt = stmt.where(condition)
+        # Valores renderizados no próprio SQL do EXPLAIN, escapados pelo dialeto
+        sql = stmt.params(**params).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]["Plan"]["Plan Rows"])
 
-            stmt = stmt.limit(limit).offset(offset)
-            result = await session.execute(stmt)
-            bases = result.scalars().all()
-            logger.info(
-                "Encontradas %d entidades para os filtros informados.", len(bases), extra={"quantidade": len(bases)}
-            )
-            return [self.to_model(base) for base in bases]
+    async def stream(self, filters: Q, sort: dict | None = None, batch_size: int = 1000) -> AsyncGenerator[T, None]:
+        """
+        Percorre todas as entidades dos filtros por um cursor no servidor (yield_per): o banco entrega as linhas
+        em lotes de batch_size à medida que o iterador é consumido, e somente o lote atual fica em memória.
+        A ordenação termina na chave primária (ver _keyset). A sessão, e a conexão dela, ficam abertas até o fim
+        da iteração ou até o iterador ser fechado (aclose), por exemplo quando o cliente interrompe o download.
+        """
+        logger.info("Percorrendo entidades", extra={"filtros": filters.to_query_dict(), "sort": sort})
+        filter_shape, params = self._filter_params(filters)
+        keyset = self._keyset(sort)
+
+        def build():
+            stmt = self.sql_client.init_select(self.entity_base_class)
+            for condition in self._filter_conditions(filter_shape):
+                stmt = stmt.where(condition)
+            return self._read_statement(self._apply_sort(stmt, dict(keyset)))
+
+        stmt = self._cached_template(("stream", filter_shape, tuple(keyset), self.core_reads), build)
+        stmt = stmt.execution_options(yield_per=batch_size)
+        total = 0
+        async with self.sql_client.make_read_session() as session:
+            if self.core_reads:
+                map_row = self._row_mapper
+                rows_result = await session.stream(stmt, params)
+                async for rows in rows_result.partitions():
+                    for row in rows:
+                        yield map_row(row)
+                    total += len(rows)
+            else:
+                scalars_result = await session.stream_scalars(stmt, params)
+                async for bases in scalars_result.partitions():
+                    for base in bases:
+                        yield self.to_model(base)
+                    total += len(bases)
+        logger.info("Percorridas %d entidades.", total, extra={"quantidade": total})
 
     async def delete_by_seller_id_and_sku(self, seller_id: str, sku: str) -> bool:
         """
@@ -155,12 +681,13 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
             "Deletando entidade por seller_id=%s, sku=%s", seller_id, sku, extra={"seller_id": seller_id, "sku": sku}
         )
         async with self.sql_client.make_session() as session:
-            async with session.begin():
+            async with self.sql_client.begin(session):
                 stmt = self.sql_client.init_delete(self.entity_base_class)
                 stmt = stmt.where(self.entity_base_class.seller_id == seller_id).where(
                     self.entity_base_class.sku == sku
                 )
                 result = await session.execute(stmt)
+            session.info.pop((self.entity_base_class, seller_id, sku), None)
             deleted = result.rowcount > 0
             if deleted:
                 logger.info(
@@ -187,7 +714,7 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
             "Atualizando entidade por seller_id=%s, sku=%s", seller_id, sku, extra={"dados": model.model_dump()}
         )
         async with self.sql_client.make_session() as session:
-            async with session.begin():
+            async with self.sql_client.begin(session):
                 base = await self._find_base_by_seller_id_sku_on_session(seller_id, sku, session)
                 if can_update := base is not None:
                     base.updated_at = utcnow()
@@ -196,7 +723,6 @@ class SQLAlchemyCrudRepository(AsyncCrudRepository[T], Generic[T, B]):
                             setattr(base, key, value)
                     base.updated_at = utcnow()
             if can_update:
-                await session.commit()
                 logger.info(
                     "Entidade atualizada para seller_id=%s, sku=%s",
                     seller_id,
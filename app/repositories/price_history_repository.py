@@ -1,28 +1,226 @@
-from sqlalchemy import Column, Date, Integer
+import logging
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator
 
+from sqlalchemy import Column, DateTime, Index, Integer, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.datetime import utcnow
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 from app.models.price_history_model import PriceHistory
 
 from .base.sqlalchemy_crud_repository import SQLAlchemyCrudRepository
 from .base.sqlalchemy_entity_base import CreatedByMixin, IdEntityBase, SellerIdMixin, SkuMixin, UpdatedByMixin
 
+logger = logging.getLogger(__name__)
+
 
 class PriceHistoryBase(IdEntityBase, CreatedByMixin, UpdatedByMixin, SellerIdMixin, SkuMixin):
     __tablename__ = "pc_preco_historico"
+    # Particionada por mês de registered_at (migração f3c7d2a8e614): a chave primária inclui a coluna
+    __table_args__ = {"postgresql_partition_by": "RANGE (registered_at)"}
 
     de = Column(Integer, nullable=False)
     por = Column(Integer, nullable=False)
-    registered_at = Column(Date, nullable=False)
+    registered_at = Column(DateTime(timezone=True), default=utcnow, primary_key=True, nullable=False)
+
+
+# Atende às consultas do histórico de um produto (filtro por seller_id e sku, do registro mais recente para o
+# mais antigo), já na ordem completa do keyset (registered_at, id). Criado pela migração d4b1e7a9c3f2.
+Index(
+    "idx_preco_historico_sellerid_sku_registered_at",
+    PriceHistoryBase.seller_id,
+    PriceHistoryBase.sku,
+    PriceHistoryBase.registered_at.desc(),
+    PriceHistoryBase.id.desc(),
+)
+
+# Partição padrão (migração f3c7d2a8e614): recebe os registros dos meses ainda sem partição
+DEFAULT_PARTITION = f"{PriceHistoryBase.__tablename__}_default"
+
+# Chave do lock consultivo (pg_advisory_xact_lock) da manutenção das partições: uma execução por vez entre os workers
+PARTITION_MAINTENANCE_LOCK = 7_310_425_019
+
+# Partições mensais: pc_preco_historico_pAAAAMM, com o intervalo [início do mês, início do mês seguinte) em UTC
+_PARTITION_NAME = re.compile(rf"^{PriceHistoryBase.__tablename__}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """
+    Início (UTC) do mês do instante informado.
+    """
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PriceHistoryBase.__tablename__}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """
+    Mês de uma partição mensal pelo nome, ou None se não for uma (ex.: a partição padrão).
+    """
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
 
 
 class PriceHistoryRepository(SQLAlchemyCrudRepository[PriceHistory, PriceHistoryBase]):
+    # A chave primária inclui registered_at (chave da partição), mas o id já é único: o desempate fica somente
+    # no id, o campo que o cursor das listagens carrega (ver Paginator.next_cursor)
+    keyset_fields = ("id",)
 
-    def __init__(self, sql_client: SQLAlchemyClient):
+    def __init__(self, sql_client: SQLAlchemyClient, core_reads: bool = False):
         super().__init__(
             sql_client=sql_client,
             model_class=PriceHistory,
             entity_base_class=PriceHistoryBase,
+            core_reads=core_reads,
         )
 
+    async def list_partitions(self) -> list[str]:
+        """
+        Nomes das partições anexadas ao histórico.
+        """
+        async with self.sql_client.make_session() as session:
+            return await self._list_partitions(session)
+
+    async def _list_partitions(self, session: AsyncSession) -> list[str]:
+        stmt = text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+        )
+        result = await session.execute(stmt, {"table": PriceHistoryBase.__tablename__})
+        return list(result.scalars().all())
+
+    @asynccontextmanager
+    async def _maintenance(self) -> AsyncIterator[AsyncSession]:
+        """
+        Transação da manutenção das partições, sob o lock consultivo PARTITION_MAINTENANCE_LOCK: workers
+        concorrentes esperam a execução em andamento terminar, em vez de disputar os mesmos comandos DDL.
+        Dentro de outra manutenção, participa da transação (e do lock) dela.
+        """
+        async with self.sql_client.unit_of_work() as session:
+            await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK})
+            yield session
+
+    async def _execute_partition_ddl(self, session: AsyncSession, name: str, statements: list) -> bool:
+        """
+        Executa os comandos de uma partição em um savepoint: se um falhar, somente os dela são desfeitos.
+
+        :return: Se os comandos foram executados.
+        """
+        try:
+            async with session.begin_nested():
+                for statement in statements:
+                    await session.execute(statement)
+        except SQLAlchemyError:
+            logger.exception("Falha na manutenção da partição %s do histórico de preços", name)
+            return False
+        return True
+
+    async def _default_partition_has_rows(self, session: AsyncSession, month: datetime) -> bool:
+        stmt = text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE registered_at >= :start AND registered_at < :end)"
+        )
+        result = await session.execute(stmt, {"start": month, "end": add_months(month, 1)})
+        return bool(result.scalar())
+
+    def _create_partition_statements(self, name: str, month: datetime, move_default_rows: bool) -> list:
+        table = PriceHistoryBase.__tablename__
+        bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        if not move_default_rows:
+            return [text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}")]
+        # A partição padrão já tem registros do mês e impediria a criação: a partição é criada avulsa, recebe os
+        # registros (retirados da padrão) e só então é anexada, com os índices da tabela criados no ATTACH
+        period = f"registered_at >= '{month.isoformat()}' AND registered_at < '{add_months(month, 1).isoformat()}'"
+        return [
+            text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"),
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {period} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            text(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}"),
+        ]
+
+    async def create_partitions(self, months_ahead: int, now: datetime | None = None) -> list[str]:
+        """
+        Cria as partições mensais ainda inexistentes do mês atual até `months_ahead` meses à frente.
+        Os registros do mês que já estiverem na partição padrão (ex.: a manutenção ficou parada) são movidos para
+        a nova partição. Uma partição que falhe é registrada e não impede as demais.
+
+        :return: Nomes das partições criadas.
+        """
+        current = month_start(now or utcnow())
+        created = []
+        async with self._maintenance() as session:
+            existing = set(await self._list_partitions(session))
+            has_default = DEFAULT_PARTITION in existing
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                move_default_rows = has_default and await self._default_partition_has_rows(session, month)
+                statements = self._create_partition_statements(name, month, move_default_rows)
+                if not await self._execute_partition_ddl(session, name, statements):
+                    continue
+                logger.info(
+                    "Partição %s do histórico de preços criada%s",
+                    name,
+                    " com os registros da partição padrão" if move_default_rows else "",
+                )
+                created.append(name)
+        return created
+
+    async def expire_partitions(self, retention_months: int, archive: bool, now: datetime | None = None) -> list[str]:
+        """
+        Retira do histórico as partições mensais que terminam antes do início da retenção
+        (o mês atual menos `retention_months` meses). Uma partição que falhe é registrada e não impede as demais.
+
+        :param archive: Desanexa as partições (DETACH), que seguem no banco como tabelas avulsas para arquivamento
+            externo; do contrário, as remove (DROP).
+        :return: Nomes das partições retiradas.
+        """
+        cutoff = add_months(month_start(now or utcnow()), -retention_months)
+        expired = []
+        async with self._maintenance() as session:
+            for name in await self._list_partitions(session):
+                month = partition_month(name)
+                if month is None or add_months(month, 1) > cutoff:
+                    continue
+                if archive:
+                    ddl = f"ALTER TABLE {PriceHistoryBase.__tablename__} DETACH PARTITION {name}"
+                else:
+                    ddl = f"DROP TABLE {name}"
+                if not await self._execute_partition_ddl(session, name, [text(ddl)]):
+                    continue
+                logger.info("Partição %s do histórico de preços %s", name, "desanexada" if archive else "removida")
+                expired.append(name)
+        return expired
+
+    async def maintain_partitions(
+        self, months_ahead: int, retention_months: int, archive: bool, now: datetime | None = None
+    ) -> dict[str, list[str]]:
+        """
+        Uma execução completa da manutenção (create_partitions e, com retention_months, expire_partitions)
+        em uma única transação, sob o lock consultivo da manutenção.
+
+        :return: Partições criadas ("created") e retiradas ("expired").
+        """
+        async with self._maintenance():
+            created = await self.create_partitions(months_ahead, now)
+            expired = await self.expire_partitions(retention_months, archive, now) if retention_months > 0 else []
+        return {"created": created, "expired": expired}
+
 
 __all__ = ["PriceHistoryRepository"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer
+from sqlalchemy import Boolean, Column, Index, Integer
 
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 
@@ -10,6 +10,14 @@ from .base.sqlalchemy_entity_base import SellerIdSkuPersistableEntityBase
 class PriceBase(SellerIdSkuPersistableEntityBase):
 
     __tablename__ = "pc_preco"
+    __table_args__ = (
+        # Índice único criado na migração inicial; alvo do ON CONFLICT de insert_if_absent e upsert
+        Index("idx_anything_sellerid_sku", "seller_id", "sku", unique=True),
+        # Busca e ordenação das listagens de um seller por preço, já na ordem do keyset; não são de cobertura,
+        # as linhas seguem lidas na tabela (migração e8a2c5f0b917)
+        Index("idx_preco_sellerid_por", "seller_id", "por", "id"),
+        Index("idx_preco_sellerid_de", "seller_id", "de", "id"),
+    )
 
     de = Column(Integer, nullable=False)
     por = Column(Integer, nullable=False)
@@ -18,12 +26,13 @@ class PriceBase(SellerIdSkuPersistableEntityBase):
 
 class PriceRepository(SQLAlchemyCrudRepository[Price, PriceBase]):
 
-    def __init__(self, sql_client: SQLAlchemyClient):
+    def __init__(self, sql_client: SQLAlchemyClient, core_reads: bool = False):
         """
         Inicializa o repositório de preços com o cliente SQLAlchemy.
         :param sql_client: Instância do cliente SQLAlchemy.
+        :param core_reads: Leituras pelo SQLAlchemy Core, mapeando as linhas direto para o modelo.
         """
-        super().__init__(sql_client=sql_client, model_class=Price, entity_base_class=PriceBase)
+        super().__init__(sql_client=sql_client, model_class=Price, entity_base_class=PriceBase, core_reads=core_reads)
 
 
 __all__ = ["PriceRepository"]
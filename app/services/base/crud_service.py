@@ -1,7 +1,8 @@
 from abc import ABC
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncGenerator, Callable, Generic, TypeVar
 
 from app.api.common.schemas import Paginator
+from app.models import QueryModel
 from app.models.base import PersistableEntity
 from app.repositories import AsyncCrudRepository
 
@@ -24,19 +25,61 @@ class CrudService(ABC, Generic[T]):
         # XXX Pegar depois
         return None
 
+    def unit_of_work(self):
+        """
+        Executa as operações do bloco em uma única transação (ver AsyncCrudRepository.unit_of_work).
+        """
+        return self.repository.unit_of_work()
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Executa callback após o commit da unidade de trabalho em andamento (ver AsyncCrudRepository.after_commit).
+        """
+        self.repository.after_commit(callback)
+
     async def create(self, entity: Any) -> T:
         return await self.repository.create(entity)
 
-    async def find(self, paginator: Paginator, filters: dict) -> list[T]:
-        models_list = await self.repository.find(
-            filters=filters, limit=paginator.limit, offset=paginator.offset, sort=paginator.get_sort_order()
+    async def insert_if_absent(self, entity: Any) -> T | None:
+        return await self.repository.insert_if_absent(entity)
+
+    async def upsert(self, entity: Any) -> T:
+        return await self.repository.upsert(entity)
+
+    async def upsert_many(self, entities: list[Any]) -> list[T]:
+        return await self.repository.upsert_many(entities)
+
+    async def insert_many(self, entities: list[Any]) -> int:
+        return await self.repository.insert_many(entities)
+
+    async def find(self, paginator: Paginator, filters: QueryModel) -> list[T]:
+        """
+        Busca a página do paginator com um registro a mais (ver Paginator.fetch_limit), que indica se há uma
+        próxima página e é descartado por Paginator.page/paginate.
+        Com paginator.count, obtém também o total de registros dos filtros, guardado em paginator.total.
+        """
+        limit, offset = paginator.fetch_limit, paginator.offset
+        sort, after = paginator.get_sort_order(), paginator.get_cursor_keys()
+        if paginator.count is None:
+            return await self.repository.find(filters=filters, limit=limit, offset=offset, sort=sort, after=after)
+        models_list, paginator.total = await self.repository.find_with_total(
+            filters=filters, limit=limit, offset=offset, sort=sort, after=after, count=paginator.count
         )
         return models_list
 
+    def stream(self, filters: QueryModel, sort: dict | None = None, batch_size: int = 1000) -> AsyncGenerator[T, None]:
+        """
+        Percorre todas as entidades dos filtros em lotes lidos sob demanda (ver AsyncCrudRepository.stream).
+        """
+        return self.repository.stream(filters, sort=sort, batch_size=batch_size)
+
     async def find_by_seller_id_and_sku(self, seller_id: str, sku: str, can_raise_exception: bool = True) -> T | None:
         entity = await self.repository.find_by_seller_id_and_sku(seller_id, sku)
         return entity
 
+    async def find_by_seller_id_and_skus(self, seller_id: str, skus: list[str]) -> list[T]:
+        return await self.repository.find_by_seller_id_and_skus(seller_id, skus)
+
     async def update_by_seller_id_and_sku(self, seller_id: str, sku: str, entity: T) -> T:
         return await self.repository.update_by_seller_id_and_sku(seller_id, sku, entity)
 
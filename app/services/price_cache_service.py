@@ -0,0 +1,562 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Collection
+
+from app.common.datetime import utcnow
+from app.common.single_flight import SingleFlight
+from app.integrations.cache.cache_metrics import CacheMetrics
+from app.integrations.cache.cache_policy import CachePolicyRegistry
+from app.integrations.cache.local_cache_adapter import LocalCacheAdapter
+from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter, RedisPipeline
+from app.models import Price
+from app.models.base import UserModel
+
+logger = logging.getLogger(__name__)
+
+PRICE_INVALIDATION_CHANNEL = "price:invalidation"
+
+# Famílias de chaves do cache de preços (ver CachePolicyRegistry e CacheMetrics)
+PRICE_FAMILY = "price"
+LISTING_FAMILY = "price-list"
+
+# Valor gravado no Redis para um preço que sabidamente não existe no banco (cache negativo)
+_TOMBSTONE_VALUE = {"tombstone": True}
+
+
+class Tombstone:
+    """
+    Marca, no cache, um preço que sabidamente não existe no banco.
+    """
+
+    def __repr__(self) -> str:
+        return "TOMBSTONE"
+
+
+TOMBSTONE = Tombstone()
+
+# Forma compacta do preço no Redis: lista de valores nesta ordem, sem os nomes dos campos
+_PACKED_PRICE_FIELDS = (
+    "id",
+    "seller_id",
+    "sku",
+    "de",
+    "por",
+    "alerta_pendente",
+    "created_at",
+    "updated_at",
+    "created_by",
+    "updated_by",
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack_datetime(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _unpack_datetime(value: int | None) -> datetime | None:
+    return None if value is None else _EPOCH + timedelta(microseconds=value)
+
+
+def _pack_user(user: UserModel | None) -> list | None:
+    return None if user is None else [user.name, user.server]
+
+
+def _unpack_user(user: list | None) -> dict | None:
+    return None if user is None else {"name": user[0], "server": user[1]}
+
+
+def pack_price(price: Price) -> list:
+    """
+    Converte o preço para a forma compacta gravada no Redis.
+    """
+    return [
+        price.id,
+        price.seller_id,
+        price.sku,
+        price.de,
+        price.por,
+        price.alerta_pendente,
+        _pack_datetime(price.created_at),
+        _pack_datetime(price.updated_at),
+        _pack_user(price.created_by),
+        _pack_user(price.updated_by),
+    ]
+
+
+def unpack_price(packed: list) -> Price:
+    """
+    Reconstrói o preço da forma compacta, com as datas já convertidas.
+
+    A validação do pydantic (em Rust) sobre valores prontos custa menos que o model_construct,
+    que percorre os campos em Python (ver devtools/scripts/cache_test/codec_bench.py).
+    """
+    id_, seller_id, sku, de, por, alerta_pendente, created_at, updated_at, created_by, updated_by = packed
+    return Price.model_validate(
+        {
+            "id": id_,
+            "seller_id": seller_id,
+            "sku": sku,
+            "de": de,
+            "por": por,
+            "alerta_pendente": alerta_pendente,
+            "created_at": _unpack_datetime(created_at),
+            "updated_at": _unpack_datetime(updated_at),
+            "created_by": _unpack_user(created_by),
+            "updated_by": _unpack_user(updated_by),
+        }
+    )
+
+
+class PriceCacheService:
+    """
+    Cache de preços em dois níveis: memória local do processo (LRU/TTL) na frente do Redis.
+
+    As escritas gravam o novo preço no Redis (write-through) e publicam a chave no canal de pub/sub,
+    para que as demais réplicas da API descartem a sua cópia local. As entradas no Redis são versionadas
+    pela data de atualização do preço: uma versão anterior nunca sobrescreve uma mais nova.
+
+    Buscas por preços inexistentes gravam uma lápide (TOMBSTONE) de vida curta, para que as repetições
+    não cheguem ao banco. A lápide é gravada somente se não houver valor na chave e não altera a versão,
+    então a gravação de um preço criado sempre a substitui.
+
+    Listagens paginadas de um seller são guardadas sob a geração atual do seller. Toda escrita incrementa
+    a geração, o que torna inalcançáveis (e deixa expirar) todas as listagens anteriores, sem varrer chaves.
+
+    Os tempos de vida seguem as políticas por família de chaves ("price", "price-list"), com variação
+    aleatória. Um preço lido do Redis perto de expirar é recarregado em segundo plano (refresh-ahead),
+    para que chaves muito acessadas não expirem sob carga.
+    """
+
+    def __init__(
+        self,
+        redis_adapter: RedisAsyncioAdapter,
+        local_cache: LocalCacheAdapter | None = None,
+        policies: CachePolicyRegistry | None = None,
+        invalidation_channel: str = PRICE_INVALIDATION_CHANNEL,
+        reconnect_delay_seconds: float = 5.0,
+        lock_enabled: bool = False,
+        lock_lease_seconds: float = 3.0,
+        lock_poll_interval_seconds: float = 0.05,
+        tombstone_ttl_seconds: int = 30,
+        metrics: CacheMetrics | None = None,
+    ):
+        """
+        :param redis_adapter: Instância de RedisAsyncioAdapter (segundo nível).
+        :param local_cache: Cache em memória (primeiro nível). Se None, utiliza um LocalCacheAdapter padrão.
+        :param policies: Políticas de expiração por família de chaves. Se None, utiliza as políticas padrão.
+        :param invalidation_channel: Canal de pub/sub utilizado para invalidar as réplicas.
+        :param reconnect_delay_seconds: Espera antes de reassinar o canal após uma falha.
+        :param lock_enabled: Coordena as cargas entre réplicas com um lock (lease) no Redis.
+        :param lock_lease_seconds: Tempo máximo que uma réplica detém o lock de carga de uma chave.
+        :param lock_poll_interval_seconds: Intervalo de consulta ao Redis enquanto outra réplica carrega a chave.
+        :param tombstone_ttl_seconds: Tempo de vida das lápides de preços inexistentes (0 desabilita).
+        :param metrics: Contadores e latências por família de chaves. Se None, cria uma instância própria.
+        """
+        self.redis_adapter = redis_adapter
+        self.local_cache = local_cache if local_cache is not None else LocalCacheAdapter()
+        self.policies = policies if policies is not None else CachePolicyRegistry()
+        self.invalidation_channel = invalidation_channel
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self.lock_enabled = lock_enabled
+        self.lock_lease_seconds = lock_lease_seconds
+        self.lock_poll_interval_seconds = lock_poll_interval_seconds
+        self.tombstone_ttl_seconds = tombstone_ttl_seconds
+        self.metrics = metrics if metrics is not None else CacheMetrics()
+        self.single_flight = SingleFlight()
+        self._refresh_tasks: set[asyncio.Task] = set()
+        self._listener_task: asyncio.Task | None = None
+
+    @staticmethod
+    def build_key(seller_id: str, sku: str) -> str:
+        return f"price:{seller_id}:{sku}"
+
+    @staticmethod
+    def generation_key(seller_id: str) -> str:
+        return f"price-list-gen:{seller_id}"
+
+    @staticmethod
+    def listing_key(seller_id: str, generation: int, params: dict) -> str:
+        """
+        Chave de uma página de listagem: parâmetros normalizados (sem valores nulos, em ordem) e resumidos.
+        """
+        normalized = json.dumps(
+            {key: value for key, value in params.items() if value is not None}, sort_keys=True, default=str
+        )
+        digest = hashlib.sha1(normalized.encode(), usedforsecurity=False).hexdigest()
+        return f"price-list:{seller_id}:{generation}:{digest}"
+
+    @staticmethod
+    def version_of(price: Price) -> int:
+        """
+        Versão da entrada no cache: data da última alteração do preço em milissegundos.
+        """
+        moment = price.updated_at or price.created_at or utcnow()
+        return int(moment.timestamp() * 1000)
+
+    async def get(
+        self, cache_key: str, loader: Callable[[], Awaitable[Price | None]] | None = None
+    ) -> Price | Tombstone | None:
+        """
+        Busca o preço no cache local e, em caso de falha, no Redis, populando o cache local.
+
+        :param cache_key: Chave do preço (ver build_key).
+        :param loader: Função que busca o preço na origem. Se informada e a política da chave tiver
+            refresh-ahead, o tempo restante é lido junto com o valor e um preço perto de expirar
+            é recarregado em segundo plano.
+        :return: Instância de Price, TOMBSTONE se o preço sabidamente não existir
+            ou None se não estiver em nenhum dos níveis.
+        """
+        price = self.local_cache.get(cache_key)
+        if price is not None:
+            return price
+
+        policy = self.policies.for_key(cache_key)
+        remaining = None
+        with self.metrics.timer(PRICE_FAMILY, "get"):
+            if loader is None or not policy.refresh_ahead_seconds:
+                cached = await self.redis_adapter.get_json(cache_key)
+            else:
+                async with self.redis_adapter.pipeline() as pipe:
+                    pipe.get_json(cache_key)
+                    pipe.ttl(cache_key)
+                cached, remaining = pipe.results
+
+        price = self._store_local(cache_key, cached) if cached is not None else None
+        if price is None:
+            self.metrics.incr(PRICE_FAMILY, "misses")
+            return None
+
+        self.metrics.incr(PRICE_FAMILY, "hits")
+        if loader is not None and isinstance(price, Price) and policy.should_refresh(remaining):
+            self._refresh_in_background(cache_key, loader)
+        return price
+
+    def _refresh_in_background(self, cache_key: str, loader: Callable[[], Awaitable[Price | None]]):
+        task = asyncio.create_task(self._refresh(cache_key, loader))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._on_refresh_done)
+
+    async def _refresh(self, cache_key: str, loader: Callable[[], Awaitable[Price | None]]) -> Price | None:
+        # A recarga passa pelo single flight: concorre com as cargas da réplica pela mesma chave
+        return await self.single_flight.do(cache_key, lambda: self._load_and_set(cache_key, loader))
+
+    def _on_refresh_done(self, task: asyncio.Task):
+        self._refresh_tasks.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning("Falha ao renovar preço no cache", exc_info=task.exception())
+            return
+        self.metrics.incr(PRICE_FAMILY, "refreshes")
+
+    def _store_local(self, cache_key: str, cached: dict | list | int) -> Price | Tombstone | None:
+        if cached == _TOMBSTONE_VALUE:
+            self.local_cache.set(cache_key, TOMBSTONE, self._local_tombstone_ttl())
+            return TOMBSTONE
+        if isinstance(cached, list):
+            if len(cached) != len(_PACKED_PRICE_FIELDS):
+                return None
+            price = unpack_price(cached)
+        elif isinstance(cached, dict):
+            # Entrada gravada como dicionário por versões anteriores
+            price = Price.model_validate(cached)
+        else:
+            return None
+        self.local_cache.set(cache_key, price)
+        return price
+
+    def _local_tombstone_ttl(self) -> float:
+        return min(self.local_cache.ttl_seconds, self.tombstone_ttl_seconds)
+
+    async def load(self, cache_key: str, loader: Callable[[], Awaitable[Price | None]]) -> Price | None:
+        """
+        Carrega um preço ausente do cache, garantindo uma única carga por chave.
+
+        Requisições concorrentes nesta réplica aguardam a mesma carga. Com o lock habilitado,
+        somente uma réplica executa o loader; as demais aguardam o preço aparecer no Redis.
+
+        :param cache_key: Chave do preço (ver build_key).
+        :param loader: Função que busca o preço na origem (banco de dados).
+        :return: Preço carregado (e armazenado no cache) ou None se não existir (e a lápide é gravada).
+        """
+        return await self.single_flight.do(cache_key, lambda: self._load(cache_key, loader))
+
+    async def _load(self, cache_key: str, loader: Callable[[], Awaitable[Price | None]]) -> Price | None:
+        if not self.lock_enabled:
+            return await self._load_and_set(cache_key, loader)
+
+        lock_key = f"lock:{cache_key}"
+        token = await self.redis_adapter.acquire_lock(lock_key, self.lock_lease_seconds)
+        if token is None:
+            price = await self._wait_for_other_replica(cache_key)
+            if price is not None:
+                return _found(price)
+            # O lease expirou sem que a outra réplica populasse o cache
+            return await self._load_and_set(cache_key, loader)
+
+        try:
+            # Outra réplica pode ter concluído a carga entre a falha no cache e a aquisição do lock
+            price = await self.get(cache_key)
+            if price is not None:
+                return _found(price)
+            return await self._load_and_set(cache_key, loader)
+        finally:
+            await self.redis_adapter.release_lock(lock_key, token)
+
+    async def _wait_for_other_replica(self, cache_key: str) -> Price | Tombstone | None:
+        deadline = time.monotonic() + self.lock_lease_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.lock_poll_interval_seconds)
+            price = await self.get(cache_key)
+            if price is not None:
+                return price
+        return None
+
+    async def _load_and_set(self, cache_key: str, loader: Callable[[], Awaitable[Price | None]]) -> Price | None:
+        with self.metrics.timer(PRICE_FAMILY, "load"):
+            price = await loader()
+        if price is not None:
+            await self.set(cache_key, price)
+        else:
+            await self.set_tombstones([cache_key])
+        return price
+
+    async def get_many(self, cache_keys: list[str]) -> dict[str, Price | Tombstone | None]:
+        """
+        Busca vários preços: primeiro no cache local e, para as chaves restantes, em um único MGET no Redis.
+
+        :param cache_keys: Chaves dos preços (ver build_key).
+        :return: Dicionário chave -> Price (ou TOMBSTONE), com None para as chaves ausentes nos dois níveis.
+        """
+        found: dict[str, Price | Tombstone | None] = {key: self.local_cache.get(key) for key in cache_keys}
+        missing = [key for key, price in found.items() if price is None]
+        if not missing:
+            return found
+
+        with self.metrics.timer(PRICE_FAMILY, "get"):
+            values = await self.redis_adapter.mget_json(missing)
+
+        for key, cached in zip(missing, values):
+            found[key] = self._store_local(key, cached) if cached is not None else None
+            self.metrics.incr(PRICE_FAMILY, "misses" if found[key] is None else "hits")
+        return found
+
+    async def get_generation(self, seller_id: str) -> int:
+        """
+        Geração atual das listagens do seller. Deve ser lida antes de consultar o banco: se uma escrita
+        ocorrer durante a consulta, a listagem é gravada sob a geração anterior e nunca será lida.
+        """
+        generation = await self.redis_adapter.get_str(self.generation_key(seller_id))
+        return int(generation) if generation else 0
+
+    async def get_listing(self, seller_id: str, generation: int, params: dict) -> list[Price] | None:
+        """
+        Busca uma página de listagem do seller na geração informada.
+
+        :param params: Filtros, ordenação e paginação que identificam a página.
+        :return: Preços da página ou None se não estiver no cache.
+        """
+        with self.metrics.timer(LISTING_FAMILY, "get"):
+            cached = await self.redis_adapter.get_json(self.listing_key(seller_id, generation, params))
+        if not isinstance(cached, list):
+            self.metrics.incr(LISTING_FAMILY, "misses")
+            return None
+        self.metrics.incr(LISTING_FAMILY, "hits")
+        return [unpack_price(packed) for packed in cached]
+
+    async def set_listing(self, seller_id: str, generation: int, params: dict, prices: list[Price]):
+        """
+        Armazena uma página de listagem do seller sob a geração lida antes da consulta ao banco.
+        """
+        policy = self.policies.for_family(LISTING_FAMILY)
+        if not policy.enabled:
+            return
+        await self.redis_adapter.set_json(
+            self.listing_key(seller_id, generation, params),
+            [pack_price(price) for price in prices],
+            expires_in_seconds=policy.expires_in(),
+        )
+        self.metrics.incr(LISTING_FAMILY, "sets")
+
+    async def set_many(self, prices: list[Price], tombstone_keys: list[str] | None = None):
+        """
+        Armazena vários preços nos dois níveis do cache e, opcionalmente, lápides para as chaves
+        não encontradas no banco, com uma única ida ao Redis.
+        """
+        items = {self.build_key(price.seller_id, price.sku): price for price in prices}
+        tombstone_keys = tombstone_keys if tombstone_keys and self.tombstone_ttl_seconds > 0 else []
+        if not items and not tombstone_keys:
+            return
+
+        async with self.redis_adapter.pipeline() as pipe:
+            for key, price in items.items():
+                pipe.set_json_if_newer(key, pack_price(price), self.version_of(price), self.policies.expires_in(key))
+            for key in tombstone_keys:
+                # Somente em chaves sem valor: a lápide nunca sobrescreve um preço
+                pipe.set_json(key, _TOMBSTONE_VALUE, self.tombstone_ttl_seconds, nx=True)
+
+        results = iter(pipe.results)
+        for (key, price), stored in zip(items.items(), results):
+            self._apply_set(key, price, stored)
+        for key, stored in zip(tombstone_keys, results):
+            if stored:
+                self.local_cache.set(key, TOMBSTONE, self._local_tombstone_ttl())
+                self.metrics.incr(PRICE_FAMILY, "tombstones")
+
+    async def set_tombstones(self, cache_keys: list[str]):
+        """
+        Grava lápides para preços não encontrados no banco, somente nas chaves que não possuem valor.
+        """
+        await self.set_many([], tombstone_keys=cache_keys)
+
+    async def set(self, cache_key: str, price: Price) -> bool:
+        """
+        Armazena o preço nos dois níveis do cache, se não houver no Redis uma versão mais nova.
+
+        :return: True se o preço foi armazenado.
+        """
+        stored = await self.redis_adapter.set_json_if_newer(
+            cache_key,
+            pack_price(price),
+            self.version_of(price),
+            expires_in_seconds=self.policies.expires_in(cache_key),
+        )
+        self._apply_set(cache_key, price, stored)
+        return stored
+
+    def _apply_set(self, cache_key: str, price: Price, stored: bool):
+        if stored:
+            self.local_cache.set(cache_key, price)
+            self.metrics.incr(PRICE_FAMILY, "sets")
+        else:
+            self.local_cache.delete(cache_key)
+
+    def _queue_write(self, pipe: RedisPipeline, cache_key: str, price: Price, created: bool):
+        if created:
+            # A versão da remoção anterior (instante do delete) pode ser mais nova que a do preço recriado:
+            # a lápide e a remoção são substituídas de imediato; somente um preço mais novo é mantido
+            pipe.set_json_if_newer_or_absent(
+                cache_key,
+                pack_price(price),
+                self.version_of(price),
+                _TOMBSTONE_VALUE,
+                self.policies.expires_in(cache_key),
+            )
+        else:
+            pipe.set_json_if_newer(
+                cache_key, pack_price(price), self.version_of(price), self.policies.expires_in(cache_key)
+            )
+
+    async def write_through(self, price: Price, created: bool = False):
+        """
+        Armazena o preço recém gravado no banco, invalida as listagens do seller e avisa as demais réplicas,
+        com uma única ida ao Redis.
+
+        :param created: O preço acabou de ser criado: substitui a lápide e a remoção anterior no cache.
+        """
+        cache_key = self.build_key(price.seller_id, price.sku)
+        async with self.redis_adapter.pipeline() as pipe:
+            self._queue_write(pipe, cache_key, price, created)
+            pipe.incr(self.generation_key(price.seller_id))
+            pipe.publish(self.invalidation_channel, cache_key)
+        self._apply_set(cache_key, price, pipe.results[0])
+        self.metrics.incr(LISTING_FAMILY, "invalidations")
+
+    async def write_through_many(self, prices: list[Price], created_skus: Collection[str] = ()):
+        """
+        Versão em lote do write_through: armazena os preços, invalida as listagens de cada seller uma única vez
+        e avisa as demais réplicas, tudo em uma única ida ao Redis.
+
+        :param created_skus: Skus dos preços que acabaram de ser criados (ver write_through).
+        """
+        if not prices:
+            return
+
+        items = {self.build_key(price.seller_id, price.sku): price for price in prices}
+        sellers = list(dict.fromkeys(price.seller_id for price in prices))
+        async with self.redis_adapter.pipeline() as pipe:
+            for key, price in items.items():
+                self._queue_write(pipe, key, price, price.sku in created_skus)
+            for seller_id in sellers:
+                pipe.incr(self.generation_key(seller_id))
+            for key in items:
+                pipe.publish(self.invalidation_channel, key)
+        for (key, price), stored in zip(items.items(), pipe.results):
+            self._apply_set(key, price, stored)
+        self.metrics.incr(LISTING_FAMILY, "invalidations", len(sellers))
+
+    async def invalidate(self, seller_id: str, sku: str):
+        """
+        Remove o preço dos dois níveis, invalida as listagens do seller e avisa as demais réplicas,
+        com uma única ida ao Redis.
+        A remoção é versionada com o instante atual, para que cargas atrasadas não recriem a entrada.
+        """
+        cache_key = self.build_key(seller_id, sku)
+        self.local_cache.delete(cache_key)
+        async with self.redis_adapter.pipeline() as pipe:
+            pipe.delete_if_newer(
+                cache_key, int(utcnow().timestamp() * 1000), self.policies.for_key(cache_key).ttl_seconds
+            )
+            pipe.incr(self.generation_key(seller_id))
+            pipe.publish(self.invalidation_channel, cache_key)
+        self.metrics.incr(PRICE_FAMILY, "invalidations")
+        self.metrics.incr(LISTING_FAMILY, "invalidations")
+
+    def _on_invalidation(self, cache_key: str):
+        self.local_cache.delete(cache_key)
+
+    async def _listen_invalidations(self):
+        while True:
+            try:
+                await self.redis_adapter.subscribe(self.invalidation_channel, self._on_invalidation)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha na assinatura do canal de invalidação de cache")
+            # Mensagens podem ter sido perdidas enquanto a assinatura esteve fora
+            self.local_cache.clear()
+            await asyncio.sleep(self.reconnect_delay_seconds)
+
+    def start_invalidation_listener(self):
+        """
+        Inicia, em segundo plano, a escuta das invalidações publicadas pelas demais réplicas.
+        """
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
+
+    async def stop_invalidation_listener(self):
+        if self._listener_task is None:
+            return
+        self._listener_task.cancel()
+        try:
+            await self._listener_task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._listener_task = None
+
+    def stats(self) -> dict:
+        """
+        Contadores de acerto e falha por nível do cache.
+        """
+        count = self.metrics.count
+        return {
+            "local": self.local_cache.stats(),
+            "redis": {"hits": count(PRICE_FAMILY, "hits"), "misses": count(PRICE_FAMILY, "misses")},
+            "listing": {"hits": count(LISTING_FAMILY, "hits"), "misses": count(LISTING_FAMILY, "misses")},
+            "refreshes": count(PRICE_FAMILY, "refreshes"),
+        }
+
+
+def _found(cached: Price | Tombstone) -> Price | None:
+    return cached if isinstance(cached, Price) else None
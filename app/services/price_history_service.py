@@ -1,10 +1,15 @@
+from datetime import datetime
+from typing import AsyncGenerator
+
 from pclogging import LoggingBuilder
 
 from app.api.common.schemas import Paginator
+from app.common.datetime import utcnow
+from app.common.exceptions.export_exceptions import InvalidExportPeriodException
 from app.common.exceptions.price_exceptions import PriceNotFoundException
-from app.models.price_filter_model import PriceFilter
+from app.models.price_history_filter_model import PriceHistoryFilter
 from app.models.price_history_model import PriceHistory
-from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.price_history_repository import PriceHistoryRepository, add_months, month_start
 
 from .base import CrudService
 
@@ -15,23 +20,37 @@ logger = LoggingBuilder.get_logger(__name__)
 
 class PriceHistoryService(CrudService[PriceHistory]):
 
-    def __init__(self, repository: PriceHistoryRepository):
+    def __init__(self, repository: PriceHistoryRepository, export_batch_size: int = 1000, retention_months: int = 0):
+        """
+        :param repository: Repositório do histórico de preços.
+        :param export_batch_size: Registros lidos do banco por vez nas exportações.
+        :param retention_months: Meses completos do histórico mantidos antes do atual (0 mantém todos). As
+            consultas do histórico de um produto se limitam a esse período, ou seja, às partições mantidas.
+        """
         super().__init__(repository)
+        self.export_batch_size = export_batch_size
+        self.retention_months = retention_months
+
+    def _product_filter(self, seller_id: str, sku: str) -> PriceHistoryFilter:
+        # Sem limite inferior de registered_at, a consulta percorreria todas as partições mensais
+        start = add_months(month_start(utcnow()), -self.retention_months) if self.retention_months > 0 else None
+        return PriceHistoryFilter(seller_id=seller_id, sku=sku, registered_at__ge=start)
 
     async def get_by_seller_id_and_sku(self, seller_id: str, sku: str, paginator: Paginator) -> list[PriceHistory]:
         """
-        Busca o histórico de preços de um produto por seller_id e sku.
+        Busca o histórico de preços de um produto por seller_id e sku, dentro do período de retenção.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
         :param paginator: Objeto Paginator para controle de paginação.
-        :return: Lista de instâncias de PriceHistory.
+        :return: Lista de instâncias de PriceHistory, com o registro a mais de Paginator.fetch_limit
+            (ver Paginator.page).
         :raises PriceNotFoundException: Se não houver histórico.
         """
 
         logger.info(f"Buscando histórico de preços para seller_id: {seller_id}, sku: {sku}")
 
-        filters = PriceFilter(seller_id=seller_id, sku=sku)
+        filters = self._product_filter(seller_id, sku)
         results = await self.find(filters=filters, paginator=paginator)
 
         if not results:
@@ -49,10 +68,10 @@ class PriceHistoryService(CrudService[PriceHistory]):
 
         logger.info(f"Recuperando os últimos {n} preços para seller_id: {seller_id}, sku: {sku}")
 
-        filters = PriceFilter(seller_id=seller_id, sku=sku)
+        filters = self._product_filter(seller_id, sku)
         # Cria um paginator manualmente, ordenando por registered_at desc
         paginator = Paginator(request_path="/", limit=n, offset=0, sort="registered_at:desc")
-        results = await self.find(filters=filters, paginator=paginator)
+        results = paginator.page(await self.find(filters=filters, paginator=paginator))
 
         if not results:
             logger.warning(f"Nenhum histórico encontrado para seller_id: {seller_id}, sku: {sku}")
@@ -60,3 +79,32 @@ class PriceHistoryService(CrudService[PriceHistory]):
 
         logger.debug(f"Encontrados {len(results)} registros de histórico")
         return results
+
+    def export(
+        self,
+        seller_id: str,
+        skus: list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> AsyncGenerator[PriceHistory, None]:
+        """
+        Percorre o histórico de preços do seller, lido do banco em lotes de export_batch_size (cursor no servidor).
+        A ordem (sku, registered_at desc, id desc) é a do índice idx_preco_historico_sellerid_sku_registered_at,
+        e o período limita as partições mensais consultadas.
+
+        :param seller_id: Identificador do vendedor.
+        :param skus: Restringe aos skus informados.
+        :param start: Início do período (inclusive) de registered_at.
+        :param end: Fim do período (exclusive) de registered_at.
+        :return: Iterador assíncrono dos registros de histórico.
+        :raises InvalidExportPeriodException: Se o início não for anterior ao fim.
+        """
+        if start is not None and end is not None and start >= end:
+            raise InvalidExportPeriodException(start=start, end=end)
+
+        logger.info(
+            f"Exportando histórico de preços para seller_id: {seller_id}, skus: {skus}, período: {start} - {end}"
+        )
+
+        filters = PriceHistoryFilter(seller_id=seller_id, sku__in=skus, registered_at__ge=start, registered_at__lt=end)
+        return self.stream(filters, sort={"sku": 1, "registered_at": -1}, batch_size=self.export_batch_size)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Literal
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.models.price_history_model import PriceHistory
+from app.services.price_history_service import PriceHistoryService
+
+logger = logging.getLogger(__name__)
+
+HistoryWriteMode = Literal["durable", "buffered"]
+
+# Banco indisponível: a falha não é dos registros, que voltam para o buffer em vez de serem descartados
+_UNAVAILABLE_ERRORS = (OSError, OperationalError, InterfaceError, PoolTimeoutError)
+
+
+class PriceHistoryWriter:
+    """
+    Gravação do histórico de preços.
+
+    - durable: cada registro é inserido na hora, na transação da gravação do preço: o preço nunca é gravado
+      sem o histórico.
+    - buffered: após o commit da gravação do preço, os registros vão para um buffer em memória, gravado em
+      segundo plano com INSERTs de várias linhas (batch_size registros cada) ao atingir batch_size registros
+      ou a cada flush_seconds, e esvaziado no desligamento (stop). Tira o INSERT do histórico do tempo da
+      requisição; em troca, os registros ainda no buffer se perdem se o processo cair.
+
+    No modo buffered, os registros são gravados na hora, como no durable, quando o buffer está cheio
+    (max_buffer_size) ou a gravação em segundo plano não está em execução (antes de start ou após stop):
+    a memória fica limitada.
+
+    Um lote que falha volta para o início do buffer e é tentado de novo até max_batch_retries vezes; depois,
+    os seus registros são gravados um a um, e os que ainda falharem são descartados e registrados no log
+    (dead letter), para que um registro inválido não impeça a gravação dos demais.
+    """
+
+    def __init__(
+        self,
+        price_history_service: PriceHistoryService,
+        mode: HistoryWriteMode = "durable",
+        batch_size: int = 500,
+        max_buffer_size: int = 10_000,
+        flush_seconds: float = 1.0,
+        max_batch_retries: int = 3,
+    ):
+        self.price_history_service = price_history_service
+        self.mode = mode
+        self.batch_size = batch_size
+        self.max_buffer_size = max_buffer_size
+        self.flush_seconds = flush_seconds
+        self.max_batch_retries = max_batch_retries
+        self._buffer: deque[PriceHistory] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        # Falhas seguidas do lote no início do buffer
+        self._batch_failures = 0
+        self._counters = {
+            "buffered": 0,
+            "inline": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "failures": 0,
+            "dead_letters": 0,
+        }
+
+    @property
+    def buffering(self) -> bool:
+        """
+        Indica se os registros estão sendo enviados ao buffer (modo buffered, com a gravação em execução).
+        """
+        return self.mode == "buffered" and self._flush_task is not None and not self._flush_task.done()
+
+    def _writes_inline(self) -> bool:
+        return not self.buffering or len(self._buffer) >= self.max_buffer_size
+
+    async def write(self, history: PriceHistory):
+        """
+        Grava um registro de histórico: na hora, na transação em andamento (modo durable ou buffer cheio), ou
+        no buffer, após o commit dela. Se a transação for desfeita, o registro não vai para o buffer.
+
+        :param history: Registro de histórico da gravação de um preço.
+        """
+        if self._writes_inline():
+            await self.price_history_service.create(history)
+            self._counters["inline"] += 1
+            return
+        self.price_history_service.after_commit(lambda: self._enqueue([history]))
+
+    async def write_many(self, histories: list[PriceHistory]):
+        """
+        Grava vários registros de histórico, como write; na hora, com um único INSERT de várias linhas.
+
+        :param histories: Registros de histórico da gravação de preços em lote.
+        """
+        if not histories:
+            return
+        if self._writes_inline():
+            await self.price_history_service.insert_many(histories)
+            self._counters["inline"] += len(histories)
+            return
+        self.price_history_service.after_commit(lambda: self._enqueue(histories))
+
+    def _enqueue(self, histories: list[PriceHistory]):
+        self._buffer.extend(histories)
+        self._counters["buffered"] += len(histories)
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> int:
+        """
+        Grava os registros que estão no buffer, em lotes de até batch_size registros (um INSERT de várias linhas
+        cada). Os que chegam durante a gravação ficam para a próxima, para que se acumulem em lotes maiores.
+        Se um lote falhar, ele volta para o início do buffer e é gravado na próxima tentativa; na
+        max_batch_retries-ésima falha, é gravado registro a registro (ver _insert_rows).
+
+        :return: Quantidade de registros gravados.
+        :raises Exception: Erro do lote mantido no buffer (ou do banco indisponível na gravação registro a
+            registro).
+        """
+        flushed = 0
+        async with self._flush_lock:
+            remaining = len(self._buffer)
+            while remaining > 0:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, remaining))]
+                try:
+                    await self.price_history_service.insert_many(batch)
+                except Exception:
+                    self._counters["failures"] += 1
+                    self._batch_failures += 1
+                    if self._batch_failures < self.max_batch_retries:
+                        self._buffer.extendleft(reversed(batch))
+                        logger.exception(
+                            "Falha ao gravar %d registros de histórico; mantidos no buffer",
+                            len(batch),
+                            extra={"quantidade": len(batch), "buffer": len(self._buffer)},
+                        )
+                        raise
+                    logger.exception(
+                        "Falha ao gravar %d registros de histórico após %d tentativas; gravando um a um",
+                        len(batch),
+                        self._batch_failures,
+                        extra={"quantidade": len(batch), "buffer": len(self._buffer)},
+                    )
+                    self._batch_failures = 0
+                    written = await self._insert_rows(batch)
+                else:
+                    self._batch_failures = 0
+                    written = len(batch)
+                    self._counters["flushes"] += 1
+                remaining -= len(batch)
+                flushed += written
+                self._counters["flushed"] += written
+        return flushed
+
+    async def _insert_rows(self, batch: list[PriceHistory]) -> int:
+        """
+        Grava os registros de um lote que falhou, um INSERT por registro. Os registros que falharem são
+        descartados e registrados no log; se o banco estiver indisponível, os restantes voltam para o buffer.
+
+        :return: Quantidade de registros gravados.
+        """
+        written = 0
+        for index, history in enumerate(batch):
+            try:
+                await self.price_history_service.create(history)
+            except _UNAVAILABLE_ERRORS:
+                self._buffer.extendleft(reversed(batch[index:]))
+                raise
+            except Exception:
+                self._counters["dead_letters"] += 1
+                logger.exception(
+                    "Registro de histórico descartado após falhas de gravação",
+                    extra={"historico": history.model_dump(mode="json")},
+                )
+            else:
+                written += 1
+        return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Já registrado em flush; os registros continuam no buffer para a próxima tentativa
+                pass
+
+    def start(self):
+        """
+        Inicia, em segundo plano, a gravação do buffer (somente no modo buffered).
+        """
+        if self.mode == "buffered" and not self.buffering:
+            self._flush_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra a gravação em segundo plano e grava o que restou no buffer, com até max_batch_retries
+        tentativas por lote. Falhas são registradas no log e contadas em failures, sem interromper o
+        desligamento; os registros não gravados permanecem no buffer (pending). Os registros seguintes são
+        gravados na hora.
+        """
+        if self._flush_task is not None:
+            # Aguarda o lote em gravação, se houver: a tarefa não é cancelada no meio de um INSERT
+            async with self._flush_lock:
+                self._flush_task.cancel()
+                try:
+                    await self._flush_task
+                except asyncio.CancelledError:
+                    pass
+                finally:
+                    self._flush_task = None
+        if not self._buffer:
+            return
+        flushed_before = self._counters["flushed"]
+        for _ in range(self.max_batch_retries):
+            try:
+                await self.flush()
+            except Exception:
+                # Já registrado e contado em flush
+                continue
+            break
+        flushed = self._counters["flushed"] - flushed_before
+        logger.info("Histórico em buffer gravado no desligamento: %d registros", flushed, extra={"quantidade": flushed})
+        if self._buffer:
+            logger.error(
+                "Histórico em buffer não gravado no desligamento: %d registros",
+                len(self._buffer),
+                extra={"quantidade": len(self._buffer)},
+            )
+
+    def stats(self) -> dict:
+        """
+        Registros no buffer e contadores desta réplica: enviados ao buffer, gravados na hora (inline), gravados
+        a partir do buffer (flushed, em flushes INSERTs de lotes), falhas de gravação do buffer e registros
+        descartados após as falhas (dead_letters).
+        """
+        return {"mode": self.mode, "pending": len(self._buffer), **self._counters}
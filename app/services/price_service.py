@@ -1,21 +1,28 @@
 import asyncio
 import logging
 import uuid
+from typing import AsyncGenerator, Awaitable, Callable, NoReturn
 
 from app.api.common.schemas import Paginator
+from app.integrations.cache.cache_metrics import CacheMetrics
+from app.integrations.cache.cache_policy import CachePolicyRegistry
 from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.queue.rabbitmq_adapter import RabbitMQProducer
 from app.models.price_history_model import PriceHistory
 from app.repositories.price_history_repository import PriceHistoryRepository
+from app.services.price_cache_service import PriceCacheService, Tombstone
 from app.services.price_history_service import PriceHistoryService
+from app.services.price_history_writer import PriceHistoryWriter
 
 from ..common.exceptions.price_exceptions import PriceBadRequestException, PriceNotFoundException
-from ..models import Price, PriceFilter
+from ..models import Price, PriceBatchResult, PriceBatchStatus, PriceFilter
 from ..repositories import PriceRepository
 from .base import CrudService
 
 logger = logging.getLogger(__name__)
 
+SUGGESTION_FAMILY = "suggestion"
+
 
 class PriceService(CrudService[Price]):
     """
@@ -28,6 +35,8 @@ class PriceService(CrudService[Price]):
     alert_queue_producer: RabbitMQProducer
     suggestion_queue_producer: RabbitMQProducer
     price_history_service: PriceHistoryService
+    history_writer: PriceHistoryWriter
+    price_cache: PriceCacheService
 
     def __init__(
         self,
@@ -37,12 +46,22 @@ class PriceService(CrudService[Price]):
         redis_adapter: RedisAsyncioAdapter,
         alert_queue_producer: RabbitMQProducer,
         suggestion_queue_producer: RabbitMQProducer,
+        price_cache: PriceCacheService | None = None,
+        cache_policies: CachePolicyRegistry | None = None,
+        cache_metrics: CacheMetrics | None = None,
+        export_batch_size: int = 1000,
+        history_writer: PriceHistoryWriter | None = None,
     ):
         """
         Inicializa o serviço de preços com o repositório fornecido e o adaptador Redis.
 
         :param repository: Instância de PriceRepository para acesso aos dados.
         :param redis_adapter: Instância de RedisAsyncioAdapter para cache.
+        :param price_cache: Cache de preços em dois níveis. Se None, é criado sobre o redis_adapter.
+        :param cache_policies: Políticas de expiração por família de chaves. Se None, utiliza as do price_cache.
+        :param cache_metrics: Métricas do cache por família de chaves. Se None, utiliza as do price_cache.
+        :param export_batch_size: Preços lidos do banco por vez na exportação do catálogo (ver export_catalog).
+        :param history_writer: Gravação do histórico de preços. Se None, grava na transação do preço (durable).
         """
         super().__init__(repository)
         self.redis_adapter = redis_adapter
@@ -50,14 +69,22 @@ class PriceService(CrudService[Price]):
         self.suggestion_queue_producer = suggestion_queue_producer
         self.price_history_repo = price_history_repo
         self.price_history_service = price_history_service
+        self.price_cache = price_cache if price_cache is not None else PriceCacheService(redis_adapter)
+        self.cache_policies = cache_policies if cache_policies is not None else self.price_cache.policies
+        self.cache_metrics = cache_metrics if cache_metrics is not None else self.price_cache.metrics
+        self.export_batch_size = export_batch_size
+        self.history_writer = (
+            history_writer if history_writer is not None else PriceHistoryWriter(price_history_service)
+        )
 
     async def get_filtered(self, paginator=Paginator, filters=dict) -> list[Price]:
         """
         Recupera uma lista de preços filtrados e paginados.
 
         :param paginator: Objeto Paginator para controle de paginação.
-        :param filters: Dicionário de filtros a serem aplicados na busca.
+        :param filters: Dicionário de filtros a serem aplicados na busca, incluindo o seller_id.
         :return: Lista de instâncias de Preco filtradas e paginadas.
+        :raises BadRequestException: Se o seller_id não for informado.
         """
 
         # Cria o dicionário de filtros apenas com os valores que não são None
@@ -65,68 +92,164 @@ class PriceService(CrudService[Price]):
 
         filter_model = PriceFilter(**current_filters)
 
-        return await self.find(filters=filter_model, paginator=paginator)
+        seller_id = filter_model.seller_id
+        if seller_id is None:
+            # Listagens são sempre de um seller (índices iniciados por seller_id); sem ele, varreriam a tabela
+            self._raise_bad_request("seller_id obrigatório na listagem de preços.", "seller_id")
+
+        if paginator.count is not None:
+            # O total não é cacheado: listagens com contagem vão sempre ao banco
+            return await self.find(filters=filter_model, paginator=paginator)
+
+        # Listagens de um seller são cacheadas sob a geração atual, lida antes da consulta ao banco
+        params = {
+            "filters": filter_model.model_dump(exclude_none=True),
+            "sort": list((paginator.get_sort_order() or {}).items()),
+            "limit": paginator.limit,
+            "offset": paginator.offset,
+            "cursor": paginator.cursor,
+        }
+        generation = await self.price_cache.get_generation(seller_id)
+        cached = await self.price_cache.get_listing(seller_id, generation, params)
+        if cached is not None:
+            return cached
+
+        results = await self.find(filters=filter_model, paginator=paginator)
+        await self.price_cache.set_listing(seller_id, generation, params, results)
+        return results
 
     async def get_by_seller_id_and_sku(self, seller_id: str, sku: str) -> Price:
         """
         Busca um preço pelo seller_id e sku.
-        Caso o preço esteja no cache, retorna a instância diretamente.
+        Caso o preço esteja no cache, retorna a instância diretamente; se o cache indicar que o preço
+        não existe (lápide), falha sem consultar o banco.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
         :return: Instância de Preco encontrada.
         :raises NotFoundException: Se não encontrar o preço.
         """
-        cache_key = f"price:{seller_id}:{sku}"
-        cached = await self.find_price_in_cache(seller_id, sku, cache_key)
+        cache_key = self.price_cache.build_key(seller_id, sku)
+        cached = await self.find_price_in_cache(seller_id, sku, cache_key, lambda: self._load_price(seller_id, sku))
 
-        if cached is not None:
+        if isinstance(cached, Tombstone):
+            raise self._price_not_found(seller_id, sku)
+
+        if isinstance(cached, Price):
             return cached
 
-        price_dict = await super().find_by_seller_id_and_sku(seller_id, sku)
+        # Requisições concorrentes pela mesma chave compartilham uma única carga do banco
+        price = await self.price_cache.load(cache_key, lambda: self._load_price(seller_id, sku))
 
-        self._raise_not_found(seller_id, sku, price_dict is None)
+        if price is None:
+            raise self._price_not_found(seller_id, sku)
 
-        await self.redis_adapter.set_json(cache_key, price_dict.model_dump(mode="json"), expires_in_seconds=300)
+        return price
 
+    async def _load_price(self, seller_id: str, sku: str) -> Price | None:
+        """
+        Busca o preço no banco de dados, sem passar pelo cache.
+        """
+        price_dict = await super().find_by_seller_id_and_sku(seller_id, sku)
+        if price_dict is None:
+            return None
         return Price.model_validate(price_dict)
 
-    async def find_price_in_cache(self, seller_id: str, sku: str, cache_key: str) -> Price | None:
+    async def get_by_seller_id_and_skus(self, seller_id: str, skus: list[str]) -> dict[str, Price | None]:
         """
-        Busca um preço pelo seller_id e sku, utilizando cache.
+        Busca os preços de vários skus de um seller.
+        Resolve o cache com um único MGET, carrega as falhas com uma única consulta (sku IN (...))
+        e repopula o cache com os preços encontrados no banco.
+
+        :param seller_id: Identificador do vendedor.
+        :param skus: Códigos dos produtos.
+        :return: Dicionário sku -> Preco, com None para os skus não encontrados, na ordem informada.
+        """
+        skus = list(dict.fromkeys(skus))
+        keys = {sku: self.price_cache.build_key(seller_id, sku) for sku in skus}
+        cached = await self.price_cache.get_many(list(keys.values()))
+
+        # Skus com lápide sabidamente não existem: não vão ao banco
+        missing = [sku for sku, key in keys.items() if cached.get(key) is None]
+        prices: dict[str, Price | None] = {}
+        for sku, key in keys.items():
+            price = cached.get(key)
+            prices[sku] = price if isinstance(price, Price) else None
+        logger.info(
+            "Busca em lote para seller_id=%s: %d skus, %d encontrados no cache",
+            seller_id,
+            len(skus),
+            len(skus) - len(missing),
+            extra={"seller_id": seller_id},
+        )
+        if not missing:
+            return prices
+
+        loaded = await super().find_by_seller_id_and_skus(seller_id, missing)
+        for price in loaded:
+            prices[price.sku] = price
+        # Preços encontrados e lápides dos inexistentes em uma única ida ao Redis
+        await self.price_cache.set_many(loaded, tombstone_keys=[keys[sku] for sku in missing if prices[sku] is None])
+
+        return prices
+
+    def export_catalog(self, seller_id: str) -> AsyncGenerator[Price, None]:
+        """
+        Percorre todos os preços do seller, ordenados por sku, lidos do banco em lotes de export_batch_size
+        (cursor no servidor). Não passa pelo cache: a exportação é uma leitura completa e pontual.
+
+        :param seller_id: Identificador do vendedor.
+        :return: Iterador assíncrono dos preços.
+        """
+        logger.info("Exportando o catálogo de preços do seller_id=%s", seller_id, extra={"seller_id": seller_id})
+        return self.stream(PriceFilter(seller_id=seller_id), sort={"sku": 1}, batch_size=self.export_batch_size)
+
+    async def find_price_in_cache(
+        self, seller_id: str, sku: str, cache_key: str, loader: Callable[[], Awaitable[Price | None]] | None = None
+    ) -> Price | Tombstone | None:
+        """
+        Busca um preço pelo seller_id e sku, utilizando o cache local e o Redis.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
-        :return: Instância de Preco encontrada ou None.
+        :param loader: Busca o preço no banco para renovar em segundo plano uma entrada perto de expirar.
+        :return: Instância de Preco encontrada, TOMBSTONE se o preço sabidamente não existir, ou None.
         """
-        cached = await self.redis_adapter.get_json(cache_key)
-        if cached is not None:
+        cached = await self.price_cache.get(cache_key, loader)
+        if isinstance(cached, Price):
             logger.info(
                 "Preço encontrado no cache para seller_id=%s, sku=%s",
                 seller_id,
                 sku,
                 extra={"seller_id": seller_id, "sku": sku},
             )
-            return Price.model_validate(cached)
-        return None
+        return cached
 
     async def create(self, price_create: Price) -> Price:
         """
         Cria uma nova precificação após validações de unicidade e valores positivos.
+        A unicidade é garantida pelo banco na própria inserção (ON CONFLICT), sem consulta prévia.
 
         :param price_create: Objeto contendo os dados para criação do preço.
         :return: Instância de Preco criada.
         :raises BadRequestException: Se já existir preço para o produto ou valores inválidos.
         """
-        await self._validate_non_existent_price(price_create.seller_id, price_create.sku)
         self._validate_positive_prices(price_create)
 
-        price = Price(**price_create.model_dump())
-        created_price = await super().create(price)
+        # Inserção e histórico em uma única transação: o preço nunca é gravado sem o histórico
+        # (no modo buffered, o histórico vai para o buffer após o commit; ver PriceHistoryWriter)
+        async with self.unit_of_work():
+            price = Price(**price_create.model_dump())
+            created_price = await super().insert_if_absent(price)
+            if created_price is None:
+                self._raise_already_exists(price.seller_id, price.sku)
+
+            # Registra o histórico de preços após a criação
+            price_history_data = price.model_dump()
+            await self.history_writer.write(PriceHistory(**price_history_data))
 
-        # Registra o histórico de preços após a criação
-        price_history_data = price.model_dump()
-        await self.price_history_service.create(PriceHistory(**price_history_data))
+        # Lido logo após a escrita: já deixa o preço no cache (somente após o commit)
+        await self.price_cache.write_through(created_price, created=True)
 
         return created_price
 
@@ -142,49 +265,51 @@ class PriceService(CrudService[Price]):
         :raises BadRequestException: Se valores inválidos forem informados.
         """
 
-        price_dict = await super().find_by_seller_id_and_sku(seller_id, sku)
-        self._raise_not_found(seller_id, sku, price_dict is None)
+        # Leitura, atualização e histórico em uma única sessão e transação
+        async with self.unit_of_work():
+            price_dict = await super().find_by_seller_id_and_sku(seller_id, sku)
+            self._raise_not_found(seller_id, sku, price_dict is None)
 
-        existing_price = Price.model_validate(price_dict)
+            existing_price = Price.model_validate(price_dict)
 
-        # Verifica se o preço já possui alerta pendente
-        self._verify_pending_alert(existing_price)
+            # Verifica se o preço já possui alerta pendente
+            self._verify_pending_alert(existing_price)
 
-        merged_price_data = existing_price.model_dump()
-        merged_price_data.update(update_data.model_dump(exclude_none=True))
-        merged_price_data["updated_by"] = user_info.user
+            merged_price_data = existing_price.model_dump()
+            merged_price_data.update(update_data.model_dump(exclude_none=True))
+            merged_price_data["updated_by"] = user_info.user
 
-        try:
-            merged_price = Price.model_validate(merged_price_data)
-        except ValueError:
-            logger.error(
-                "Erro ao validar dados de atualização",
-                extra={"update_data": update_data},
-            )
-            self._raise_bad_request(
-                message="Dados inválidos para atualização.",
-                field="update_data",
-                value=update_data,
-            )
+            try:
+                merged_price = Price.model_validate(merged_price_data)
+            except ValueError:
+                logger.error(
+                    "Erro ao validar dados de atualização",
+                    extra={"update_data": update_data},
+                )
+                self._raise_bad_request(
+                    message="Dados inválidos para atualização.",
+                    field="update_data",
+                    value=update_data,
+                )
 
-        self._validate_positive_prices(merged_price)
+            self._validate_positive_prices(merged_price)
 
-        variation = self._detects_variation(
-            old_por=existing_price.por,
-            entity=merged_price,
-        )
-        if variation:
-            merged_price.alerta_pendente = True
+            alerta = self._detects_variation(
+                old_por=existing_price.por,
+                entity=merged_price,
+            )
+            if alerta:
+                merged_price.alerta_pendente = True
+                self._send_alerts_after_commit([alerta])
 
-        updated = await super().update_by_seller_id_and_sku(seller_id, sku, merged_price)
+            updated = await super().update_by_seller_id_and_sku(seller_id, sku, merged_price)
 
-        # Registra o histórico de preços após a atualização
-        price_history_data = updated.model_dump(exclude={"id"})
-        await self.price_history_service.create(PriceHistory(**price_history_data))
+            # Registra o histórico de preços após a atualização
+            price_history_data = updated.model_dump(exclude={"id"})
+            await self.history_writer.write(PriceHistory(**price_history_data))
 
-        # Remove o cache do preço atualizado
-        cache_key = f"price:{seller_id}:{sku}"
-        await self.redis_adapter.delete(cache_key)
+        # Atualiza o cache com o preço gravado (write-through)
+        await self.price_cache.write_through(updated)
 
         return updated
 
@@ -199,33 +324,114 @@ class PriceService(CrudService[Price]):
         :raises NotFoundException: Se não encontrar o preço.
         :raises BadRequestException: Se valores inválidos forem informados.
         """
-        price_found = await super().find_by_seller_id_and_sku(seller_id, sku)
-        self._raise_not_found(seller_id, sku, price_found is None)
-        self._validate_positive_prices(entity)
+        # Leitura, atualização e histórico em uma única sessão e transação
+        async with self.unit_of_work():
+            price_found = await super().find_by_seller_id_and_sku(seller_id, sku)
+            self._raise_not_found(seller_id, sku, price_found is None)
+            self._validate_positive_prices(entity)
 
-        # Verifica se há alerta pendente antes de permitir atualização
-        self._verify_pending_alert(price_found)
+            # Verifica se há alerta pendente antes de permitir atualização
+            self._verify_pending_alert(price_found)
 
-        # Verificação de valor de preço
-        variation = self._detects_variation(
-            old_por=price_found.por,
-            entity=entity,
-        )
-        if variation:
-            entity.alerta_pendente = True
+            # Verificação de valor de preço
+            alerta = self._detects_variation(
+                old_por=price_found.por,
+                entity=entity,
+            )
+            if alerta:
+                entity.alerta_pendente = True
+                self._send_alerts_after_commit([alerta])
 
-        updated = await super().update_by_seller_id_and_sku(seller_id, sku, entity)
+            updated = await super().update_by_seller_id_and_sku(seller_id, sku, entity)
 
-        # Registra o histórico de preços após a atualização
-        price_history_data = updated.model_dump(exclude={"id"})
-        await self.price_history_service.create(PriceHistory(**price_history_data))
+            # Registra o histórico de preços após a atualização
+            price_history_data = updated.model_dump(exclude={"id"})
+            await self.history_writer.write(PriceHistory(**price_history_data))
 
-        # Remove o cache do preço atualizado
-        cache_key = f"price:{seller_id}:{sku}"
-        await self.redis_adapter.delete(cache_key)
+        # Atualiza o cache com o preço gravado (write-through)
+        await self.price_cache.write_through(updated)
 
         return updated
 
+    async def upsert_batch(self, seller_id: str, prices: list[Price]) -> list[PriceBatchResult]:
+        """
+        Cria ou atualiza vários preços de um seller de uma só vez.
+        Cada item passa pelas regras das gravações individuais (valores positivos, alerta pendente e variação
+        de preço); um item rejeitado não impede a gravação dos demais. Os aceitos são gravados com um único
+        upsert de várias linhas e um único insert de histórico, na mesma transação (ver PriceHistoryWriter), e o
+        cache é atualizado com uma única ida ao Redis após o commit.
+
+        :param seller_id: Identificador do vendedor.
+        :param prices: Preços a gravar, com seller_id, sku e autor preenchidos.
+        :return: Resultado de cada item, na ordem informada.
+        """
+        results: dict[int, PriceBatchResult] = {}
+        candidates: dict[int, Price] = {}
+        skus = set()
+        for index, price in enumerate(prices):
+            try:
+                if price.sku in skus:
+                    self._raise_bad_request("Sku repetido no lote.", "sku", price.sku)
+                skus.add(price.sku)
+                self._validate_positive_prices(price)
+            except PriceBadRequestException as exc:
+                results[index] = self._rejected(price, exc)
+                continue
+            candidates[index] = price
+
+        saved: list[Price] = []
+        if candidates:
+            async with self.unit_of_work():
+                found_prices = await super().find_by_seller_id_and_skus(
+                    seller_id, [price.sku for price in candidates.values()]
+                )
+                existing = {price.sku: price for price in found_prices}
+
+                accepted: dict[int, Price] = {}
+                alertas: list[dict] = []
+                for index, price in candidates.items():
+                    found = existing.get(price.sku)
+                    if found is not None:
+                        try:
+                            self._verify_pending_alert(found)
+                        except PriceBadRequestException as exc:
+                            results[index] = self._rejected(price, exc)
+                            continue
+                        alerta = self._detects_variation(old_por=found.por, entity=price)
+                        if alerta:
+                            price.alerta_pendente = True
+                            alertas.append(alerta)
+                    accepted[index] = price
+
+                saved = await super().upsert_many(list(accepted.values()))
+                await self.history_writer.write_many(
+                    [PriceHistory(**price.model_dump(exclude={"id"})) for price in saved]
+                )
+                if alertas:
+                    self._send_alerts_after_commit(alertas)
+
+            for index, price in zip(accepted, saved):
+                status = PriceBatchStatus.UPDATED if price.sku in existing else PriceBatchStatus.CREATED
+                results[index] = PriceBatchResult(sku=price.sku, status=status, price=price)
+
+            # Atualiza o cache com os preços gravados (write-through), somente após o commit
+            await self.price_cache.write_through_many(
+                saved, created_skus=[price.sku for price in saved if price.sku not in existing]
+            )
+
+        logger.info(
+            "Gravação em lote para seller_id=%s: %d itens, %d gravados",
+            seller_id,
+            len(prices),
+            len(saved),
+            extra={"seller_id": seller_id},
+        )
+        return [results[index] for index in range(len(prices))]
+
+    @staticmethod
+    def _rejected(price: Price, exc: PriceBadRequestException) -> PriceBatchResult:
+        return PriceBatchResult(sku=price.sku, status=PriceBatchStatus.REJECTED, details=exc.details)
+
     async def delete(self, seller_id: str, sku: str):
         """
         Remove um preço baseado em seller_id e sku.
@@ -234,19 +440,19 @@ class PriceService(CrudService[Price]):
         :param sku: Código do produto.
         :raises NotFoundException: Se o preço não for encontrado.
         """
-        price_found = await super().find_by_seller_id_and_sku(seller_id, sku)
-        self._raise_not_found(seller_id, sku, price_found is None)
+        async with self.unit_of_work():
+            price_found = await super().find_by_seller_id_and_sku(seller_id, sku)
+            self._raise_not_found(seller_id, sku, price_found is None)
 
-        deleted = await super().delete_by_seller_id_and_sku(seller_id, sku)
-        if deleted is False:
-            self._raise_bad_request(
-                message="Erro ao deletar preço.",
-                value=sku,
-            )
+            deleted = await super().delete_by_seller_id_and_sku(seller_id, sku)
+            if deleted is False:
+                self._raise_bad_request(
+                    message="Erro ao deletar preço.",
+                    value=sku,
+                )
 
         # Remove o cache do preço deletado
-        cache_key = f"price:{seller_id}:{sku}"
-        await self.redis_adapter.delete(cache_key)
+        await self.price_cache.invalidate(seller_id, sku)
 
     async def request_price_suggestion(self, seller_id: str, sku: str) -> Price:
         """
@@ -291,9 +497,13 @@ class PriceService(CrudService[Price]):
                 value=str(exc),
             )
 
+        cache_key = f"suggestion:{job_id}"
         await self.redis_adapter.set_json(
-            f"suggestion:{job_id}", {"status": "pending", "suggested_price": None}, expires_in_seconds=300
+            cache_key,
+            {"status": "pending", "suggested_price": None},
+            expires_in_seconds=self.cache_policies.expires_in(cache_key),
         )
+        self.cache_metrics.incr(SUGGESTION_FAMILY, "sets")
 
         return PriceSuggestionResponse(job_id=job_id, status="pending")
 
@@ -308,7 +518,9 @@ class PriceService(CrudService[Price]):
         from app.api.v2.schemas.price_suggestion_schema import PriceSuggestionResponse
 
         cache_key = f"suggestion:{job_id}"
-        suggestion = await self.redis_adapter.get_json(cache_key)
+        with self.cache_metrics.timer(SUGGESTION_FAMILY, "get"):
+            suggestion = await self.redis_adapter.get_json(cache_key)
+        self.cache_metrics.incr(SUGGESTION_FAMILY, "misses" if suggestion is None else "hits")
 
         if suggestion is None:
             logger.error("Job ID %s não encontrado ou inválido.", job_id, extra={"job_id": job_id})
@@ -340,13 +552,13 @@ class PriceService(CrudService[Price]):
                 value=True,
             )
 
-    def _detects_variation(self, old_por, entity) -> bool:
+    def _detects_variation(self, old_por, entity) -> dict | None:
         """
         Detecta se houve variação no preço 'por' (50%).
 
         :param old_por: Valor antigo do preço 'por'.
-        :param new_por: Valor novo do preço 'por'.
-        :return: True se houver variação, False caso contrário.
+        :param entity: Preço com o novo valor 'por'.
+        :return: Alerta a enviar para a fila se houver variação, None caso contrário.
         """
         new_por = entity.por
         seller_id = entity.seller_id
@@ -361,16 +573,27 @@ class PriceService(CrudService[Price]):
                 extra={"seller_id": seller_id, "sku": sku, "old_por": old_por, "new_por": new_por},
             )
             mensagem = f"Variação de preço superior a 50% detectada para {sku}: de {old_por} para {new_por}"
-            alerta = {"seller_id": seller_id, "sku": sku, "mensagem": mensagem, "status": "pendente"}
+            return {"seller_id": seller_id, "sku": sku, "mensagem": mensagem, "status": "pendente"}
+        return None
+
+    def _send_alerts_after_commit(self, alertas: list[dict]):
+        """
+        Envia os alertas para a fila somente após o commit da unidade de trabalho em andamento, para que os
+        consumidores não recebam alertas de gravações desfeitas.
+
+        :param alertas: Alertas retornados por _detects_variation.
+        """
+        self.after_commit(lambda: self._schedule_alerts(alertas))
 
+    def _schedule_alerts(self, alertas: list[dict]):
+        # Callbacks de after_commit são síncronos: o envio roda em uma tarefa
+        for alerta in alertas:
             task = asyncio.create_task(self._call_producer(alerta, "alert"))
             logger.info(
                 "Tarefa criada para enviar evento para a fila: %s",
                 task.get_name(),
-                extra={"seller_id": seller_id, "sku": sku},
+                extra={"seller_id": alerta["seller_id"], "sku": alerta["sku"]},
             )
-            return True
-        return False
 
     async def _call_producer(self, event, producer_name: str):
         try:
@@ -404,23 +627,21 @@ class PriceService(CrudService[Price]):
             logger.warning("Valor inválido para %s: %s", field, value, extra={"field": field, "value": value})
             self._raise_bad_request(f"{field} deve ser maior que zero.", field, value)
 
-    async def _validate_non_existent_price(self, seller_id: str, sku: str):
+    def _raise_already_exists(self, seller_id: str, sku: str) -> NoReturn:
         """
-        Verifica se já existe um preço cadastrado para o seller_id e sku informados.
+        Lança exceção de BadRequestException para preço já cadastrado.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
-        :raises BadRequestException: Se já existir preço cadastrado.
+        :raises BadRequestException: Sempre.
         """
-        price_found = await super().find_by_seller_id_and_sku(seller_id, sku)
-        if price_found is not None:
-            logger.warning(
-                "Preço já cadastrado para seller_id: %s, sku: %s",
-                seller_id,
-                sku,
-                extra={"seller_id": seller_id, "sku": sku},
-            )
-            self._raise_bad_request("Preço para produto já cadastrado.", "sku")
+        logger.warning(
+            "Preço já cadastrado para seller_id: %s, sku: %s",
+            seller_id,
+            sku,
+            extra={"seller_id": seller_id, "sku": sku},
+        )
+        self._raise_bad_request("Preço para produto já cadastrado.", "sku")
 
     @staticmethod
     def _raise_not_found(seller_id: str, sku: str, condition: bool = True):
@@ -432,15 +653,26 @@ class PriceService(CrudService[Price]):
         :raises NotFoundException: Sempre.
         """
         if condition:
-            logger.error(
-                "Preço não encontrado para seller_id=%s, sku=%s",
-                seller_id,
-                sku,
-                extra={"seller_id": seller_id, "sku": sku},
-            )
-            raise PriceNotFoundException(seller_id=seller_id, sku=sku)
+            raise PriceService._price_not_found(seller_id, sku)
+
+    @staticmethod
+    def _price_not_found(seller_id: str, sku: str) -> PriceNotFoundException:
+        """
+        Registra o preço não encontrado e devolve a exceção a lançar.
+
+        :param seller_id: Identificador do vendedor.
+        :param sku: Código do produto.
+        :return: NotFoundException do preço.
+        """
+        logger.error(
+            "Preço não encontrado para seller_id=%s, sku=%s",
+            seller_id,
+            sku,
+            extra={"seller_id": seller_id, "sku": sku},
+        )
+        return PriceNotFoundException(seller_id=seller_id, sku=sku)
 
-    def _raise_bad_request(self, message: str, field: str = None, value=None):
+    def _raise_bad_request(self, message: str, field: str = None, value=None) -> NoReturn:
         """
         Lança exceção de BadRequestException com detalhes do erro.
 
@@ -1,5 +1,9 @@
+from typing import Literal
+
 from pydantic import Field, HttpUrl, PostgresDsn, RedisDsn
 
+from app.integrations.cache.cache_policy import DEFAULT_CACHE_POLICIES, CachePolicy
+
 from .base import BaseSettings
 
 
@@ -16,6 +20,60 @@ class AppSettings(BaseSettings):
     disk_usage_max: int = Field(default=80, title="Limite máximo de 80% de uso de disco")
 
     app_db_url: PostgresDsn = Field(..., title="URI para o banco Postgresql")
+    app_db_pool_size: int = Field(default=5, ge=1, title="Conexões mantidas abertas no pool do banco")
+    app_db_max_overflow: int = Field(
+        default=10, ge=0, title="Conexões extras abertas sob demanda além do tamanho do pool do banco"
+    )
+    app_db_pool_recycle_seconds: int = Field(
+        default=1800, title="Idade máxima (s) de uma conexão do pool antes de ser reaberta (-1 desabilita)"
+    )
+    app_db_pool_pre_ping: bool = Field(default=True, title="Verifica a conexão do pool antes de entregá-la")
+    app_db_pool_timeout_seconds: float = Field(
+        default=30.0, gt=0, title="Espera máxima (s) por uma conexão livre quando o pool do banco está esgotado"
+    )
+    app_db_pool_prewarm: int = Field(
+        default=5, ge=0, title="Conexões com o banco abertas na inicialização (limitado ao tamanho do pool)"
+    )
+    app_db_replica_urls: list[PostgresDsn] = Field(
+        default_factory=list, title="URIs das réplicas de leitura do banco Postgresql (lista JSON)"
+    )
+    app_db_read_your_writes_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        title="Tempo (s) após uma escrita em que as leituras do mesmo seller só vão a réplicas que já a aplicaram",
+    )
+    app_db_prepared_statement_cache_size: int = Field(
+        default=100,
+        ge=0,
+        title="Prepared statements mantidos por conexão pelo asyncpg (0 desabilita, ex.: atrás do PgBouncer)",
+    )
+    app_db_core_reads: bool = Field(
+        default=True, title="Leituras mapeando as linhas do banco direto para os modelos, sem entidades do ORM"
+    )
+    app_export_batch_size: int = Field(
+        default=1000, ge=1, title="Registros lidos do banco por vez nas exportações (cursor no servidor)"
+    )
+    app_history_write_mode: Literal["durable", "buffered"] = Field(
+        default="durable",
+        title="Gravação do histórico: na transação do preço (durable) ou em lotes, em segundo plano (buffered)",
+    )
+    app_history_batch_size: int = Field(default=500, ge=1, title="Registros de histórico por INSERT no modo buffered")
+    app_history_buffer_max_size: int = Field(
+        default=10_000, ge=1, title="Registros de histórico em memória no modo buffered; acima disso, gravados na hora"
+    )
+    app_history_flush_seconds: float = Field(
+        default=1.0, gt=0, title="Intervalo máximo entre as gravações do histórico no modo buffered"
+    )
+    app_history_retention_months: int = Field(
+        default=24,
+        ge=0,
+        title="Meses completos do histórico de preços mantidos antes do atual (0 mantém todos); limita as consultas",
+    )
+    app_history_max_batch_retries: int = Field(
+        default=3,
+        ge=1,
+        title="Tentativas de um lote de histórico no modo buffered antes de gravá-lo registro a registro",
+    )
 
     app_openid_wellknown: HttpUrl = Field(..., title="URL para well known de um openid")
 
@@ -23,6 +81,30 @@ class AppSettings(BaseSettings):
     pc_logging_env: str = Field("prod", description="Ambiente do logging (prod ou dev ou test)")
 
     app_redis_url: RedisDsn = Field(..., title="URL para o Redis")
+    app_cache_codec: Literal["json", "orjson", "msgpack"] = Field(
+        default="json", title="Serialização dos valores gravados no Redis"
+    )
+    app_local_cache_max_size: int = Field(
+        default=10_000, title="Quantidade máxima de preços no cache em memória de cada réplica"
+    )
+    app_local_cache_ttl_seconds: float = Field(
+        default=5.0,
+        title="Tempo de vida (s) dos preços no cache em memória de cada réplica",
+    )
+    app_cache_lock_enabled: bool = Field(
+        default=False, title="Coordena entre as réplicas, via lock no Redis, a carga de preços ausentes do cache"
+    )
+    app_cache_lock_lease_seconds: float = Field(
+        default=3.0, title="Tempo máximo (s) que uma réplica detém o lock de carga de um preço"
+    )
+    app_cache_tombstone_ttl_seconds: int = Field(
+        default=30, title="Tempo de vida (s) do cache de preços inexistentes (0 desabilita)"
+    )
+    app_cache_policies: dict[str, CachePolicy] = Field(
+        default_factory=lambda: dict(DEFAULT_CACHE_POLICIES),
+        title="Políticas de expiração (TTL, variação e refresh-ahead) por família de chaves do cache",
+        description='Famílias: "price", "price-list" e "suggestion". Ex.: APP_CACHE_POLICIES__PRICE__TTL_SECONDS=600',
+    )
 
     app_queue_url: str = Field(..., title="URL para o RabbitMQ")
     app_alert_queue_name: str = Field(..., title="Nome da fila de alertas no RabbitMQ")
@@ -12,5 +12,16 @@ class WorkerSettings(AppSettings):
     ia_api_url: str = Field(..., description="URL da API da IA")
     ia_model: str = Field(..., description="Modelo da IA")
 
+    app_history_partition_months_ahead: int = Field(
+        default=3, ge=1, title="Meses à frente do atual com partição do histórico de preços já criada"
+    )
+    app_history_retention_archive: bool = Field(
+        default=True,
+        title="Desanexa (em vez de remover) as partições expiradas do histórico, para arquivamento externo",
+    )
+    app_history_maintenance_interval_seconds: int = Field(
+        default=21600, ge=60, title="Intervalo (s) entre as manutenções das partições do histórico de preços"
+    )
+
 
 worker_settings = WorkerSettings()
@@ -1,12 +1,16 @@
 from dependency_injector import containers, providers
 
+from app.integrations.cache.cache_policy import CachePolicyRegistry
+from app.integrations.cache.codecs import get_codec
 from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 from app.integrations.queue.rabbitmq_adapter import RabbitMQConsumer
 from app.repositories.alert_repository import AlertRepository
+from app.repositories.price_history_repository import PriceHistoryRepository
 from app.services.alert_service import AlertService
 from app.settings.worker import WorkerSettings
 from app.worker.tasks.create_alert_task import CreateAlertTask
+from app.worker.tasks.history_partition_task import HistoryPartitionTask
 from app.worker.tasks.suggest_price_task import SuggestPriceTask
 
 
@@ -18,9 +22,23 @@ class WorkerContainer(containers.DeclarativeContainer):
     # -----------------------
     # ** Integrações
 
-    sql_client = providers.Singleton(SQLAlchemyClient, config.app_db_url)
+    sql_client = providers.Singleton(
+        SQLAlchemyClient,
+        config.app_db_url,
+        pool_size=config.app_db_pool_size,
+        max_overflow=config.app_db_max_overflow,
+        pool_recycle_seconds=config.app_db_pool_recycle_seconds,
+        pool_pre_ping=config.app_db_pool_pre_ping,
+        pool_timeout_seconds=config.app_db_pool_timeout_seconds,
+        replica_urls=config.app_db_replica_urls,
+        read_your_writes_seconds=config.app_db_read_your_writes_seconds,
+        prepared_statement_cache_size=config.app_db_prepared_statement_cache_size,
+    )
 
-    redis_adapter = providers.Singleton(RedisAsyncioAdapter, config.app_redis_url)
+    redis_adapter = providers.Singleton(
+        RedisAsyncioAdapter, config.app_redis_url, codec=providers.Singleton(get_codec, config.app_cache_codec)
+    )
+    cache_policies = providers.Singleton(CachePolicyRegistry, config.app_cache_policies)
 
     alert_queue_consumer = providers.Factory(RabbitMQConsumer, config.app_queue_url, config.app_alert_queue_name)
     suggestion_queue_consumer = providers.Factory(
@@ -31,7 +49,8 @@ class WorkerContainer(containers.DeclarativeContainer):
     # ** Repositórios
     #
 
-    alert_repository = providers.Singleton(AlertRepository, sql_client=sql_client)
+    alert_repository = providers.Singleton(AlertRepository, sql_client=sql_client, core_reads=config.app_db_core_reads)
+    price_history_repository = providers.Singleton(PriceHistoryRepository, sql_client=sql_client)
 
     # Repositório de alertas
 
@@ -56,4 +75,13 @@ class WorkerContainer(containers.DeclarativeContainer):
         consumer=suggestion_queue_consumer,
         ia_api_url=config.ia_api_url,
         ia_model=config.ia_model,
+        cache_policies=cache_policies,
+    )
+    history_partition_task = providers.Singleton(
+        HistoryPartitionTask,
+        price_history_repository=price_history_repository,
+        months_ahead=config.app_history_partition_months_ahead,
+        retention_months=config.app_history_retention_months,
+        archive=config.app_history_retention_archive,
+        interval_seconds=config.app_history_maintenance_interval_seconds,
     )
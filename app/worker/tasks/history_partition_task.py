@@ -0,0 +1,75 @@
+import asyncio
+from logging import getLogger
+
+from app.repositories.price_history_repository import PriceHistoryRepository
+
+logger = getLogger(__name__)
+
+
+class HistoryPartitionTask:
+    """
+    Manutenção periódica das partições mensais do histórico de preços: cria as dos próximos meses
+    antes que recebam registros e retira (desanexa ou remove) as que passaram da retenção.
+    """
+
+    def __init__(
+        self,
+        price_history_repository: PriceHistoryRepository,
+        months_ahead: int = 3,
+        retention_months: int = 24,
+        archive: bool = True,
+        interval_seconds: int = 21600,
+    ):
+        """
+        :param months_ahead: Meses à frente do atual com partição criada.
+        :param retention_months: Meses completos mantidos antes do atual (0 mantém todos).
+        :param archive: Desanexa as partições expiradas em vez de removê-las.
+        :param interval_seconds: Intervalo entre as execuções.
+        """
+        self.price_history_repository = price_history_repository
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive = archive
+        self.interval_seconds = interval_seconds
+        self._running = False
+        self.lock = asyncio.Lock()
+
+    async def close(self):
+        async with self.lock:
+            self._running = False
+
+    async def set_running(self, r: bool):
+        async with self.lock:
+            self._running = r
+
+    async def run(self):
+        logger.info("Executando tarefa de manutenção das partições do histórico de preços")
+        await self.set_running(True)
+        while self._running:
+            try:
+                await self.process()
+            except Exception:
+                logger.exception("Falha na manutenção das partições do histórico de preços")
+            # Espera em passos de 1s para encerrar logo após o close
+            for _ in range(self.interval_seconds):
+                if not self._running:
+                    break
+                await asyncio.sleep(1)
+
+    async def process(self) -> dict:
+        """
+        Uma execução por vez entre os workers (ver PriceHistoryRepository.maintain_partitions).
+
+        :return: Partições criadas e retiradas nesta execução.
+        """
+        result = await self.price_history_repository.maintain_partitions(
+            self.months_ahead, self.retention_months, self.archive
+        )
+        created, expired = result["created"], result["expired"]
+        logger.info(
+            "Manutenção do histórico de preços: %d partições criadas, %d retiradas",
+            len(created),
+            len(expired),
+            extra={"criadas": created, "retiradas": expired},
+        )
+        return {"created": created, "expired": expired}
@@ -4,6 +4,7 @@ from logging import getLogger
 
 import httpx
 
+from app.integrations.cache.cache_policy import CachePolicyRegistry
 from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.queue.rabbitmq_adapter import QueueMessage, RabbitMQConsumer
 
@@ -12,8 +13,16 @@ logger = getLogger(__name__)
 
 class SuggestPriceTask:
 
-    def __init__(self, redis_adapter: RedisAsyncioAdapter, consumer: RabbitMQConsumer, ia_api_url: str, ia_model: str):
+    def __init__(
+        self,
+        redis_adapter: RedisAsyncioAdapter,
+        consumer: RabbitMQConsumer,
+        ia_api_url: str,
+        ia_model: str,
+        cache_policies: CachePolicyRegistry | None = None,
+    ):
         self.redis_adapter = redis_adapter
+        self.cache_policies = cache_policies if cache_policies is not None else CachePolicyRegistry()
         self.consumer = consumer
         self._running = False
         self.ia_api_url = ia_api_url
@@ -50,7 +59,9 @@ class SuggestPriceTask:
         cache_key = f"suggestion:{sugestao_data['job_id']}"
 
         await self.redis_adapter.set_json(
-            cache_key, {"status": "done", "suggested_price": price_suggestion}, expires_in_seconds=300
+            cache_key,
+            {"status": "done", "suggested_price": price_suggestion},
+            expires_in_seconds=self.cache_policies.expires_in(cache_key),
         )
 
         self.consumer.commit_message(message)
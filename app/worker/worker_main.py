@@ -13,9 +13,11 @@ import time
 
 from dependency_injector.wiring import Provide
 
+from ..integrations.database.sqlalchemy_client import SQLAlchemyClient
 from ..settings.worker import WorkerSettings
 from .container_event_worker import WorkerContainer
 from .tasks.create_alert_task import CreateAlertTask
+from .tasks.history_partition_task import HistoryPartitionTask
 from .tasks.suggest_price_task import SuggestPriceTask
 
 logger = logging.getLogger(__name__)
@@ -40,11 +42,22 @@ class WorkerMain:
     def get_tasks(
         create_alert_task: CreateAlertTask = Provide[WorkerContainer.create_alert_task],
         suggest_price_task: SuggestPriceTask = Provide[WorkerContainer.suggest_price_task],
+        history_partition_task: HistoryPartitionTask = Provide[WorkerContainer.history_partition_task],
     ) -> list:
 
-        tasks = (create_alert_task, suggest_price_task)
+        tasks = [create_alert_task, suggest_price_task, history_partition_task]
         return tasks
 
+    @staticmethod
+    async def prewarm_database(
+        sql_client: SQLAlchemyClient = Provide[WorkerContainer.sql_client],
+        connections: int = Provide[WorkerContainer.config.app_db_pool_prewarm],
+    ):
+        """
+        Abre as conexões com o banco antes de consumir as filas.
+        """
+        await sql_client.prewarm(connections)
+
     def init(self):
         logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s -   %(message)s")
         logging.getLogger("pika").setLevel(logging.WARNING)
@@ -72,6 +85,8 @@ class WorkerMain:
         """
         self.init()
 
+        await self.prewarm_database()
+
         self.tasks = self.get_tasks()
 
         await asyncio.gather(*(task.run() for task in self.tasks))
@@ -0,0 +1,10 @@
+#!/bin/bash
+# Prepara o primário para a replicação: usuário de replicação e permissão de conexão para ele.
+# Executado pela imagem do postgres somente na criação do banco (docker-entrypoint-initdb.d).
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-EOSQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicator';
+EOSQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark dos codecs do cache de preços.
+
+Mede, para cada codec, o custo de gravar (serializar) e ler (desserializar e reconstruir o Price)
+uma entrada no formato antigo (dicionário + model_validate) e no formato compacto (lista), além do
+tamanho gravado no Redis. A linha "construct" reconstrói a forma compacta com model_construct, para
+comparação com a validação usada por unpack_price. Não acessa o Redis: mede somente o trabalho de CPU.
+
+Uso: make codec-bench
+"""
+
+import timeit
+
+from app.common.datetime import utcnow
+from app.integrations.cache.codecs import CODECS
+from app.models import Price
+from app.models.base import UserModel
+from app.services.price_cache_service import _unpack_datetime, pack_price, unpack_price
+
+ITERATIONS = 20_000
+
+PRICE = Price(
+    id=123456,
+    seller_id="luizalabs",
+    sku="sku003",
+    de=15990,
+    por=12990,
+    alerta_pendente=False,
+    created_at=utcnow(),
+    updated_at=utcnow(),
+    created_by=UserModel(name="vendedor1", server="http://localhost:8080/realms/marketplace"),
+    updated_by=UserModel(name="vendedor1", server="http://localhost:8080/realms/marketplace"),
+)
+
+
+def unpack_price_construct(packed: list) -> Price:
+    id_, seller_id, sku, de, por, alerta_pendente, created_at, updated_at, created_by, updated_by = packed
+    return Price.model_construct(
+        id=id_,
+        seller_id=seller_id,
+        sku=sku,
+        de=de,
+        por=por,
+        alerta_pendente=alerta_pendente,
+        created_at=_unpack_datetime(created_at),
+        updated_at=_unpack_datetime(updated_at),
+        created_by=created_by and UserModel.model_construct(name=created_by[0], server=created_by[1]),
+        updated_by=updated_by and UserModel.model_construct(name=updated_by[0], server=updated_by[1]),
+    )
+
+
+def _as_bytes(data: str | bytes) -> bytes:
+    return data.encode() if isinstance(data, str) else data
+
+
+def medir(nome: str, codec, to_cache, from_cache):
+    encoded = _as_bytes(codec.encode(to_cache(PRICE)))
+    assert from_cache(codec.decode(encoded)).por == PRICE.por
+
+    escrita = timeit.timeit(lambda: codec.encode(to_cache(PRICE)), number=ITERATIONS)
+    leitura = timeit.timeit(lambda: from_cache(codec.decode(encoded)), number=ITERATIONS)
+
+    print(
+        f"{codec.name:<8} {nome:<10} {len(encoded):>6} bytes"
+        f"   escrita {escrita / ITERATIONS * 1e6:>7.2f} µs"
+        f"   leitura {leitura / ITERATIONS * 1e6:>7.2f} µs"
+    )
+
+
+def main():
+    print(f"{ITERATIONS} iterações por medida\n")
+    for codec_cls in CODECS.values():
+        codec = codec_cls()
+        medir("dict", codec, lambda price: price.model_dump(mode="json"), Price.model_validate)
+        medir("compacto", codec, pack_price, unpack_price)
+        medir("construct", codec, pack_price, unpack_price_construct)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Verifica se as consultas do histórico de preços usam o índice (seller_id, sku, registered_at DESC, id DESC).
+
+Popula pc_preco_historico em etapas crescentes, atualiza as estatísticas (ANALYZE) e, a cada etapa, obtém o plano
+(EXPLAIN) das consultas montadas pelo PriceHistoryRepository para PriceHistoryService.get_last_n_prices e
+get_by_seller_id_and_sku (primeira página e página seguinte pelo cursor). Falha se alguma delas não usar o índice,
+varrer a tabela inteira (Seq Scan) ou precisar ordenar o resultado (Sort) em vez de ler o índice na ordem.
+
+Tudo roda em uma única transação desfeita no fim: nenhum registro fica no banco.
+Requer as migrações aplicadas (make migration) e APP_DB_URL apontando para o banco.
+
+Uso: make history-index-check
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
+from app.models.price_filter_model import PriceFilter
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.settings import AppSettings
+
+INDEX_NAME = "idx_preco_historico_sellerid_sku_registered_at"
+TABLE_NAME = "pc_preco_historico"
+
+# Total de registros no histórico a cada etapa
+ETAPAS = (10_000, 100_000, 1_000_000)
+SELLERS = 50
+SKUS_POR_SELLER = 2_000
+SELLER_ID = "plan-check-7"
+SKU = "sku-2"
+
+SEED_SQL = text(
+    """
+    INSERT INTO pc_preco_historico (seller_id, sku, de, por, registered_at, created_by, updated_by)
+    SELECT 'plan-check-' || (n % CAST(:sellers AS integer)),
+           'sku-' || ((n / CAST(:sellers AS integer)) % CAST(:skus AS integer)),
+           20000,
+           10000 + (n % 5000),
+           now() - make_interval(secs => n),
+           '{"name": "plan-check", "server": "local"}'::json,
+           '{"name": "plan-check", "server": "local"}'::json
+    FROM generate_series(CAST(:inicio AS integer), CAST(:fim AS integer) - 1) AS n
+    """
+)
+
+
+def consultas(repository: PriceHistoryRepository) -> dict:
+    filters = PriceFilter(seller_id=SELLER_ID, sku=SKU)
+    sort = {"registered_at": -1}
+    return {
+        "get_last_n_prices": repository._find_statement(filters, limit=5, sort=sort),
+        "historico (1ª página)": repository._find_statement(filters, limit=50, sort=sort),
+        "historico (cursor)": repository._find_statement(
+            filters, limit=50, sort=sort, after={"registered_at": "2025-01-01T00:00:00+00:00", "id": 500}
+        ),
+    }
+
+
+def nos_do_plano(plano: dict):
+    yield plano
+    for filho in plano.get("Plans", []):
+        yield from nos_do_plano(filho)
+
+
+def avaliar(plano: dict) -> list[str]:
+    """
+    :return: Problemas encontrados no plano (vazio se a consulta usa o índice na ordem dele).
+    """
+    nos = list(nos_do_plano(plano))
+    problemas = []
+    if not any(no.get("Index Name") == INDEX_NAME for no in nos):
+        problemas.append(f"não usa {INDEX_NAME}")
+    if any(no["Node Type"] == "Seq Scan" and no.get("Relation Name") == TABLE_NAME for no in nos):
+        problemas.append("Seq Scan em pc_preco_historico")
+    if any(no["Node Type"] in ("Sort", "Incremental Sort") for no in nos):
+        problemas.append("ordena o resultado (Sort)")
+    return problemas
+
+
+async def explain(conn, stmt) -> dict:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plano = result.scalar_one()
+    return (json.loads(plano) if isinstance(plano, str) else plano)[0]["Plan"]
+
+
+async def verificar() -> bool:
+    app_settings = AppSettings()
+    sql_client = SQLAlchemyClient(app_settings.app_db_url, pool_size=1)
+    repository = PriceHistoryRepository(sql_client)
+    ok = True
+
+    try:
+        async with sql_client.engine.connect() as conn:
+            transacao = await conn.begin()
+            try:
+                total = 0
+                for etapa in ETAPAS:
+                    inicio = time.perf_counter()
+                    await conn.execute(
+                        SEED_SQL, {"sellers": SELLERS, "skus": SKUS_POR_SELLER, "inicio": total, "fim": etapa}
+                    )
+                    await conn.execute(text(f"ANALYZE {TABLE_NAME}"))
+                    total = etapa
+                    print(f"\n{'=' * 40}\n{total:,} registros (carga em {time.perf_counter() - inicio:.1f}s)")
+
+                    for nome, stmt in consultas(repository).items():
+                        plano = await explain(conn, stmt)
+                        problemas = avaliar(plano)
+                        ok = ok and not problemas
+                        situacao = "OK" if not problemas else "FALHA: " + "; ".join(problemas)
+                        print(f"{nome:<24} custo {plano['Total Cost']:>10.2f}  {situacao}")
+            finally:
+                await transacao.rollback()
+    finally:
+        await sql_client.engine.dispose()
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(verificar()) else 1)
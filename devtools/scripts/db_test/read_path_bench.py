@@ -0,0 +1,80 @@
+"""
+Benchmark das leituras do repositório de preços: ORM x Core (core_reads).
+
+Grava preços de um seller próprio do benchmark e mede, para cada tamanho de página, o custo por linha de
+PriceRepository.find nos dois modos: pelo ORM (entidades, identity map, to_dict e model_validate) e pelo
+Core (somente as colunas, linhas mapeadas direto para o Price). Mede também find_by_seller_id_and_sku.
+Os preços gravados são removidos no fim.
+
+Requer as migrações aplicadas (make migration) e APP_DB_URL apontando para o banco.
+
+Uso: make read-path-bench
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
+from app.models import Price, PriceFilter
+from app.models.base import UserModel
+from app.repositories import PriceRepository
+from app.settings import AppSettings
+
+SELLER_ID = "read-bench"
+TOTAL = 1_000
+PAGINAS = (1, 20, 100, 1_000)
+REPETICOES = 50
+USUARIO = UserModel(name="read-bench", server="local")
+
+
+async def medir(acao, repeticoes: int = REPETICOES) -> float:
+    await acao()  # aquecimento (conexão, cache de compilação das consultas)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        await acao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+async def main():
+    app_settings = AppSettings()
+    sql_client = SQLAlchemyClient(app_settings.app_db_url, pool_size=1)
+    repositorios = {
+        "ORM": PriceRepository(sql_client),
+        "Core": PriceRepository(sql_client, core_reads=True),
+    }
+    delete = text("DELETE FROM pc_preco WHERE seller_id = :seller_id")
+
+    try:
+        async with sql_client.engine.begin() as conn:
+            await conn.execute(delete, {"seller_id": SELLER_ID})
+        await repositorios["ORM"].insert_many(
+            [
+                Price(seller_id=SELLER_ID, sku=f"sku{i:05d}", de=20000, por=10000 + i, created_by=USUARIO)
+                for i in range(TOTAL)
+            ]
+        )
+
+        filters = PriceFilter(seller_id=SELLER_ID)
+        print(f"\n{'=' * 40}\n{'consulta':<28}{'ORM (µs/linha)':>16}{'Core (µs/linha)':>18}")
+        for limite in PAGINAS:
+            custos = [
+                await medir(lambda repository=repository: repository.find(filters, limit=limite)) / limite * 1e6
+                for repository in repositorios.values()
+            ]
+            print(f"{f'find (limit={limite})':<28}{custos[0]:>16.1f}{custos[1]:>18.1f}")
+
+        custos = [
+            await medir(lambda repository=repository: repository.find_by_seller_id_and_sku(SELLER_ID, "sku00042")) * 1e6
+            for repository in repositorios.values()
+        ]
+        print(f"{'find_by_seller_id_and_sku':<28}{custos[0]:>16.1f}{custos[1]:>18.1f}")
+    finally:
+        async with sql_client.engine.begin() as conn:
+            await conn.execute(delete, {"seller_id": SELLER_ID})
+        await sql_client.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -57,9 +57,17 @@ class PriceHistoryRepositoryMockFactory:
                 all_histories.extend(histories)
             return all_histories
 
+        async def mock_stream(filters, sort=None, batch_size=1000):
+            # Percorre o histórico do seller dos filtros (e dos skus, se informados), por sku e mais recente primeiro
+            for key in sorted(key for key in simulated_db if key[0] == filters.seller_id):
+                if filters.sku__in is None or key[1] in filters.sku__in:
+                    for history in sorted(simulated_db[key], key=lambda history: history.registered_at, reverse=True):
+                        yield history
+
         repository.create = AsyncMock(side_effect=mock_create)
         repository.find_by_seller_id_and_sku = AsyncMock(side_effect=mock_find_by_seller_id_and_sku)
         repository.find = AsyncMock(side_effect=mock_find)
+        repository.stream = Mock(side_effect=mock_stream)
         repository._simulated_db = simulated_db
 
         return repository
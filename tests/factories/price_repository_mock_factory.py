@@ -60,9 +60,30 @@ class PriceRepositoryMockFactory:
             simulated_db[(price.seller_id, price.sku)] = price
             return price
 
+        async def mock_insert_if_absent(price: Price):
+            if (price.seller_id, price.sku) in simulated_db:
+                return None
+            return await mock_create(price)
+
+        async def mock_upsert(price: Price):
+            existing = simulated_db.get((price.seller_id, price.sku))
+            if existing is not None:
+                price.created_at = existing.created_at
+                price.updated_at = datetime.now(timezone.utc)
+            else:
+                price.created_at = datetime.now(timezone.utc)
+            simulated_db[(price.seller_id, price.sku)] = price
+            return price
+
+        async def mock_upsert_many(prices: list[Price]):
+            return [await mock_upsert(price) for price in prices]
+
         async def mock_find_by_seller_id_and_sku(seller_id: str, sku: str):
             return simulated_db.get((seller_id, sku))
 
+        async def mock_find_by_seller_id_and_skus(seller_id: str, skus: list[str]):
+            return [simulated_db[(seller_id, sku)] for sku in skus if (seller_id, sku) in simulated_db]
+
         async def mock_update_by_seller_id_and_sku(seller_id: str, sku: str, price_update: Price):
             if (seller_id, sku) in simulated_db:
                 updated_price = price_update
@@ -82,12 +103,22 @@ class PriceRepositoryMockFactory:
             # Retorna todos os preços simulados como lista
             return list(simulated_db.values())
 
+        async def mock_stream(filters, sort=None, batch_size=1000):
+            # Percorre os preços do seller dos filtros, ordenados por sku
+            for key in sorted(key for key in simulated_db if key[0] == filters.seller_id):
+                yield simulated_db[key]
+
         # Aplicar os mocks
         repository.create = AsyncMock(side_effect=mock_create)
+        repository.insert_if_absent = AsyncMock(side_effect=mock_insert_if_absent)
+        repository.upsert = AsyncMock(side_effect=mock_upsert)
+        repository.upsert_many = AsyncMock(side_effect=mock_upsert_many)
         repository.find_by_seller_id_and_sku = AsyncMock(side_effect=mock_find_by_seller_id_and_sku)
+        repository.find_by_seller_id_and_skus = AsyncMock(side_effect=mock_find_by_seller_id_and_skus)
         repository.update_by_seller_id_and_sku = AsyncMock(side_effect=mock_update_by_seller_id_and_sku)
         repository.delete_by_seller_id_and_sku = AsyncMock(side_effect=mock_delete_by_seller_id_and_sku)
         repository.find = AsyncMock(side_effect=mock_find)
+        repository.stream = Mock(side_effect=mock_stream)
 
         # Expor o banco simulado para inspeção/manipulação nos testes se necessário
         repository._simulated_db = simulated_db
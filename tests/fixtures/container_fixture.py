@@ -36,12 +36,14 @@ def container(mock_price_repository: PriceRepository) -> Generator[Container, No
 @fixture
 def app(container: Container) -> Generator[FastAPI, None, None]:
     import app.api.common.routers.health_check_routers as health_check_routers
+    import app.api.v2.routers.price_export_router as price_export_router
     import app.api.v2.routers.price_router as price_router_v2
 
     container.wire(
         modules=[
             health_check_routers,
             price_router_v2,
+            price_export_router,
         ]
     )
 
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.common import export
+from app.api.common.export import csv_stream, export_columns, ndjson_stream, parquet_stream
+from app.api.v2.schemas.price_history_schema import PriceHistoryResponse
+from app.api.v2.schemas.price_schema import PriceResponse
+from app.common.exceptions.export_exceptions import ExportFormatUnavailableException
+from app.models import Price
+from app.models.price_history_model import PriceHistory
+
+REGISTERED_AT = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+
+
+class ClosableItems:
+    """Iterador assíncrono de preços (ou do histórico) que registra o fechamento (aclose)."""
+
+    def __init__(self, count: int, history: bool = False):
+        self.prices = iter(
+            [
+                (
+                    PriceHistory(
+                        id=index,
+                        seller_id="1",
+                        sku=f"sku{index}",
+                        de=200,
+                        por=150,
+                        registered_at=REGISTERED_AT,
+                        created_by={"name": "bi", "server": "s"},
+                    )
+                    if history
+                    else Price(id=index, seller_id="1", sku=f"sku{index}", de=200, por=150)
+                )
+                for index in range(count)
+            ]
+        )
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.prices)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_encodes_one_object_per_line_in_chunks():
+    items = ClosableItems(5)
+
+    chunks = [chunk async for chunk in ndjson_stream(items, PriceResponse, chunk_bytes=200)]
+
+    assert len(chunks) > 1
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["sku"] for line in lines] == [f"sku{index}" for index in range(5)]
+    assert set(json.loads(lines[0])) == set(PriceResponse.model_fields)
+    assert items.closed
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_closes_items_when_interrupted():
+    # Ex.: o cliente desconectou no meio do download
+    items = ClosableItems(100)
+    stream = ndjson_stream(items, PriceResponse, chunk_bytes=1)
+
+    await anext(stream)
+    await stream.aclose()
+
+    assert items.closed
+
+
+def test_export_columns_flattens_nested_models():
+    columns = [name for name, _, _ in export_columns(PriceHistoryResponse)]
+
+    assert {"id", "sku", "seller_id", "de", "por", "registered_at"} <= set(columns)
+    assert "created_by.name" in columns and "updated_by.server" in columns
+    assert "created_by" not in columns
+
+
+@pytest.mark.asyncio
+async def test_csv_stream_writes_header_and_rows_in_chunks():
+    items = ClosableItems(5, history=True)
+
+    chunks = [chunk async for chunk in csv_stream(items, PriceHistoryResponse, chunk_bytes=100)]
+
+    assert len(chunks) > 1
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [row["sku"] for row in rows] == [f"sku{index}" for index in range(5)]
+    assert rows[0]["registered_at"] == "2025-03-01T12:00:00+00:00"
+    assert rows[0]["created_by.name"] == "bi"
+    assert rows[0]["updated_by.name"] == ""
+    assert items.closed
+
+
+@pytest.mark.asyncio
+async def test_parquet_stream_writes_one_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+    items = ClosableItems(5, history=True)
+
+    chunks = [chunk async for chunk in parquet_stream(items, PriceHistoryResponse, row_group_rows=2)]
+
+    # Um bloco por row group completo e o último com o restante e o rodapé
+    assert len(chunks) == 3
+    parquet_file = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.column("sku").to_pylist() == [f"sku{index}" for index in range(5)]
+    assert table.column("registered_at").to_pylist()[0] == REGISTERED_AT
+    assert table.column("created_by.name").to_pylist()[0] == "bi"
+    assert str(table.schema.field("de").type) == "int64"
+    assert items.closed
+
+
+def test_parquet_stream_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(export, "pa", None)
+
+    with pytest.raises(ExportFormatUnavailableException):
+        parquet_stream(ClosableItems(1, history=True), PriceHistoryResponse)
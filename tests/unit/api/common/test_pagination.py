@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.common.schemas import Paginator
+from app.api.common.schemas.pagination import decode_cursor, encode_cursor
+from app.common.exceptions import BadRequestException
+from app.models import Price
+
+
+def make_prices(count: int) -> list[Price]:
+    return [Price(id=index, seller_id="1", sku=f"sku{index}", de=100 + index, por=90 + index) for index in range(count)]
+
+
+def test_cursor_roundtrip():
+    registered_at = datetime(2025, 7, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor({"registered_at": registered_at, "id": 7}, "registered_at:desc")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "registered_at:desc") == {"registered_at": "2025-07-01T12:30:00Z", "id": 7}
+
+
+@pytest.mark.parametrize("cursor", ["nao-e-um-cursor", encode_cursor({"por": 10}, None)])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(BadRequestException) as excinfo:
+        decode_cursor(cursor, None)
+    assert excinfo.value.details[0].field == "_cursor"
+
+
+def test_decode_cursor_from_other_sort():
+    # Um cursor só vale para a ordenação em que foi gerado
+    cursor = encode_cursor({"por": 10, "id": 1}, "por:asc")
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor, "por:desc")
+
+
+def test_next_cursor_only_with_lookahead_row():
+    paginator = Paginator(request_path="/precos", limit=3, sort="por:desc,inexistente:asc")
+
+    # Uma página cheia sem o registro a mais (fetch_limit) é a última
+    assert paginator.fetch_limit == 4
+    assert paginator.next_cursor(make_prices(3)) is None
+    # O cursor parte do último registro entregue, não do registro a mais
+    cursor = paginator.next_cursor(make_prices(4))
+    assert decode_cursor(cursor, paginator.sort) == {"por": 92, "id": 2}
+
+
+def test_paginate_emits_next_cursor_link_with_request_filters():
+    paginator = Paginator(request_path="/precos", limit=2, query_filters={"sku": "A", "_cursor": "x"})
+
+    response = paginator.paginate(results=make_prices(3))
+    links = response.meta.links
+
+    assert [price.id for price in response.results] == [0, 1]
+    assert response.meta.page.count == 2
+    cursor = paginator.next_cursor(make_prices(3))
+    assert links.next == f"/precos?_cursor={cursor}&_limit=2&sku=A"
+    assert links.current == "/precos?_offset=0&_limit=2&sku=A"
+
+
+def test_paginate_from_cursor():
+    cursor = encode_cursor({"id": 1}, None)
+    paginator = Paginator(request_path="/precos", limit=2, offset=40, cursor=cursor)
+
+    links = paginator.paginate(results=make_prices(1)).meta.links
+
+    assert paginator.get_cursor_keys() == {"id": 1}
+    assert links.current == f"/precos?_cursor={cursor}&_limit=2"
+    assert links.previous == "/precos?_offset=0&_limit=2"
+    assert links.next is None
+
+
+def test_paginate_with_offset_next_link_and_total():
+    # Sem id nos registros não há cursor: o link next usa o offset
+    paginator = Paginator(
+        request_path="/precos", limit=2, offset=4, count="exact", query_filters={"sku": "A", "_count": "exact"}
+    )
+    paginator.total = 7
+    results = [Price(seller_id="1", sku=f"sku{index}", de=100, por=90) for index in range(3)]
+
+    page = paginator.paginate(results=results).meta
+
+    assert page.links.next == "/precos?_offset=6&_limit=2&sku=A"
+    assert page.page.count == 2
+    assert (page.page.total, page.page.total_mode) == (7, "exact")
+
+
+def test_paginate_without_count_has_no_total():
+    page = Paginator(request_path="/precos", limit=2).paginate(results=make_prices(1)).meta.page
+
+    assert (page.count, page.total, page.total_mode) == (1, None, None)
@@ -1,8 +1,15 @@
+import csv
+import io
+import json
 from unittest.mock import AsyncMock
 
 import pytest
 import pytest_asyncio
+from dependency_injector import providers
 from httpx import AsyncClient
+from starlette.routing import Match
+
+from app.models import Price
 
 
 @pytest.fixture(autouse=True)
@@ -19,10 +26,45 @@ def mock_job_status(mocker):
 @pytest.mark.usefixtures("mock_do_auth", "async_client")
 class TestPriceRouterV2:
     @pytest.mark.asyncio
-    async def test_listar_precos(self, async_client: AsyncClient):
+    async def test_listar_precos(self, async_client: AsyncClient, mocker):
+        mocker.patch("app.services.price_cache_service.PriceCacheService.get_generation", return_value=0)
+        mocker.patch("app.services.price_cache_service.PriceCacheService.get_listing", return_value=None)
+        set_listing = mocker.patch("app.services.price_cache_service.PriceCacheService.set_listing")
         resposta = await async_client.get("/api/v2/precos", headers={"x-seller-id": "1"})
         assert resposta.status_code == 200
         assert "results" in resposta.json()
+        # A listagem é consultada com o seller do cabeçalho e armazenada sob a geração lida antes da consulta
+        assert set_listing.call_args.args[:2] == ("1", 0)
+
+    @pytest.mark.asyncio
+    async def test_exportar_precos(self, async_client: AsyncClient, price_repository):
+        price_repository._simulated_db[("1", "0")] = Price(seller_id="1", sku="0", de=300, por=250)
+
+        resposta = await async_client.get("/api/v2/precos-export", headers={"x-seller-id": "1"})
+
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"] == "application/x-ndjson"
+        linhas = [json.loads(linha) for linha in resposta.text.splitlines()]
+        # Somente os preços do seller, um por linha, ordenados por sku
+        assert [(linha["seller_id"], linha["sku"], linha["por"]) for linha in linhas] == [
+            ("1", "0", 250),
+            ("1", "A", 90),
+        ]
+
+    @pytest.mark.parametrize(
+        "path, rota_esperada",
+        [
+            ("/api/v2/precos/export", "/api/v2/precos/{sku}"),
+            ("/api/v2/precos/historico/export", "/api/v2/precos/historico/{sku}"),
+            ("/api/v2/precos-export", "/api/v2/precos-export"),
+            ("/api/v2/precos-export/historico", "/api/v2/precos-export/historico"),
+        ],
+    )
+    def test_exportacoes_nao_colidem_com_sku(self, app, path, rota_esperada):
+        # Um sku chamado "export" é atendido pelas rotas do produto, e não pelas exportações
+        scope = {"type": "http", "method": "GET", "path": path}
+        rota = next(route for route in app.routes if route.matches(scope)[0] == Match.FULL)
+        assert rota.path == rota_esperada
 
     @pytest.mark.asyncio
     async def test_buscar_preco_por_sku(self, async_client: AsyncClient, test_prices):
@@ -32,6 +74,49 @@ class TestPriceRouterV2:
         assert resposta.json()["seller_id"] == preco.seller_id
         assert resposta.json()["sku"] == preco.sku
 
+    @pytest.mark.asyncio
+    async def test_buscar_precos_em_lote(self, async_client: AsyncClient, test_prices, mocker):
+        mocker.patch(
+            "app.integrations.cache.redis_asyncio_adapter.RedisAsyncioAdapter.mget_json",
+            side_effect=lambda keys: [None for _ in keys],
+        )
+        set_many = mocker.patch("app.services.price_cache_service.PriceCacheService.set_many")
+        preco = test_prices[0]
+        resposta = await async_client.post(
+            "/api/v2/precos/batch-get", json={"skus": [preco.sku, "inexistente"]}, headers={"x-seller-id": "1"}
+        )
+        assert resposta.status_code == 200
+        resultados = resposta.json()["results"]
+        assert [r["sku"] for r in resultados] == [preco.sku, "inexistente"]
+        assert resultados[0]["found"] is True
+        assert resultados[0]["price"]["por"] == preco.por
+        assert resultados[1] == {"sku": "inexistente", "found": False, "price": None}
+        # O preço encontrado é armazenado no cache e o inexistente recebe uma lápide
+        set_many.assert_awaited_once()
+        assert set_many.await_args.kwargs["tombstone_keys"] == ["price:1:inexistente"]
+
+    @pytest.mark.asyncio
+    async def test_gravar_precos_em_lote_rejeitados(self, async_client: AsyncClient):
+        resposta = await async_client.post(
+            "/api/v2/precos/batch-upsert",
+            json={"items": [{"sku": "A", "de": 100, "por": 0}, {"sku": "B", "de": -1, "por": 10}]},
+            headers={"x-seller-id": "1"},
+        )
+        assert resposta.status_code == 200
+        resultados = resposta.json()["results"]
+        assert [(r["sku"], r["status"], r["price"]) for r in resultados] == [
+            ("A", "rejected", None),
+            ("B", "rejected", None),
+        ]
+        assert resultados[0]["errors"][0]["field"] == "por"
+
+    @pytest.mark.asyncio
+    async def test_gravar_precos_em_lote_vazio(self, async_client: AsyncClient):
+        resposta = await async_client.post(
+            "/api/v2/precos/batch-upsert", json={"items": []}, headers={"x-seller-id": "1"}
+        )
+        assert resposta.status_code == 422
+
     @pytest.mark.asyncio
     async def test_criar_preco(self, async_client: AsyncClient):
         novo_preco = {"sku": "C", "de": 300, "por": 250}
@@ -79,6 +164,30 @@ class TestPriceRouterV2:
         assert isinstance(resposta.json(), list)
         assert len(resposta.json()) > 0  # or whatever you expect
 
+    @pytest.mark.asyncio
+    async def test_exportar_historico_csv(self, async_client: AsyncClient, container, mock_price_history_repository):
+        container.price_history_repository.override(providers.Object(mock_price_history_repository))
+
+        resposta = await async_client.get(
+            "/api/v2/precos-export/historico", params={"sku": ["A", "Z"]}, headers={"x-seller-id": "1"}
+        )
+
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"].startswith("text/csv")
+        assert resposta.headers["content-disposition"] == 'attachment; filename="historico_precos.csv"'
+        linhas = list(csv.DictReader(io.StringIO(resposta.text)))
+        assert [(linha["seller_id"], linha["sku"], linha["por"]) for linha in linhas] == [("1", "A", "90")]
+
+    @pytest.mark.asyncio
+    async def test_exportar_historico_periodo_invalido(self, async_client: AsyncClient):
+        resposta = await async_client.get(
+            "/api/v2/precos-export/historico",
+            params={"inicio": "2025-02-01T00:00:00Z", "fim": "2025-01-01T00:00:00Z"},
+            headers={"x-seller-id": "1"},
+        )
+
+        assert resposta.status_code == 400
+
     @pytest.mark.asyncio
     async def test_sugerir_preco(self, async_client: AsyncClient, test_prices):
         preco = test_prices[0]
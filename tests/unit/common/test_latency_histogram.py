@@ -0,0 +1,14 @@
+from app.common.latency_histogram import LatencyHistogram
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram(buckets_ms=(1, 10))
+
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        histogram.observe(seconds)
+
+    assert histogram.snapshot() == {
+        "count": 4,
+        "sum_ms": 506.5,
+        "buckets": {"le_1ms": 2, "le_10ms": 3, "le_inf": 4},
+    }
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.common.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    waiters = [asyncio.create_task(single_flight.do("key", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert len(single_flight) == 1
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["value"] * 10
+    assert calls == 1
+    await asyncio.sleep(0)
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_key_released():
+    single_flight = SingleFlight()
+
+    async def fail():
+        raise ValueError("erro")
+
+    results = await asyncio.gather(single_flight.do("key", fail), single_flight.do("key", fail), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    await asyncio.sleep(0)
+
+    async def ok():
+        return 1
+
+    assert await single_flight.do("key", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(single_flight.do("key", load))
+    second = asyncio.create_task(single_flight.do("key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "value"
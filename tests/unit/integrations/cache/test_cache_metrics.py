@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+from app.integrations.cache.cache_metrics import CacheMetrics
+
+
+def test_counters_by_family():
+    metrics = CacheMetrics()
+
+    metrics.incr("price", "hits")
+    metrics.incr("price", "hits")
+    metrics.incr("price-list", "misses", 3)
+
+    assert metrics.count("price", "hits") == 2
+    assert metrics.count("price", "misses") == 0
+    assert metrics.count("suggestion", "hits") == 0
+    snapshot = metrics.snapshot()
+    assert snapshot["price"] == {"counters": {"hits": 2}, "latency": {}}
+    assert snapshot["price-list"]["counters"] == {"misses": 3}
+    assert "suggestion" not in snapshot
+
+
+def test_timer_observes_even_on_error():
+    metrics = CacheMetrics()
+
+    with patch("app.integrations.cache.cache_metrics.time.perf_counter", side_effect=[1.0, 1.02]):
+        try:
+            with metrics.timer("price", "load"):
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+    latency = metrics.snapshot()["price"]["latency"]["load"]
+    assert latency["count"] == 1
+    assert latency["buckets"]["le_25ms"] == 1
+    assert latency["buckets"]["le_10ms"] == 0
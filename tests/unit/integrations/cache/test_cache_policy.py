@@ -0,0 +1,40 @@
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from app.integrations.cache.cache_policy import DEFAULT_CACHE_POLICIES, CachePolicy, CachePolicyRegistry
+
+
+def test_expires_in_adds_jitter():
+    policy = CachePolicy(ttl_seconds=300, jitter_seconds=60)
+
+    with patch("app.integrations.cache.cache_policy.random.randint", return_value=17) as randint:
+        assert policy.expires_in() == 317
+
+    randint.assert_called_once_with(0, 60)
+    assert CachePolicy(ttl_seconds=300).expires_in() == 300
+
+
+def test_should_refresh():
+    policy = CachePolicy(ttl_seconds=300, refresh_ahead_seconds=30)
+
+    assert policy.should_refresh(10)
+    assert not policy.should_refresh(30)
+    assert not policy.should_refresh(None)
+    assert not CachePolicy(ttl_seconds=300).should_refresh(1)
+
+
+def test_negative_values_are_rejected():
+    with pytest.raises(ValidationError):
+        CachePolicy(ttl_seconds=-1)
+
+
+def test_registry_resolves_policy_by_key_family():
+    registry = CachePolicyRegistry({"price": {"ttl_seconds": 600}}, default=CachePolicy(ttl_seconds=10))
+
+    assert registry.for_key("price:1:A").ttl_seconds == 600
+    assert registry.for_key("price-list:1:0:abc") == DEFAULT_CACHE_POLICIES["price-list"]
+    assert registry.for_key("suggestion:job") == DEFAULT_CACHE_POLICIES["suggestion"]
+    assert registry.for_key("outra:chave").ttl_seconds == 10
+    assert registry.expires_in("outra:chave") == 10
@@ -0,0 +1,41 @@
+import pytest
+
+from app.integrations.cache.codecs import CODECS, JsonCodec, MsgpackCodec, OrjsonCodec, get_codec
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_round_trip(name):
+    codec = get_codec(name)
+    value = {"a": 1, "b": [1, "x", None, True], "c": {"d": 1.5}}
+
+    encoded = codec.encode(value)
+
+    assert codec.decode(encoded) == value
+    # O Redis devolve bytes
+    assert codec.decode(encoded.encode() if isinstance(encoded, str) else encoded) == value
+
+
+def test_get_codec():
+    assert isinstance(get_codec("json"), JsonCodec)
+    assert isinstance(get_codec("orjson"), OrjsonCodec)
+    assert isinstance(get_codec("msgpack"), MsgpackCodec)
+
+
+def test_get_codec_unknown():
+    with pytest.raises(ValueError):
+        get_codec("pickle")
+
+
+def test_json_codec_keeps_previous_format():
+    assert JsonCodec().encode({"a": 1}) == '{"a": 1}'
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_decode_value_from_other_codec_raises_value_error(name):
+    other = "msgpack" if name != "msgpack" else "json"
+    encoded = get_codec(other).encode({"a": 1})
+    if isinstance(encoded, str):
+        encoded = encoded.encode()
+
+    with pytest.raises(ValueError):
+        get_codec(name).decode(encoded)
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from app.integrations.cache.local_cache_adapter import LocalCacheAdapter
+
+
+def test_get_and_set():
+    cache = LocalCacheAdapter(max_size=10, ttl_seconds=60)
+    assert cache.get("key") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+
+
+def test_evicts_least_recently_used():
+    cache = LocalCacheAdapter(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_expired_entry_is_a_miss():
+    cache = LocalCacheAdapter(max_size=10, ttl_seconds=5)
+    with patch("app.integrations.cache.local_cache_adapter.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+    with patch("app.integrations.cache.local_cache_adapter.time.monotonic", return_value=106.0):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_delete_and_clear():
+    cache = LocalCacheAdapter()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("not-found")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_zero_size_disables_cache():
+    cache = LocalCacheAdapter(max_size=0)
+    cache.set("key", "value")
+    assert cache.get("key") is None
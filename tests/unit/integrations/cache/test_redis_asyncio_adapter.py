@@ -1,7 +1,8 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.integrations.cache.codecs import MsgpackCodec
 from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
 
 
@@ -23,6 +24,17 @@ def adapter(redis_url, redis_mock):
     return RedisAsyncioAdapter(redis_url)
 
 
+@pytest.fixture
+def redis_pipe(redis_mock):
+    """Pipeline do redis-py: comandos síncronos (enfileirados) e execute assíncrono."""
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(return_value=[])
+    pipe.scripts = set()
+    redis_mock.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
 @pytest.mark.asyncio
 async def test_exists(adapter, redis_mock):
     redis_mock.exists.return_value = 1
@@ -65,7 +77,206 @@ async def test_set_json(adapter, redis_mock):
     redis_mock.delete.assert_awaited_with("key")
 
 
+@pytest.mark.asyncio
+async def test_json_methods_use_configured_codec(redis_url, redis_mock):
+    codec = MsgpackCodec()
+    adapter = RedisAsyncioAdapter(redis_url, codec=codec)
+
+    await adapter.set_json("key", {"a": 1}, 5)
+    redis_mock.set.assert_awaited_with("key", codec.encode({"a": 1}), 5)
+
+    redis_mock.get.return_value = codec.encode({"a": 1})
+    assert await adapter.get_json("key") == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_json_unreadable_value_is_a_miss(redis_url, redis_mock):
+    adapter = RedisAsyncioAdapter(redis_url, codec=MsgpackCodec())
+
+    redis_mock.get.return_value = b'{"a": 1}'
+    assert await adapter.get_json("key") is None
+
+    redis_mock.mget.return_value = [b'{"a": 1}', MsgpackCodec().encode([1])]
+    assert await adapter.mget_json(["k1", "k2"]) == [None, [1]]
+
+
 @pytest.mark.asyncio
 async def test_aclose(adapter, redis_mock):
     await adapter.aclose()
     redis_mock.aclose.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish(adapter, redis_mock):
+    redis_mock.publish.return_value = 2
+    assert await adapter.publish("channel", "message") == 2
+    redis_mock.publish.assert_awaited_with("channel", "message")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_forwards_messages(adapter, redis_mock):
+    async def listen():
+        yield {"type": "subscribe", "data": 1}
+        yield {"type": "message", "data": b"price:1:A"}
+
+    pubsub = AsyncMock()
+    pubsub.listen = listen
+    redis_mock.pubsub = lambda: pubsub
+    received = []
+
+    await adapter.subscribe("channel", received.append)
+
+    pubsub.subscribe.assert_awaited_with("channel")
+    pubsub.aclose.assert_awaited()
+    assert received == ["price:1:A"]
+
+
+@pytest.mark.asyncio
+async def test_mget_json(adapter, redis_mock):
+    redis_mock.mget.return_value = [b'{"a": 1}', None]
+    assert await adapter.mget_json(["k1", "k2"]) == [{"a": 1}, None]
+    redis_mock.mget.assert_awaited_with(["k1", "k2"])
+    assert await adapter.mget_json([]) == []
+
+
+@pytest.mark.asyncio
+async def test_mset_json_uses_pipeline(adapter, redis_mock, redis_pipe):
+    redis_pipe.execute.return_value = [True, True]
+
+    assert await adapter.mset_json({"k1": {"a": 1}, "k2": [1]}, 30) == [True, True]
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    redis_pipe.set.assert_any_call("k1", '{"a": 1}', 30, nx=False)
+    redis_pipe.set.assert_any_call("k2", "[1]", 30, nx=False)
+    redis_pipe.execute.assert_awaited_once()
+
+    redis_mock.pipeline.reset_mock()
+    assert await adapter.mset_json({}) == []
+    redis_mock.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_mset_json_only_if_absent(adapter, redis_pipe):
+    redis_pipe.execute.return_value = [True, None]
+
+    assert await adapter.mset_json({"k1": 1, "k2": 2}, 10, nx=True) == [True, False]
+    redis_pipe.set.assert_any_call("k2", "2", 10, nx=True)
+
+
+@pytest.mark.asyncio
+async def test_mset_json_per_key_ttl(adapter, redis_pipe):
+    redis_pipe.execute.return_value = [True, True]
+
+    await adapter.mset_json({"k1": 1, "k2": 2}, {"k1": 10})
+
+    redis_pipe.set.assert_any_call("k1", "1", 10, nx=False)
+    redis_pipe.set.assert_any_call("k2", "2", None, nx=False)
+
+
+@pytest.mark.asyncio
+async def test_delete_many(adapter, redis_mock):
+    redis_mock.delete.return_value = 2
+    assert await adapter.delete_many(["k1", "k2", "k3"]) == 2
+    redis_mock.delete.assert_awaited_once_with("k1", "k2", "k3")
+
+    assert await adapter.delete_many([]) == 0
+    redis_mock.delete.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_commands_in_one_round_trip(adapter, redis_mock, redis_pipe):
+    script = MagicMock(sha="sha1")
+    redis_mock.register_script = MagicMock(return_value=script)
+    redis_pipe.execute.return_value = [b'{"a": 1}', 1, 2, 0, 5, 3]
+
+    async with adapter.pipeline() as pipe:
+        pipe.get_json("k1")
+        pipe.set_json_if_newer("k1", {"a": 2}, 7, 30)
+        pipe.delete_many(["k2", "k3"])
+        pipe.delete_many([])
+        pipe.delete_if_newer("k4", 8)
+        pipe.incr("gen")
+        pipe.publish("canal", "k1")
+        redis_pipe.execute.assert_not_awaited()
+
+    redis_pipe.execute.assert_awaited_once()
+    assert pipe.results == [{"a": 1}, True, 2, 0, False, 5, 3]
+    redis_pipe.evalsha.assert_any_call("sha1", 2, "k1", "version:k1", '{"a": 2}', 7, 30)
+    redis_pipe.evalsha.assert_any_call("sha1", 2, "k4", "version:k4", 8, 0)
+    redis_pipe.delete.assert_called_once_with("k2", "k3")
+    redis_pipe.incr.assert_called_once_with("gen")
+    redis_pipe.publish.assert_called_once_with("canal", "k1")
+    assert script in redis_pipe.scripts
+
+
+@pytest.mark.asyncio
+async def test_pipeline_set_json_if_newer_or_absent(adapter, redis_mock, redis_pipe):
+    redis_mock.register_script = MagicMock(return_value=MagicMock(sha="sha1"))
+    redis_pipe.execute.return_value = [1]
+
+    async with adapter.pipeline() as pipe:
+        pipe.set_json_if_newer_or_absent("k1", {"a": 2}, 7, {"tombstone": True}, 30)
+
+    assert pipe.results == [True]
+    redis_pipe.evalsha.assert_called_once_with("sha1", 2, "k1", "version:k1", '{"a": 2}', 7, 30, '{"tombstone": true}')
+
+
+@pytest.mark.asyncio
+async def test_pipeline_discards_commands_on_error(adapter, redis_pipe):
+    with pytest.raises(RuntimeError):
+        async with adapter.pipeline() as pipe:
+            pipe.publish("canal", "k1")
+            raise RuntimeError()
+
+    redis_pipe.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_release_lock(adapter, redis_mock):
+    redis_mock.set.return_value = True
+    token = await adapter.acquire_lock("lock:key", 1.5)
+    assert token is not None
+    redis_mock.set.assert_awaited_with("lock:key", token, px=1500, nx=True)
+
+    redis_mock.set.return_value = None
+    assert await adapter.acquire_lock("lock:key", 1.5) is None
+
+    script = AsyncMock(return_value=1)
+    redis_mock.register_script = MagicMock(return_value=script)
+    assert await adapter.release_lock("lock:key", token) is True
+    script.assert_awaited_once_with(keys=["lock:key"], args=[token])
+
+
+@pytest.mark.asyncio
+async def test_set_json_if_newer(adapter, redis_mock):
+    script = AsyncMock(side_effect=[1, 0])
+    redis_mock.register_script = MagicMock(return_value=script)
+
+    assert await adapter.set_json_if_newer("key", {"a": 1}, 10, 30) is True
+    script.assert_awaited_with(keys=["key", "version:key"], args=['{"a": 1}', 10, 30])
+    assert await adapter.set_json_if_newer("key", {"a": 0}, 5) is False
+    script.assert_awaited_with(keys=["key", "version:key"], args=['{"a": 0}', 5, 0])
+    # O script é registrado uma única vez
+    redis_mock.register_script.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_mset_json_if_newer_uses_pipeline(adapter, redis_mock, redis_pipe):
+    redis_mock.register_script = MagicMock(return_value=MagicMock(sha="sha1"))
+    redis_pipe.execute.return_value = [1, 0]
+
+    assert await adapter.mset_json_if_newer({"k1": ({"a": 1}, 2), "k2": ([1], 1)}, 30) == [True, False]
+
+    redis_pipe.evalsha.assert_any_call("sha1", 2, "k1", "version:k1", '{"a": 1}', 2, 30)
+    redis_pipe.evalsha.assert_any_call("sha1", 2, "k2", "version:k2", "[1]", 1, 30)
+    redis_pipe.execute.assert_awaited_once()
+    assert await adapter.mset_json_if_newer({}) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_if_newer(adapter, redis_mock):
+    script = AsyncMock(return_value=1)
+    redis_mock.register_script = MagicMock(return_value=script)
+
+    assert await adapter.delete_if_newer("key", 10, 30) is True
+    script.assert_awaited_once_with(keys=["key", "version:key"], args=[10, 30])
@@ -10,6 +10,7 @@ class DummyQuery(QueryModel):
     price__lt: int | None = None
     name: str | None = None
     category: str | None = None
+    category__in: list[str] | None = None
 
 
 def test_to_query_dict_with_comparison_operators():
@@ -24,6 +25,12 @@ def test_to_query_dict_with_all_operators():
     assert result == {"price": {"$gte": 5, "$gt": 3, "$lte": 15, "$lt": 12}, "category": "books"}
 
 
+def test_to_query_dict_with_in_operator():
+    q = DummyQuery(category__in=["books", "tools"], price__lt=20)
+    result = q.to_query_dict()
+    assert result == {"category": {"$in": ["books", "tools"]}, "price": {"$lt": 20}}
+
+
 def test_to_query_dict_with_no_operators():
     q = DummyQuery(name="test", category="tools")
     result = q.to_query_dict()
@@ -1,7 +1,24 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
 import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.schema import CreateIndex
 
+from app.api.common.schemas import Paginator
+from app.common.exceptions.pagination_exceptions import InvalidCursorException
+from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
 from app.models import Price
+from app.models.base import UserModel
+from app.models.price_filter_model import PriceFilter
+from app.models.price_history_filter_model import PriceHistoryFilter
+from app.models.price_history_model import PriceHistory
+from app.repositories import PriceRepository
 from app.repositories.base.sqlalchemy_crud_repository import SQLAlchemyCrudRepository
+from app.repositories.price_history_repository import PriceHistoryBase, PriceHistoryRepository
+from app.repositories.price_repository import PriceBase
+from app.services.price_history_service import PriceHistoryService
 
 
 class DummyColumn:
@@ -29,6 +46,9 @@ class DummyColumn:
     def __ne__(self, other):
         return False
 
+    def in_(self, values):
+        return True
+
 
 # Dummy SQLAlchemy entity base para Price
 class DummyPriceBase:
@@ -90,15 +110,20 @@ class DummySQLAlchemyClient:
     def order_by(self, *args, **kwargs):
         return self
 
+    def begin(self, session):
+        return session.begin()
+
     def make_session(self):
         class DummySession:
+            info = {}
+
             async def __aenter__(self):
                 return self
 
             async def __aexit__(self, exc_type, exc, tb):
                 pass
 
-            async def execute(self, stmt):
+            async def execute(self, stmt, parameters=None):
                 class DummyResult:
                     def scalars(self):
                         class DummyScalars:
@@ -137,6 +162,9 @@ class DummySQLAlchemyClient:
 
         return DummySession()
 
+    def make_read_session(self):
+        return self.make_session()
+
 
 @pytest.fixture
 def repository():
@@ -249,6 +277,14 @@ async def test_find_returns_empty_list(repository):
     assert results == []
 
 
+@pytest.mark.asyncio
+async def test_find_by_seller_id_and_skus(repository):
+    # Testa a busca em lote, com e sem skus
+    assert await repository.find_by_seller_id_and_skus("seller", []) == []
+    results = await repository.find_by_seller_id_and_skus("seller", ["A", "B"])
+    assert results == []
+
+
 @pytest.mark.asyncio
 async def test_find_with_empty_filters(repository):
     # Testa find com filtros vazios
@@ -334,3 +370,474 @@ async def test_delete_by_seller_id_and_sku_returns_false(repository):
     # Testa delete_by_seller_id_and_sku quando não encontra base
     result = await repository.delete_by_seller_id_and_sku("seller", "sku")
     assert result is False
+
+
+class CapturingSession:
+    """Sessão que guarda os comandos executados e devolve a entidade informada."""
+
+    def __init__(self, returned_base, returned_rows=()):
+        self.returned_base = returned_base
+        self.returned_rows = list(returned_rows)
+        self.statements = []
+        self.parameters = []
+        self.info = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def stream(self, stmt, parameters=None):
+        return self._streamed(stmt, parameters, self.returned_rows)
+
+    async def stream_scalars(self, stmt, parameters=None):
+        return self._streamed(stmt, parameters, [self.returned_base] if self.returned_base else [])
+
+    def _streamed(self, stmt, parameters, items):
+        # Resultado de um cursor no servidor, entregue em lotes de yield_per
+        self.statements.append(stmt)
+        self.parameters.append(parameters)
+        batch_size = stmt.get_execution_options()["yield_per"]
+
+        async def partitions():
+            for start in range(0, len(items), batch_size):
+                yield items[start : start + batch_size]
+
+        result = MagicMock()
+        result.partitions = partitions
+        return result
+
+    async def execute(self, stmt, parameters=None):
+        self.statements.append(stmt)
+        self.parameters.append(parameters)
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = self.returned_base
+        result.scalar_one.return_value = self.returned_base
+        result.scalars.return_value.all.return_value = [self.returned_base] if self.returned_base else []
+        result.all.return_value = self.returned_rows
+        return result
+
+
+@pytest.fixture
+def price_session():
+    return CapturingSession(returned_base=None)
+
+
+@pytest.fixture
+def price_repository(price_session):
+    sql_client = MagicMock(spec=SQLAlchemyClient)
+    sql_client.get_pk_fields.side_effect = SQLAlchemyClient.get_pk_fields
+    sql_client.init_insert.side_effect = SQLAlchemyClient.init_insert
+    sql_client.to_dict.side_effect = SQLAlchemyClient.to_dict
+    sql_client.make_session.return_value = price_session
+    sql_client.make_read_session.return_value = price_session
+    return PriceRepository(sql_client=sql_client)
+
+
+def compile_pg(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_insert_if_absent_uses_on_conflict_do_nothing(price_repository, price_session):
+    # A duplicidade é resolvida pelo banco em um único comando
+    entity = Price(seller_id="seller", sku="sku", de=200, por=150, created_by=UserModel(name="u", server="s"))
+    price_session.returned_base = price_repository.to_base(entity)
+
+    result = await price_repository.insert_if_absent(entity)
+
+    stmt = price_session.statements[0]
+    assert "ON CONFLICT (seller_id, sku) DO NOTHING RETURNING" in compile_pg(stmt)
+    # A chave é gerada pelo banco
+    assert "id" not in stmt.compile(dialect=postgresql.dialect()).params
+    assert isinstance(result, Price)
+    assert result.sku == "sku"
+
+
+@pytest.mark.asyncio
+async def test_insert_if_absent_returns_none_when_exists(price_repository, price_session):
+    result = await price_repository.insert_if_absent(Price(seller_id="seller", sku="sku", de=200, por=150))
+
+    assert result is None
+    assert len(price_session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_updates_only_mutable_fields(price_repository, price_session):
+    entity = Price(seller_id="seller", sku="sku", de=200, por=150)
+    price_session.returned_base = price_repository.to_base(entity)
+
+    result = await price_repository.upsert(entity)
+
+    sql = compile_pg(price_session.statements[0])
+    update_clause = sql.split("DO UPDATE SET")[1]
+    assert "ON CONFLICT (seller_id, sku) DO UPDATE SET" in sql
+    assert "de = excluded.de" in update_clause
+    assert "por = excluded.por" in update_clause
+    assert "updated_at" in update_clause
+    for immutable in ("created_at", "created_by", "seller_id", "sku", "id ="):
+        assert immutable not in update_clause.split("RETURNING")[0]
+    assert result.de == 200
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_uses_single_multi_row_statement(price_repository, price_session):
+    entities = [Price(seller_id="seller", sku=sku, de=200, por=150) for sku in ("A", "B", "C")]
+    price_session.returned_base = price_repository.to_base(entities[0])
+
+    await price_repository.upsert_many(entities)
+
+    assert len(price_session.statements) == 1
+    assert [row["sku"] for row in price_session.parameters[0]] == ["A", "B", "C"]
+    stmt = price_session.statements[0]
+    assert "ON CONFLICT (seller_id, sku) DO UPDATE SET" in compile_pg(stmt)
+    assert stmt._returning and stmt._sort_by_parameter_order
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_with_no_entities(price_repository, price_session):
+    assert await price_repository.upsert_many([]) == []
+    assert await price_repository.insert_many([]) == 0
+    assert price_session.statements == []
+
+
+@pytest.mark.asyncio
+async def test_insert_many(price_repository, price_session):
+    entities = [Price(seller_id="seller", sku=sku, de=200, por=150) for sku in ("A", "B")]
+
+    assert await price_repository.insert_many(entities) == 2
+    assert len(price_session.statements) == 1
+    assert all("id" not in row for row in price_session.parameters[0])
+
+
+@pytest.fixture
+def keyset_repository(price_repository, price_session):
+    price_repository.sql_client.init_select.side_effect = SQLAlchemyClient.init_select
+    return price_repository
+
+
+@pytest.mark.asyncio
+async def test_find_with_cursor_uses_row_comparison(keyset_repository, price_session):
+    # Mesma direção em todos os campos: (por, id) < (:por, :id), sem OFFSET
+    await keyset_repository.find(DummyFilter(), limit=10, offset=30, sort={"por": -1}, after={"por": "90", "id": 5})
+
+    stmt = price_session.statements[0]
+    sql = compile_pg(stmt)
+    assert "(pc_preco.por, pc_preco.id) < (" in sql
+    # Limite simples no primeiro campo, que permite descartar partições
+    assert "pc_preco.por <= " in sql
+    assert "ORDER BY pc_preco.por DESC, pc_preco.id DESC" in sql
+    assert "OFFSET" not in sql
+    assert price_session.parameters[0] == {"limit": 10, "after_0": 90, "after_1": 5}
+
+
+@pytest.mark.asyncio
+async def test_find_with_cursor_mixed_directions(keyset_repository, price_session):
+    await keyset_repository.find(
+        DummyFilter(),
+        limit=10,
+        sort={"sku": 1, "updated_at": -1},
+        after={"sku": "A", "updated_at": "2025-07-01T12:00:00Z", "id": 5},
+    )
+
+    stmt = price_session.statements[0]
+    sql = compile_pg(stmt)
+    assert " OR " in sql
+    assert "ORDER BY pc_preco.sku ASC, pc_preco.updated_at DESC, pc_preco.id DESC" in sql
+    assert price_session.parameters[0]["after_1"] == datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_find_without_cursor_orders_by_id(keyset_repository, price_session):
+    await keyset_repository.find(DummyFilter(), limit=10, offset=20)
+
+    sql = compile_pg(price_session.statements[0])
+    assert "ORDER BY pc_preco.id ASC" in sql
+    assert "OFFSET" in sql
+
+
+@pytest.mark.asyncio
+async def test_find_reuses_statement_template_per_shape(keyset_repository, price_session):
+    # Mesmo formato (campos, operadores e ordenação): a mesma consulta, somente com outros parâmetros
+    await keyset_repository.find(PriceFilter(seller_id="A", por__lt=1000), limit=10, sort={"por": 1})
+    await keyset_repository.find(PriceFilter(seller_id="B", por__lt=50), limit=20, offset=20, sort={"por": 1})
+
+    first, second = price_session.statements
+    assert first is second
+    assert "pc_preco.seller_id = $1" in str(first.compile(dialect=asyncpg.dialect()))
+    assert price_session.parameters == [
+        {"filter_0": "A", "filter_1": 1000, "limit": 10, "offset": 0},
+        {"filter_0": "B", "filter_1": 50, "limit": 20, "offset": 20},
+    ]
+
+    # Outro formato (sem o filtro de preço, com cursor) gera outra consulta
+    await keyset_repository.find(PriceFilter(seller_id="A"), sort={"por": 1}, after={"por": 90, "id": 5})
+    assert price_session.statements[2] is not first
+    assert len(keyset_repository._find_templates) == 2
+
+
+@pytest.mark.asyncio
+async def test_find_templates_cache_is_bounded(keyset_repository):
+    keyset_repository.find_templates_max = 2
+    for sort in ({"por": 1}, {"de": 1}, {"sku": 1}):
+        await keyset_repository.find(DummyFilter(), sort=sort)
+
+    assert len(keyset_repository._find_templates) == 1
+
+
+@pytest.mark.asyncio
+async def test_find_with_exact_total_counts_in_the_same_query(keyset_repository, price_session):
+    base = keyset_repository.to_base(Price(seller_id="seller", sku="A", de=200, por=150))
+    price_session.returned_rows = [(base, 37)]
+
+    results, total = await keyset_repository.find_with_total(
+        PriceFilter(seller_id="seller"), limit=10, sort={"por": 1}, after={"por": 90, "id": 5}, count="exact"
+    )
+
+    assert [price.sku for price in results] == ["A"]
+    assert total == 37
+    assert len(price_session.statements) == 1
+    sql = compile_pg(price_session.statements[0])
+    # A contagem usa somente os filtros: independe do cursor e do limit da página
+    assert "(SELECT count(*) AS count_1 \nFROM pc_preco \nWHERE pc_preco.seller_id = " in sql
+    assert sql.index("AS total") < sql.index("AND (pc_preco.por, pc_preco.id) > (")
+
+
+@pytest.mark.asyncio
+async def test_find_with_exact_total_on_empty_page(keyset_repository, price_session):
+    price_session.returned_base = 12
+
+    # Primeira página vazia: nenhum registro nos filtros, sem nova consulta
+    assert await keyset_repository.find_with_total(PriceFilter(seller_id="seller")) == ([], 0)
+    assert len(price_session.statements) == 1
+
+    # Página vazia além do fim: a contagem é feita à parte
+    assert await keyset_repository.find_with_total(PriceFilter(seller_id="seller"), offset=40) == ([], 12)
+    assert "count(*)" in compile_pg(price_session.statements[-1])
+    assert price_session.parameters[-1] == {"filter_0": "seller"}
+
+
+@pytest.mark.asyncio
+async def test_find_with_estimated_total_uses_planner_estimate(keyset_repository, price_session):
+    keyset_repository.core_reads = True
+    price_session.returned_base = [{"Plan": {"Node Type": "Index Only Scan", "Plan Rows": 1234}}]
+
+    results, total = await keyset_repository.find_with_total(
+        PriceFilter(seller_id="sel'ler", por__lt=100), limit=10, count="estimated"
+    )
+
+    assert total == 1234
+    explain = str(price_session.statements[1])
+    assert explain.startswith("EXPLAIN (FORMAT JSON) SELECT pc_preco.id")
+    assert "pc_preco.seller_id = 'sel''ler'" in explain
+    assert "pc_preco.por < 100" in explain
+
+
+@pytest.mark.asyncio
+async def test_find_with_incompatible_cursor(keyset_repository):
+    with pytest.raises(InvalidCursorException):
+        await keyset_repository.find(DummyFilter(), sort={"por": 1}, after={"id": 5})
+    with pytest.raises(InvalidCursorException):
+        await keyset_repository.find(DummyFilter(), sort={"por": 1}, after={"por": "caro", "id": 5})
+
+
+@pytest.fixture
+def history_repository():
+    sql_client = MagicMock(spec=SQLAlchemyClient)
+    sql_client.get_pk_fields.side_effect = SQLAlchemyClient.get_pk_fields
+    sql_client.init_select.side_effect = SQLAlchemyClient.init_select
+    return PriceHistoryRepository(sql_client=sql_client)
+
+
+def test_price_history_index_matches_history_queries():
+    index = next(
+        index
+        for index in PriceHistoryBase.__table__.indexes
+        if index.name == "idx_preco_historico_sellerid_sku_registered_at"
+    )
+
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "(seller_id, sku, registered_at DESC, id DESC)" in ddl
+
+
+def test_price_history_last_n_prices_query_follows_index_order(history_repository):
+    # Igualdade nas duas primeiras colunas e ordenação nas demais: o índice entrega as linhas já na ordem
+    stmt = history_repository._find_statement(
+        PriceFilter(seller_id="seller", sku="sku"), limit=5, sort={"registered_at": -1}
+    )
+
+    sql = compile_pg(stmt)
+    assert "pc_preco_historico.seller_id = " in sql
+    assert "pc_preco_historico.sku = " in sql
+    assert "ORDER BY pc_preco_historico.registered_at DESC, pc_preco_historico.id DESC" in sql
+
+
+@pytest.mark.asyncio
+async def test_price_history_pages_follow_the_next_cursor(history_repository):
+    # Sem _sort: o desempate é somente o id (registered_at, da chave primária, não entra no cursor)
+    registered_at = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    histories = [
+        PriceHistory(id=index, seller_id="seller", sku="sku", de=200, por=100, registered_at=registered_at)
+        for index in range(1, 6)
+    ]
+    statements = []
+
+    async def fetch_models(session, stmt, params=None):
+        statements.append(stmt)
+        return [history for history in histories if history.id > params.get("after_0", 0)][: params["limit"]]
+
+    history_repository._fetch_models = fetch_models
+    history_repository.sql_client.make_read_session.return_value = CapturingSession(returned_base=None)
+    service = PriceHistoryService(history_repository)
+
+    pages, cursor = [], None
+    while True:
+        paginator = Paginator(request_path="/", limit=2, cursor=cursor)
+        results = await service.get_by_seller_id_and_sku("seller", "sku", paginator)
+        pages.append([history.id for history in paginator.page(results)])
+        cursor = paginator.next_cursor(results)
+        if cursor is None:
+            break
+
+    assert pages == [[1, 2], [3, 4], [5]]
+    sql = compile_pg(statements[-1])
+    assert "(pc_preco_historico.id) > (" in sql
+    assert "ORDER BY pc_preco_historico.id ASC" in sql
+    assert "registered_at ASC" not in sql
+
+
+@pytest.mark.asyncio
+async def test_price_history_export_query_follows_index_order(history_repository, price_session):
+    # Exportação: skus em lista e período de registro (partições), na ordem do índice
+    history_repository.sql_client.make_read_session.return_value = price_session
+    start, end = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 4, 1, tzinfo=timezone.utc)
+    filters = PriceHistoryFilter(seller_id="seller", sku__in=["A", "B"], registered_at__ge=start, registered_at__lt=end)
+
+    assert [history async for history in history_repository.stream(filters, {"sku": 1, "registered_at": -1})] == []
+
+    sql = compile_pg(price_session.statements[0])
+    assert "pc_preco_historico.sku IN (__[POSTCOMPILE_filter_1])" in sql
+    assert "pc_preco_historico.registered_at >= " in sql and "pc_preco_historico.registered_at < " in sql
+    assert (
+        "ORDER BY pc_preco_historico.sku ASC, pc_preco_historico.registered_at DESC, pc_preco_historico.id DESC" in sql
+    )
+    assert price_session.parameters[0] == {
+        "filter_0": "seller",
+        "filter_1": ["A", "B"],
+        "filter_2": start,
+        "filter_3": end,
+    }
+
+
+def test_price_listing_query_is_anchored_on_seller_index(keyset_repository):
+    # seller_id em igualdade, faixa de preço e ordenação por (por, id): o prefixo de idx_preco_sellerid_por
+    stmt = keyset_repository._find_statement(
+        PriceFilter(seller_id="seller", por__lt=1000, por__gt=100), limit=10, sort={"por": 1}
+    )
+
+    sql = compile_pg(stmt)
+    assert "pc_preco.seller_id = " in sql
+    assert "pc_preco.por < " in sql and "pc_preco.por > " in sql
+    assert "ORDER BY pc_preco.por ASC, pc_preco.id ASC" in sql
+    indexes = {index.name: [column.name for column in index.columns] for index in PriceBase.__table__.indexes}
+    assert indexes["idx_preco_sellerid_por"] == ["seller_id", "por", "id"]
+    assert indexes["idx_preco_sellerid_de"] == ["seller_id", "de", "id"]
+
+
+@pytest.fixture
+def core_repository(price_repository):
+    price_repository.sql_client.init_select.side_effect = SQLAlchemyClient.init_select
+    price_repository.sql_client.in_unit_of_work.return_value = False
+    price_repository.core_reads = True
+    return price_repository
+
+
+def price_row(sku: str) -> tuple:
+    # Linha na ordem das colunas da tabela pc_preco
+    user = {"name": "u", "server": "s"}
+    now = datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+    values = {
+        "id": 1,
+        "seller_id": "seller",
+        "sku": sku,
+        "de": 200,
+        "por": 150,
+        "alerta_pendente": False,
+        "created_at": now,
+        "updated_at": now,
+        "created_by": user,
+        "updated_by": user,
+    }
+    return tuple(values[column.key] for column in PriceBase.__table__.columns)
+
+
+@pytest.mark.asyncio
+async def test_find_with_core_reads_maps_rows_to_models(core_repository, price_session):
+    # Seleciona somente as colunas (sem entidades do ORM) e converte as linhas direto em Price
+    price_session.returned_rows = [price_row("A"), price_row("B")]
+
+    results = await core_repository.find(PriceFilter(seller_id="seller"), limit=10)
+
+    stmt = price_session.statements[0]
+    assert [column["name"] for column in stmt.column_descriptions] == [c.key for c in PriceBase.__table__.columns]
+    assert "pc_preco.seller_id = " in compile_pg(stmt)
+    assert [price.sku for price in results] == ["A", "B"]
+    assert results[0] == Price(
+        id=1,
+        seller_id="seller",
+        sku="A",
+        de=200,
+        por=150,
+        alerta_pendente=False,
+        created_at=datetime(2025, 7, 1, 12, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 7, 1, 12, tzinfo=timezone.utc),
+        created_by=UserModel(name="u", server="s"),
+        updated_by=UserModel(name="u", server="s"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_with_core_reads_yields_rows_in_batches(core_repository, price_session):
+    price_session.returned_rows = [price_row(sku) for sku in ("A", "B", "C")]
+
+    prices = [price async for price in core_repository.stream(PriceFilter(seller_id="seller"), {"sku": 1}, 2)]
+
+    assert [price.sku for price in prices] == ["A", "B", "C"]
+    stmt = price_session.statements[0]
+    assert stmt.get_execution_options()["yield_per"] == 2
+    sql = compile_pg(stmt)
+    assert "ORDER BY pc_preco.sku ASC, pc_preco.id ASC" in sql
+    assert "LIMIT" not in sql
+    assert price_session.parameters[0] == {"filter_0": "seller"}
+
+
+@pytest.mark.asyncio
+async def test_stream_with_orm(keyset_repository, price_session):
+    price_session.returned_base = keyset_repository.to_base(Price(seller_id="seller", sku="A", de=200, por=150))
+
+    prices = [price async for price in keyset_repository.stream(PriceFilter(seller_id="seller"))]
+
+    assert [price.sku for price in prices] == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_find_by_seller_id_and_sku_with_core_reads(core_repository, price_session):
+    price_session.returned_rows = [price_row("A")]
+    assert (await core_repository.find_by_seller_id_and_sku("seller", "A")).sku == "A"
+
+    price_session.returned_rows = []
+    assert await core_repository.find_by_seller_id_and_sku("seller", "B") is None
+    assert price_session.info == {}
+
+
+@pytest.mark.asyncio
+async def test_find_by_seller_id_and_sku_keeps_orm_inside_unit_of_work(core_repository, price_session):
+    # As escritas da unidade de trabalho reaproveitam a entidade lida pelo ORM
+    core_repository.sql_client.in_unit_of_work.return_value = True
+    price_session.returned_base = core_repository.to_base(Price(seller_id="seller", sku="A", de=200, por=150))
+
+    result = await core_repository.find_by_seller_id_and_sku("seller", "A")
+
+    assert result.sku == "A"
+    assert (PriceBase, "seller", "A") in price_session.info
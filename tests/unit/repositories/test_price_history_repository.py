@@ -0,0 +1,182 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from app.integrations.database.sqlalchemy_client import SQLAlchemyClient
+from app.repositories.price_history_repository import (
+    PARTITION_MAINTENANCE_LOCK,
+    PriceHistoryRepository,
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+NOW = datetime(2026, 10, 17, 15, 30, tzinfo=timezone.utc)
+
+
+class Savepoint:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        self.session.savepoints += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.session.rolled_back += 1
+
+
+class PartitionSession:
+    """
+    Sessão que devolve as partições existentes e guarda os comandos DDL executados.
+    default_rows: nomes das partições cujo mês já tem registros na partição padrão.
+    """
+
+    def __init__(self, partitions, failing=(), default_rows=()):
+        self.partitions = list(partitions)
+        self.failing = set(failing)
+        self.default_rows = set(default_rows)
+        self.locks = []
+        self.ddl = []
+        self.savepoints = 0
+        self.rolled_back = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    def begin_nested(self):
+        return Savepoint(self)
+
+    async def execute(self, stmt, parameters=None):
+        sql = str(stmt)
+        result = MagicMock()
+        if sql.startswith("SELECT pg_advisory_xact_lock"):
+            self.locks.append(parameters["key"])
+            return result
+        if sql.startswith("SELECT EXISTS"):
+            result.scalar.return_value = partition_name(parameters["start"]) in self.default_rows
+            return result
+        if sql.startswith("SELECT"):
+            result.scalars.return_value.all.return_value = self.partitions
+            return result
+        if any(name in sql for name in self.failing):
+            raise ProgrammingError(sql, None, Exception("falha no comando"))
+        self.ddl.append(sql)
+        return result
+
+
+def make_repository(session: PartitionSession) -> PriceHistoryRepository:
+    sql_client = MagicMock(spec=SQLAlchemyClient)
+    sql_client.get_pk_fields.side_effect = SQLAlchemyClient.get_pk_fields
+    sql_client.make_session.return_value = session
+    sql_client.unit_of_work.return_value = session
+    return PriceHistoryRepository(sql_client)
+
+
+def test_month_helpers():
+    month = month_start(NOW)
+    assert month == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert add_months(month, 3) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -10) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert partition_name(month) == "pc_preco_historico_p202610"
+    assert partition_month("pc_preco_historico_p202610") == month
+    assert partition_month("pc_preco_historico_default") is None
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_creates_missing_months():
+    session = PartitionSession(["pc_preco_historico_default", "pc_preco_historico_p202610"])
+    repository = make_repository(session)
+
+    created = await repository.create_partitions(months_ahead=2, now=NOW)
+
+    assert created == ["pc_preco_historico_p202611", "pc_preco_historico_p202612"]
+    assert session.ddl[0] == (
+        "CREATE TABLE pc_preco_historico_p202611 PARTITION OF pc_preco_historico "
+        "FOR VALUES FROM ('2026-11-01T00:00:00+00:00') TO ('2026-12-01T00:00:00+00:00')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_continues_after_failure():
+    session = PartitionSession([], failing=["pc_preco_historico_p202610"])
+    repository = make_repository(session)
+
+    created = await repository.create_partitions(months_ahead=1, now=NOW)
+
+    assert created == ["pc_preco_historico_p202611"]
+    assert session.rolled_back == 1
+    assert session.locks == [PARTITION_MAINTENANCE_LOCK]
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_moves_rows_out_of_the_default_partition():
+    session = PartitionSession(["pc_preco_historico_default"], default_rows=["pc_preco_historico_p202610"])
+    repository = make_repository(session)
+
+    created = await repository.create_partitions(months_ahead=0, now=NOW)
+
+    assert created == ["pc_preco_historico_p202610"]
+    period = "registered_at >= '2026-10-01T00:00:00+00:00' AND registered_at < '2026-11-01T00:00:00+00:00'"
+    assert session.ddl == [
+        "CREATE TABLE pc_preco_historico_p202610 (LIKE pc_preco_historico INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM pc_preco_historico_default WHERE {period} RETURNING *) "
+        "INSERT INTO pc_preco_historico_p202610 SELECT * FROM moved",
+        "ALTER TABLE pc_preco_historico ATTACH PARTITION pc_preco_historico_p202610 "
+        "FOR VALUES FROM ('2026-10-01T00:00:00+00:00') TO ('2026-11-01T00:00:00+00:00')",
+    ]
+    assert session.savepoints == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "archive, expected_ddl",
+    [
+        (True, "ALTER TABLE pc_preco_historico DETACH PARTITION pc_preco_historico_p202409"),
+        (False, "DROP TABLE pc_preco_historico_p202409"),
+    ],
+)
+async def test_expire_partitions_before_retention(archive, expected_ddl):
+    # Retenção de 24 meses a partir de outubro/2026: mantém de outubro/2024 em diante
+    session = PartitionSession(
+        ["pc_preco_historico_default", "pc_preco_historico_p202409", "pc_preco_historico_p202410"]
+    )
+    repository = make_repository(session)
+
+    expired = await repository.expire_partitions(retention_months=24, archive=archive, now=NOW)
+
+    assert expired == ["pc_preco_historico_p202409"]
+    assert session.ddl == [expected_ddl]
+
+
+@pytest.mark.asyncio
+async def test_expire_partitions_continues_after_failure():
+    session = PartitionSession(
+        ["pc_preco_historico_p202408", "pc_preco_historico_p202409"], failing=["pc_preco_historico_p202408"]
+    )
+    repository = make_repository(session)
+
+    expired = await repository.expire_partitions(retention_months=24, archive=False, now=NOW)
+
+    assert expired == ["pc_preco_historico_p202409"]
+    assert session.ddl == ["DROP TABLE pc_preco_historico_p202409"]
+
+
+@pytest.mark.asyncio
+async def test_maintain_partitions_runs_under_the_advisory_lock():
+    session = PartitionSession(["pc_preco_historico_default", "pc_preco_historico_p202409"])
+    repository = make_repository(session)
+
+    result = await repository.maintain_partitions(months_ahead=0, retention_months=24, archive=True, now=NOW)
+
+    assert result == {"created": ["pc_preco_historico_p202610"], "expired": ["pc_preco_historico_p202409"]}
+    assert set(session.locks) == {PARTITION_MAINTENANCE_LOCK}
+    sql_client = repository.sql_client
+    assert sql_client.unit_of_work.call_count == 3  # a execução e as etapas aninhadas, na mesma transação
@@ -62,6 +62,25 @@ class TestPrecoRepository:
         assert result_obj.de == 160
         assert result_obj.por == 150
 
+    async def test_insert_if_absent(self, repository_mock):
+        """Deve inserir um preço novo e ignorar um preço já existente."""
+        novo_preco = await repository_mock.insert_if_absent(Price(seller_id="3", sku="C", de=300, por=270))
+        assert novo_preco is not None
+        assert await repository_mock.find_by_seller_id_and_sku("3", "C") is novo_preco
+
+        assert await repository_mock.insert_if_absent(Price(seller_id="1", sku="A", de=1, por=1)) is None
+        existente = await repository_mock.find_by_seller_id_and_sku("1", "A")
+        assert existente.de == 100
+
+    async def test_upsert(self, repository_mock):
+        """Deve inserir um preço novo ou atualizar o existente."""
+        await repository_mock.upsert(Price(seller_id="3", sku="C", de=300, por=270))
+        atualizado = await repository_mock.upsert(Price(seller_id="1", sku="A", de=120, por=110))
+
+        assert atualizado.updated_at is not None
+        assert (await repository_mock.find_by_seller_id_and_sku("3", "C")).de == 300
+        assert (await repository_mock.find_by_seller_id_and_sku("1", "A")).de == 120
+
     async def test_find_by_seller_id_and_sku_found(self, repository_mock):
         """Deve encontrar um preço existente pelo seller_id e sku."""
         result_obj = await repository_mock.find_by_seller_id_and_sku("1", "A")
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.api.common.schemas import Paginator
 from app.services.alert_service import AlertService
 
 
@@ -29,8 +30,16 @@ async def test_create_alert_calls_create(service, alert_repository):
 async def test_get_alerts_filters_and_calls_find(service, alert_repository):
     # Simula retorno do find
     alert_repository.find.return_value = ["alert1", "alert2"]
-    paginator = MagicMock()
+    paginator = Paginator(request_path="/")
     filters = {"foo": "bar", "baz": None}
     result = await service.get_alerts(paginator=paginator, filters=filters)
     alert_repository.find.assert_awaited()
     assert result == ["alert1", "alert2"]
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_scopes_query_by_seller(service, alert_repository):
+    alert_repository.find.return_value = []
+    await service.get_alerts(paginator=Paginator(request_path="/"), filters={"seller_id": "seller", "sku": None})
+    filters = alert_repository.find.call_args.kwargs["filters"]
+    assert filters.to_query_dict() == {"seller_id": "seller"}
@@ -27,7 +27,7 @@ class TestCrudService:
 
         repository.create.side_effect = create
 
-        async def find(filters, limit, offset, sort):
+        async def find(filters, limit, offset, sort, after=None):
             return [
                 SampleEntity(id=UUID("00000000-0000-0000-0000-000000000001"), name="Test Entity 1", value=100),
                 SampleEntity(id=UUID("00000000-0000-0000-0000-000000000002"), name="Test Entity 2", value=200),
@@ -117,3 +117,40 @@ class TestCrudService:
         result = await service.delete_by_seller_id_and_sku(seller_id, sku)
         assert result is None
         repository_mock.delete_by_seller_id_and_sku.assert_called_once_with(seller_id, sku)
+
+    @pytest.mark.asyncio
+    async def test_find_with_cursor_passes_keyset(self, service, repository_mock):
+        paginator = Paginator(request_path="/", limit=2, sort="value:desc")
+        cursor = paginator.next_cursor(
+            [
+                SampleEntity(id=1, name="A", value=300),
+                SampleEntity(id=2, name="B", value=200),
+                SampleEntity(id=3, name="C", value=100),
+            ]
+        )
+
+        await service.find(Paginator(request_path="/", limit=2, sort="value:desc", cursor=cursor), filters={})
+
+        kwargs = repository_mock.find.call_args.kwargs
+        assert kwargs["after"] == {"value": 200, "id": 2}
+        assert kwargs["sort"] == {"value": -1}
+
+    @pytest.mark.asyncio
+    async def test_find_fetches_lookahead_row(self, service, repository_mock):
+        await service.find(Paginator(request_path="/", limit=2), filters={})
+
+        assert repository_mock.find.call_args.kwargs["limit"] == 3
+        repository_mock.find_with_total.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_find_with_count_stores_total(self, service, repository_mock):
+        repository_mock.find_with_total.return_value = ([SampleEntity(name="A", value=1)], 41)
+        paginator = Paginator(request_path="/", limit=2, count="estimated")
+
+        results = await service.find(paginator, filters={})
+
+        assert len(results) == 1
+        assert paginator.total == 41
+        assert repository_mock.find_with_total.call_args.kwargs["count"] == "estimated"
+        assert repository_mock.find_with_total.call_args.kwargs["limit"] == 3
+        repository_mock.find.assert_not_called()
@@ -0,0 +1,528 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.integrations.cache.cache_policy import CachePolicy, CachePolicyRegistry
+from app.integrations.cache.local_cache_adapter import LocalCacheAdapter
+from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter, RedisPipeline
+from app.models import Price
+from app.models.base import UserModel
+from app.services.price_cache_service import (
+    PRICE_INVALIDATION_CHANNEL,
+    TOMBSTONE,
+    PriceCacheService,
+    pack_price,
+    unpack_price,
+)
+
+
+@pytest.fixture
+def redis_adapter():
+    redis_adapter = AsyncMock(spec=RedisAsyncioAdapter)
+    # Os comandos do pipeline são somente enfileirados (síncronos): executados na saída do bloco
+    pipe = MagicMock(spec=RedisPipeline)
+    pipe.results = []
+    redis_adapter.pipeline.return_value.__aenter__.return_value = pipe
+    return redis_adapter
+
+
+@pytest.fixture
+def pipe(redis_adapter):
+    """Pipeline do adaptador: os retornos dos comandos são definidos em pipe.results."""
+    return redis_adapter.pipeline.return_value.__aenter__.return_value
+
+
+@pytest.fixture
+def policies():
+    """Políticas sem variação aleatória, para TTLs previsíveis nos testes."""
+    return CachePolicyRegistry(
+        {
+            "price": CachePolicy(ttl_seconds=300, refresh_ahead_seconds=30),
+            "price-list": CachePolicy(ttl_seconds=60),
+        }
+    )
+
+
+@pytest.fixture
+def price_cache(redis_adapter, policies):
+    return PriceCacheService(
+        redis_adapter,
+        LocalCacheAdapter(max_size=10, ttl_seconds=60),
+        policies=policies,
+        reconnect_delay_seconds=0,
+    )
+
+
+def test_build_key():
+    assert PriceCacheService.build_key("1", "A") == "price:1:A"
+
+
+@pytest.mark.asyncio
+async def test_get_from_redis_populates_local_cache(price_cache, redis_adapter):
+    redis_adapter.get_json.return_value = {"seller_id": "1", "sku": "A", "de": 100, "por": 90}
+
+    first = await price_cache.get("price:1:A")
+    second = await price_cache.get("price:1:A")
+
+    assert first.sku == "A"
+    assert second is first
+    redis_adapter.get_json.assert_awaited_once_with("price:1:A")
+    stats = price_cache.stats()
+    assert stats["local"]["hits"] == 1
+    assert stats["local"]["misses"] == 1
+    assert stats["redis"] == {"hits": 1, "misses": 0}
+
+
+def test_pack_and_unpack_price():
+    price = Price(
+        id=7,
+        seller_id="1",
+        sku="A",
+        de=100,
+        por=90,
+        alerta_pendente=True,
+        created_at=datetime(2025, 1, 1, 10, 30, 15, 123456, tzinfo=timezone.utc),
+        updated_at=None,
+        created_by=UserModel(name="vendedor1", server="http://keycloak"),
+    )
+
+    assert unpack_price(pack_price(price)) == price
+
+
+@pytest.mark.asyncio
+async def test_get_compact_entry_from_redis(price_cache, redis_adapter):
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    redis_adapter.get_json.return_value = pack_price(price)
+
+    assert await price_cache.get("price:1:A") == price
+    assert price_cache.stats()["redis"] == {"hits": 1, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_compact_layout_is_a_miss(price_cache, redis_adapter):
+    redis_adapter.get_json.return_value = [1, "1", "A"]
+
+    assert await price_cache.get("price:1:A") is None
+    assert price_cache.stats()["redis"] == {"hits": 0, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_miss_on_both_tiers(price_cache, redis_adapter):
+    redis_adapter.get_json.return_value = None
+    assert await price_cache.get("price:1:A") is None
+    assert price_cache.stats()["redis"] == {"hits": 0, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_set_writes_both_tiers(price_cache, redis_adapter):
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    await price_cache.set("price:1:A", price)
+
+    redis_adapter.set_json_if_newer.assert_awaited_once()
+    assert redis_adapter.set_json_if_newer.await_args.args[1] == pack_price(price)
+    assert redis_adapter.set_json_if_newer.await_args.args[2] == PriceCacheService.version_of(price)
+    assert await price_cache.get("price:1:A") is price
+    redis_adapter.get_json.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_set_rejected_by_newer_version_drops_local_entry(price_cache, redis_adapter):
+    redis_adapter.set_json_if_newer.return_value = False
+    price_cache.local_cache.set("price:1:A", Price(seller_id="1", sku="A", de=100, por=90))
+
+    stored = await price_cache.set("price:1:A", Price(seller_id="1", sku="A", de=100, por=80))
+
+    assert stored is False
+    assert price_cache.local_cache.get("price:1:A") is None
+
+
+def test_version_of_uses_last_change():
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    updated_at = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+    assert PriceCacheService.version_of(Price(seller_id="1", sku="A", de=1, por=1, created_at=created_at)) == int(
+        created_at.timestamp() * 1000
+    )
+    assert PriceCacheService.version_of(
+        Price(seller_id="1", sku="A", de=1, por=1, created_at=created_at, updated_at=updated_at)
+    ) == int(updated_at.timestamp() * 1000)
+
+
+@pytest.mark.asyncio
+async def test_write_through_stores_and_publishes_in_one_round_trip(price_cache, redis_adapter, pipe):
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    pipe.results = [True, 1, 1]
+
+    await price_cache.write_through(price)
+
+    redis_adapter.pipeline.assert_called_once()
+    pipe.set_json_if_newer.assert_called_once_with(
+        "price:1:A", pack_price(price), PriceCacheService.version_of(price), 300
+    )
+    pipe.incr.assert_called_once_with("price-list-gen:1")
+    pipe.publish.assert_called_once_with(PRICE_INVALIDATION_CHANNEL, "price:1:A")
+    redis_adapter.set_json_if_newer.assert_not_awaited()
+    redis_adapter.publish.assert_not_awaited()
+    assert price_cache.local_cache.get("price:1:A") is price
+
+
+@pytest.mark.asyncio
+async def test_write_through_rejected_by_newer_version(price_cache, pipe):
+    price_cache.local_cache.set("price:1:A", Price(seller_id="1", sku="A", de=100, por=90))
+    pipe.results = [False, 1, 1]
+
+    await price_cache.write_through(Price(seller_id="1", sku="A", de=100, por=80))
+
+    assert price_cache.local_cache.get("price:1:A") is None
+
+
+@pytest.mark.asyncio
+async def test_write_through_many_in_one_round_trip(price_cache, redis_adapter, pipe):
+    prices = [Price(seller_id="1", sku="A", de=100, por=90), Price(seller_id="1", sku="B", de=100, por=80)]
+    pipe.results = [True, False, 1, 1, 1]
+
+    await price_cache.write_through_many(prices)
+
+    redis_adapter.pipeline.assert_called_once()
+    assert pipe.set_json_if_newer.call_count == 2
+    # A geração do seller é incrementada uma única vez para o lote
+    pipe.incr.assert_called_once_with("price-list-gen:1")
+    assert [c.args[1] for c in pipe.publish.call_args_list] == ["price:1:A", "price:1:B"]
+    assert price_cache.local_cache.get("price:1:A") is prices[0]
+    assert price_cache.local_cache.get("price:1:B") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_removes_both_tiers_and_publishes(price_cache, redis_adapter, pipe):
+    await price_cache.set("price:1:A", Price(seller_id="1", sku="A", de=100, por=90))
+    await price_cache.invalidate("1", "A")
+
+    pipe.delete_if_newer.assert_called_once()
+    assert pipe.delete_if_newer.call_args.args[0] == "price:1:A"
+    pipe.incr.assert_called_once_with("price-list-gen:1")
+    pipe.publish.assert_called_once_with(PRICE_INVALIDATION_CHANNEL, "price:1:A")
+    assert price_cache.local_cache.get("price:1:A") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_local_entry_even_if_redis_fails(price_cache, redis_adapter, pipe):
+    price_cache.local_cache.set("price:1:A", Price(seller_id="1", sku="A", de=100, por=90))
+    redis_adapter.pipeline.return_value.__aexit__.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        await price_cache.invalidate("1", "A")
+
+    assert price_cache.local_cache.get("price:1:A") is None
+    pipe.incr.assert_called_once_with("price-list-gen:1")
+    pipe.publish.assert_called_once_with(PRICE_INVALIDATION_CHANNEL, "price:1:A")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_drops_local_entries(price_cache, redis_adapter):
+    price_cache.local_cache.set("price:1:A", "stale")
+    received = asyncio.Event()
+
+    async def subscribe(channel, handler):
+        handler("price:1:A")
+        received.set()
+        await asyncio.sleep(3600)
+
+    redis_adapter.subscribe.side_effect = subscribe
+
+    price_cache.start_invalidation_listener()
+    await asyncio.wait_for(received.wait(), timeout=1)
+    await price_cache.stop_invalidation_listener()
+
+    assert price_cache.local_cache.get("price:1:A") is None
+    assert price_cache._listener_task is None
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_local_tier_then_single_mget(price_cache, redis_adapter):
+    local_price = Price(seller_id="1", sku="A", de=100, por=90)
+    price_cache.local_cache.set("price:1:A", local_price)
+    redis_adapter.mget_json.return_value = [{"seller_id": "1", "sku": "B", "de": 10, "por": 9}, None]
+
+    found = await price_cache.get_many(["price:1:A", "price:1:B", "price:1:C"])
+
+    redis_adapter.mget_json.assert_awaited_once_with(["price:1:B", "price:1:C"])
+    assert found["price:1:A"] is local_price
+    assert found["price:1:B"].sku == "B"
+    assert found["price:1:C"] is None
+    assert price_cache.stats()["redis"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_set_many_writes_single_batch(price_cache, redis_adapter, pipe):
+    prices = [Price(seller_id="1", sku="A", de=100, por=90), Price(seller_id="1", sku="B", de=10, por=9)]
+    pipe.results = [True, False, True]
+
+    await price_cache.set_many(prices, tombstone_keys=["price:1:C"])
+
+    redis_adapter.pipeline.assert_called_once()
+    assert [c.args[0] for c in pipe.set_json_if_newer.call_args_list] == ["price:1:A", "price:1:B"]
+    pipe.set_json.assert_called_once_with("price:1:C", {"tombstone": True}, 30, nx=True)
+    assert price_cache.local_cache.get("price:1:A") is prices[0]
+    assert price_cache.local_cache.get("price:1:B") is None
+    assert price_cache.local_cache.get("price:1:C") is TOMBSTONE
+
+
+@pytest.mark.asyncio
+async def test_set_many_without_entries_skips_redis(price_cache, redis_adapter):
+    await price_cache.set_many([], tombstone_keys=[])
+    redis_adapter.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_load_coalesces_concurrent_misses(price_cache, redis_adapter):
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return Price(seller_id="1", sku="A", de=100, por=90)
+
+    prices = await asyncio.gather(*(price_cache.load("price:1:A", loader) for _ in range(20)))
+
+    assert calls == 1
+    assert all(price.sku == "A" for price in prices)
+    redis_adapter.set_json_if_newer.assert_awaited_once()
+    redis_adapter.acquire_lock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_not_found_is_not_cached(price_cache, redis_adapter):
+    async def loader():
+        return None
+
+    assert await price_cache.load("price:1:A", loader) is None
+    redis_adapter.set_json_if_newer.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_not_found_writes_tombstone(price_cache, redis_adapter, pipe):
+    pipe.results = [True]
+
+    assert await price_cache.load("price:1:A", AsyncMock(return_value=None)) is None
+
+    pipe.set_json.assert_called_once_with("price:1:A", {"tombstone": True}, 30, nx=True)
+    assert await price_cache.get("price:1:A") is TOMBSTONE
+    redis_adapter.get_json.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_tombstones_disabled(redis_adapter):
+    price_cache = PriceCacheService(redis_adapter, LocalCacheAdapter(), tombstone_ttl_seconds=0)
+
+    assert await price_cache.load("price:1:A", AsyncMock(return_value=None)) is None
+    redis_adapter.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_recognizes_tombstone_from_redis(price_cache, redis_adapter):
+    redis_adapter.get_json.return_value = {"tombstone": True}
+
+    assert await price_cache.get("price:1:A") is TOMBSTONE
+    assert await price_cache.get("price:1:A") is TOMBSTONE
+    redis_adapter.get_json.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_through_replaces_tombstone(price_cache, redis_adapter, pipe):
+    price_cache.local_cache.set("price:1:A", TOMBSTONE)
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    pipe.results = [True, 1]
+
+    await price_cache.write_through(price)
+
+    assert await price_cache.get("price:1:A") is price
+
+
+@pytest.mark.asyncio
+async def test_write_through_created_replaces_delete_and_tombstone(price_cache, redis_adapter, pipe):
+    price_cache.local_cache.set("price:1:A", TOMBSTONE)
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    pipe.results = [True, 1, 1]
+
+    await price_cache.write_through(price, created=True)
+
+    # A versão do delete anterior não impede a gravação do preço recriado
+    pipe.set_json_if_newer_or_absent.assert_called_once_with(
+        "price:1:A", pack_price(price), PriceCacheService.version_of(price), {"tombstone": True}, 300
+    )
+    pipe.set_json_if_newer.assert_not_called()
+    assert await price_cache.get("price:1:A") is price
+
+
+@pytest.mark.asyncio
+async def test_write_through_many_created_skus(price_cache, pipe):
+    prices = [Price(seller_id="1", sku="A", de=100, por=90), Price(seller_id="1", sku="B", de=100, por=80)]
+    pipe.results = [True, True, 1, 1, 1]
+
+    await price_cache.write_through_many(prices, created_skus=["B"])
+
+    assert [c.args[0] for c in pipe.set_json_if_newer.call_args_list] == ["price:1:A"]
+    assert [c.args[0] for c in pipe.set_json_if_newer_or_absent.call_args_list] == ["price:1:B"]
+
+
+@pytest.mark.asyncio
+async def test_load_with_lock_sees_tombstone_from_other_replica(redis_adapter):
+    price_cache = PriceCacheService(redis_adapter, LocalCacheAdapter(), lock_enabled=True)
+    redis_adapter.acquire_lock.return_value = "token"
+    redis_adapter.get_json.return_value = {"tombstone": True}
+    loader = AsyncMock()
+
+    assert await price_cache.load("price:1:A", loader) is None
+    loader.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_with_lock_acquired(redis_adapter):
+    price_cache = PriceCacheService(redis_adapter, LocalCacheAdapter(), lock_enabled=True)
+    redis_adapter.acquire_lock.return_value = "token"
+    redis_adapter.get_json.return_value = None
+
+    async def loader():
+        return Price(seller_id="1", sku="A", de=100, por=90)
+
+    price = await price_cache.load("price:1:A", loader)
+
+    assert price.sku == "A"
+    redis_adapter.acquire_lock.assert_awaited_once_with("lock:price:1:A", 3.0)
+    redis_adapter.release_lock.assert_awaited_once_with("lock:price:1:A", "token")
+    redis_adapter.set_json_if_newer.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_load_waits_for_replica_holding_lock(redis_adapter):
+    price_cache = PriceCacheService(redis_adapter, LocalCacheAdapter(), lock_enabled=True, lock_poll_interval_seconds=0)
+    redis_adapter.acquire_lock.return_value = None
+    redis_adapter.get_json.side_effect = [None, {"seller_id": "1", "sku": "A", "de": 100, "por": 90}]
+    loader = AsyncMock()
+
+    price = await price_cache.load("price:1:A", loader)
+
+    assert price.por == 90
+    loader.assert_not_awaited()
+    redis_adapter.release_lock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_load_falls_back_to_loader_when_lease_expires(redis_adapter):
+    price_cache = PriceCacheService(
+        redis_adapter, LocalCacheAdapter(), lock_enabled=True, lock_lease_seconds=0.01, lock_poll_interval_seconds=0
+    )
+    redis_adapter.acquire_lock.return_value = None
+    redis_adapter.get_json.return_value = None
+    loader = AsyncMock(return_value=Price(seller_id="1", sku="A", de=100, por=90))
+
+    price = await price_cache.load("price:1:A", loader)
+
+    assert price.sku == "A"
+    loader.assert_awaited_once()
+
+
+def test_listing_key_normalizes_params():
+    key = PriceCacheService.listing_key("1", 3, {"filters": {"sku": "A"}, "limit": 50, "offset": 0, "page": None})
+
+    assert key.startswith("price-list:1:3:")
+    assert key == PriceCacheService.listing_key("1", 3, {"offset": 0, "limit": 50, "filters": {"sku": "A"}})
+    assert key != PriceCacheService.listing_key("1", 4, {"offset": 0, "limit": 50, "filters": {"sku": "A"}})
+    assert PriceCacheService.listing_key("1", 3, {"sort": [["de", 1], ["por", -1]]}) != PriceCacheService.listing_key(
+        "1", 3, {"sort": [["por", -1], ["de", 1]]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_generation(price_cache, redis_adapter):
+    redis_adapter.get_str.side_effect = [None, "7"]
+
+    assert await price_cache.get_generation("1") == 0
+    assert await price_cache.get_generation("1") == 7
+    redis_adapter.get_str.assert_awaited_with("price-list-gen:1")
+
+
+@pytest.mark.asyncio
+async def test_listing_round_trip(price_cache, redis_adapter):
+    prices = [Price(seller_id="1", sku="A", de=100, por=90), Price(seller_id="1", sku="B", de=200, por=150)]
+    params = {"filters": {"seller_id": "1"}, "limit": 50, "offset": 0}
+
+    await price_cache.set_listing("1", 2, params, prices)
+
+    key, stored = redis_adapter.set_json.call_args.args
+    assert key == PriceCacheService.listing_key("1", 2, params)
+    assert redis_adapter.set_json.call_args.kwargs == {"expires_in_seconds": 60}
+
+    redis_adapter.get_json.side_effect = [stored, None]
+    assert [price.sku for price in await price_cache.get_listing("1", 2, params)] == ["A", "B"]
+    assert await price_cache.get_listing("1", 3, params) is None
+    assert price_cache.stats()["listing"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_disabled(redis_adapter):
+    price_cache = PriceCacheService(redis_adapter, policies=CachePolicyRegistry({"price-list": {"ttl_seconds": 0}}))
+
+    await price_cache.set_listing("1", 0, {}, [Price(seller_id="1", sku="A", de=100, por=90)])
+
+    redis_adapter.set_json.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_with_loader_refreshes_price_near_expiry(price_cache, redis_adapter, pipe):
+    price = Price(seller_id="1", sku="A", de=100, por=90)
+    pipe.results = [pack_price(price), 12.5]
+    redis_adapter.set_json_if_newer.return_value = True
+    loader = AsyncMock(return_value=Price(seller_id="1", sku="A", de=100, por=80))
+
+    cached = await price_cache.get("price:1:A", loader)
+    await asyncio.gather(*price_cache._refresh_tasks)
+
+    assert cached.por == 90
+    pipe.get_json.assert_called_once_with("price:1:A")
+    pipe.ttl.assert_called_once_with("price:1:A")
+    loader.assert_awaited_once()
+    assert redis_adapter.set_json_if_newer.call_args.kwargs == {"expires_in_seconds": 300}
+    assert price_cache.local_cache.get("price:1:A").por == 80
+    assert price_cache.stats()["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_with_loader_does_not_refresh_fresh_price(price_cache, pipe):
+    pipe.results = [pack_price(Price(seller_id="1", sku="A", de=100, por=90)), 250.0]
+    loader = AsyncMock()
+
+    await price_cache.get("price:1:A", loader)
+
+    assert not price_cache._refresh_tasks
+    loader.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_with_loader_does_not_refresh_tombstone(price_cache, pipe):
+    pipe.results = [{"tombstone": True}, 5.0]
+    loader = AsyncMock()
+
+    assert await price_cache.get("price:1:Z", loader) is TOMBSTONE
+    assert not price_cache._refresh_tasks
+
+
+@pytest.mark.asyncio
+async def test_metrics_by_key_family(price_cache, redis_adapter, pipe):
+    redis_adapter.get_json.return_value = None
+    redis_adapter.set_json_if_newer.return_value = True
+    pipe.results = [True, 1, 1]
+
+    await price_cache.load("price:1:A", AsyncMock(return_value=Price(seller_id="1", sku="A", de=100, por=90)))
+    await price_cache.get_listing("1", 0, {})
+    await price_cache.write_through(Price(seller_id="1", sku="B", de=100, por=90))
+    await price_cache.invalidate("1", "B")
+
+    families = price_cache.metrics.snapshot()
+    assert families["price"]["counters"] == {"sets": 2, "invalidations": 1}
+    assert families["price"]["latency"]["load"]["count"] == 1
+    assert families["price-list"]["counters"] == {"misses": 1, "invalidations": 2}
+    assert families["price-list"]["latency"]["get"]["count"] == 1
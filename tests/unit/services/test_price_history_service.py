@@ -1,7 +1,10 @@
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.api.common.schemas import Paginator
+from app.common.exceptions.export_exceptions import InvalidExportPeriodException
 from app.common.exceptions.price_exceptions import PriceNotFoundException
 from app.services.price_history_service import PriceHistoryService
 
@@ -18,7 +21,7 @@ def service(repository):
 
 @pytest.mark.asyncio
 async def test_get_by_seller_id_and_sku_success(service, repository):
-    paginator = MagicMock()
+    paginator = Paginator(request_path="/")
     fake_history = [MagicMock(), MagicMock()]
     repository.find.return_value = fake_history
     result = await service.get_by_seller_id_and_sku("1", "A", paginator)
@@ -26,9 +29,38 @@ async def test_get_by_seller_id_and_sku_success(service, repository):
     assert result == fake_history
 
 
+@pytest.mark.asyncio
+async def test_get_by_seller_id_and_sku_bounded_by_retention(repository, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.price_history_service.utcnow", lambda: datetime(2025, 3, 15, 10, tzinfo=timezone.utc)
+    )
+    service = PriceHistoryService(repository, retention_months=24)
+    repository.find.return_value = [MagicMock()]
+
+    await service.get_by_seller_id_and_sku("1", "A", Paginator(request_path="/"))
+    await service.get_last_n_prices("1", "A", n=2)
+
+    # Somente as partições mantidas: a partir do início do mês, 24 meses antes do atual
+    for call in repository.find.call_args_list:
+        assert call.kwargs["filters"].to_query_dict() == {
+            "seller_id": "1",
+            "sku": "A",
+            "registered_at": {"$gte": datetime(2023, 3, 1, tzinfo=timezone.utc)},
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_by_seller_id_and_sku_without_retention_is_unbounded(service, repository):
+    repository.find.return_value = [MagicMock()]
+
+    await service.get_by_seller_id_and_sku("1", "A", Paginator(request_path="/"))
+
+    assert repository.find.call_args.kwargs["filters"].to_query_dict() == {"seller_id": "1", "sku": "A"}
+
+
 @pytest.mark.asyncio
 async def test_get_by_seller_id_and_sku_not_found(service, repository):
-    paginator = MagicMock()
+    paginator = Paginator(request_path="/")
     repository.find.return_value = []
     with pytest.raises(PriceNotFoundException):
         await service.get_by_seller_id_and_sku("1", "A", paginator)
@@ -43,8 +75,49 @@ async def test_get_last_n_prices_success(service, repository):
     assert result == fake_history
 
 
+@pytest.mark.asyncio
+async def test_get_last_n_prices_drops_lookahead_row(service, repository):
+    repository.find.return_value = [MagicMock(), MagicMock(), MagicMock()]
+
+    result = await service.get_last_n_prices("1", "A", n=2)
+
+    assert repository.find.call_args.kwargs["limit"] == 3
+    assert result == repository.find.return_value[:2]
+
+
 @pytest.mark.asyncio
 async def test_get_last_n_prices_not_found(service, repository):
     repository.find.return_value = []
     with pytest.raises(PriceNotFoundException):
         await service.get_last_n_prices("1", "A", n=2)
+
+
+def test_export_streams_seller_history_in_index_order(service, repository):
+    repository.stream = MagicMock()
+    service.export_batch_size = 500
+    start, end = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    result = service.export("1", skus=["A", "B"], start=start, end=end)
+
+    assert result is repository.stream.return_value
+    filters = repository.stream.call_args.args[0]
+    assert filters.to_query_dict() == {
+        "seller_id": "1",
+        "sku": {"$in": ["A", "B"]},
+        "registered_at": {"$gte": start, "$lt": end},
+    }
+    assert repository.stream.call_args.kwargs == {"sort": {"sku": 1, "registered_at": -1}, "batch_size": 500}
+
+
+def test_export_without_skus_and_period(service, repository):
+    repository.stream = MagicMock()
+
+    service.export("1")
+
+    assert repository.stream.call_args.args[0].to_query_dict() == {"seller_id": "1"}
+
+
+def test_export_with_invalid_period(service, repository):
+    moment = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with pytest.raises(InvalidExportPeriodException):
+        service.export("1", start=moment, end=moment)
@@ -0,0 +1,187 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.price_history_model import PriceHistory
+from app.services.price_history_service import PriceHistoryService
+from app.services.price_history_writer import PriceHistoryWriter
+
+
+def history(sku: str) -> PriceHistory:
+    return PriceHistory(seller_id="1", sku=sku, de=200, por=150)
+
+
+@pytest.fixture
+def history_service():
+    service = AsyncMock(spec=PriceHistoryService)
+    # Fora de uma unidade de trabalho, a função é executada na hora
+    service.after_commit = MagicMock(side_effect=lambda callback: callback())
+    return service
+
+
+@pytest.fixture
+def buffered_writer(history_service):
+    return PriceHistoryWriter(history_service, mode="buffered", batch_size=2, max_buffer_size=4, flush_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_durable_writes_inline(history_service):
+    writer = PriceHistoryWriter(history_service)
+    writer.start()
+
+    await writer.write(history("A"))
+    await writer.write_many([history("B"), history("C")])
+
+    history_service.create.assert_awaited_once()
+    assert [item.sku for item in history_service.insert_many.await_args.args[0]] == ["B", "C"]
+    history_service.after_commit.assert_not_called()
+    assert writer.stats()["inline"] == 3
+
+
+@pytest.mark.asyncio
+async def test_buffered_writes_inline_until_started(buffered_writer, history_service):
+    await buffered_writer.write(history("A"))
+
+    history_service.create.assert_awaited_once()
+    assert buffered_writer.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_buffered_enqueues_after_commit_and_flushes_batches(buffered_writer, history_service):
+    buffered_writer.start()
+
+    await buffered_writer.write(history("A"))
+    history_service.create.assert_not_called()
+    assert buffered_writer.stats()["pending"] == 1
+
+    # batch_size atingido: o buffer é gravado em segundo plano, sem esperar flush_seconds
+    await buffered_writer.write_many([history("B"), history("C")])
+    await asyncio.sleep(0.01)
+
+    batches = [[item.sku for item in call.args[0]] for call in history_service.insert_many.await_args_list]
+    assert batches == [["A", "B"], ["C"]]
+    assert buffered_writer.stats()["pending"] == 0
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_buffered_flushes_on_interval(history_service):
+    writer = PriceHistoryWriter(history_service, mode="buffered", batch_size=100, flush_seconds=0.01)
+    writer.start()
+
+    await writer.write(history("A"))
+    await asyncio.sleep(0.05)
+
+    history_service.insert_many.assert_awaited_once()
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_buffered_waits_for_commit(buffered_writer, history_service):
+    callbacks = []
+    history_service.after_commit.side_effect = callbacks.append
+    buffered_writer.start()
+
+    await buffered_writer.write(history("A"))
+    # Unidade de trabalho ainda em andamento (ou desfeita): nada no buffer
+    assert buffered_writer.stats()["pending"] == 0
+
+    callbacks[0]()
+    assert buffered_writer.stats()["pending"] == 1
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_falls_back_to_inline(buffered_writer, history_service):
+    buffered_writer.batch_size = 100
+    buffered_writer.start()
+    await buffered_writer.write_many([history(sku) for sku in "ABCD"])
+
+    await buffered_writer.write(history("E"))
+
+    history_service.create.assert_awaited_once()
+    assert buffered_writer.stats()["pending"] == 4
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_buffer_and_writes_inline_afterwards(buffered_writer, history_service):
+    buffered_writer.start()
+    await buffered_writer.write(history("A"))
+
+    await buffered_writer.stop()
+
+    assert [item.sku for item in history_service.insert_many.await_args.args[0]] == ["A"]
+    await buffered_writer.write(history("B"))
+    history_service.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records_in_buffer(buffered_writer, history_service):
+    buffered_writer.start()
+    await buffered_writer.write(history("A"))
+    history_service.insert_many.side_effect = RuntimeError("banco indisponível")
+
+    with pytest.raises(RuntimeError):
+        await buffered_writer.flush()
+
+    assert buffered_writer.stats()["pending"] == 1
+    assert buffered_writer.stats()["failures"] == 1
+
+    history_service.insert_many.side_effect = None
+    assert await buffered_writer.flush() == 1
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_poison_batch_falls_back_to_rows_after_retries(buffered_writer, history_service):
+    buffered_writer.start()
+    await buffered_writer.write_many([history("A"), history("B")])
+    history_service.insert_many.side_effect = RuntimeError("valor inválido")
+    history_service.create.side_effect = [RuntimeError("valor inválido"), None]
+
+    for _ in range(buffered_writer.max_batch_retries - 1):
+        with pytest.raises(RuntimeError):
+            await buffered_writer.flush()
+    assert await buffered_writer.flush() == 1
+
+    assert [call.args[0].sku for call in history_service.create.await_args_list] == ["A", "B"]
+    stats = buffered_writer.stats()
+    assert stats["pending"] == 0
+    assert stats["dead_letters"] == 1
+    assert stats["failures"] == buffered_writer.max_batch_retries
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_database_keeps_rows_in_buffer(buffered_writer, history_service):
+    buffered_writer.max_batch_retries = 1
+    buffered_writer.start()
+    await buffered_writer.write_many([history("A"), history("B")])
+    history_service.insert_many.side_effect = OSError("conexão recusada")
+    history_service.create.side_effect = OSError("conexão recusada")
+
+    with pytest.raises(OSError):
+        await buffered_writer.flush()
+
+    assert buffered_writer.stats()["pending"] == 2
+    assert buffered_writer.stats()["dead_letters"] == 0
+    history_service.create.side_effect = None
+    history_service.insert_many.side_effect = None
+    assert await buffered_writer.flush() == 2
+    await buffered_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_logs_failures_instead_of_raising(buffered_writer, history_service):
+    buffered_writer.start()
+    await buffered_writer.write(history("A"))
+    history_service.insert_many.side_effect = OSError("conexão recusada")
+    history_service.create.side_effect = OSError("conexão recusada")
+
+    await buffered_writer.stop()
+
+    stats = buffered_writer.stats()
+    assert stats["pending"] == 1
+    assert stats["failures"] == buffered_writer.max_batch_retries
@@ -1,15 +1,19 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.api.common.schemas import Paginator
 from app.common.exceptions import BadRequestException, NotFoundException
-from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter
+from app.integrations.cache.redis_asyncio_adapter import RedisAsyncioAdapter, RedisPipeline
 from app.integrations.queue.rabbitmq_adapter import RabbitMQProducer
 from app.models import Price
 from app.repositories import PriceRepository
 from app.repositories.price_history_repository import PriceHistoryRepository
 from app.services import PriceService
+from app.services.price_cache_service import pack_price
 from app.services.price_history_service import PriceHistoryService
+from app.services.price_history_writer import PriceHistoryWriter
 
 
 class TestPriceService:
@@ -22,6 +26,12 @@ class TestPriceService:
         async def create(entity):
             return entity
 
+        # Mock para insert_if_absent: o preço do seller "1" e sku "A" já existe
+        async def insert_if_absent(entity):
+            if entity.seller_id == "1" and entity.sku == "A":
+                return None
+            return entity
+
         # Mock para find_by_seller_id_and_sku
         async def find_by_seller_id_and_sku(seller_id, sku):
             if seller_id == "1" and sku == "A":
@@ -52,11 +62,25 @@ class TestPriceService:
         async def delete_by_seller_id_and_sku(seller_id, sku):
             return None
 
+        # Mock para find_by_seller_id_and_skus
+        async def find_by_seller_id_and_skus(seller_id, skus):
+            prices = [await find_by_seller_id_and_sku(seller_id, sku) for sku in skus]
+            return [price for price in prices if price]
+
+        # Mock para upsert_many
+        async def upsert_many(entities):
+            return [entity.model_copy(update={"id": index + 10}) for index, entity in enumerate(entities)]
+
         # Patch dos métodos da classe pai
+        repository.find_by_seller_id_and_skus.side_effect = find_by_seller_id_and_skus
+        repository.upsert_many.side_effect = upsert_many
         repository.create.side_effect = create
+        repository.insert_if_absent.side_effect = insert_if_absent
         repository.find_by_seller_id_and_sku.side_effect = find_by_seller_id_and_sku
         repository.update_by_seller_id_and_sku.side_effect = update_by_seller_id_and_sku
         repository.delete_by_seller_id_and_sku.side_effect = delete_by_seller_id_and_sku
+        # Sem banco, a unidade de trabalho é considerada confirmada: os callbacks rodam na hora
+        repository.after_commit = MagicMock(side_effect=lambda callback: callback())
 
         return repository
 
@@ -66,6 +90,10 @@ class TestPriceService:
         price_history_repo = AsyncMock(spec=PriceHistoryRepository)
         price_history_service = AsyncMock(spec=PriceHistoryService)
         redis_adapter = AsyncMock(spec=RedisAsyncioAdapter)
+        # Os comandos do pipeline são somente enfileirados (síncronos): executados na saída do bloco
+        pipe = MagicMock(spec=RedisPipeline)
+        pipe.results = [True, 1, 1]
+        redis_adapter.pipeline.return_value.__aenter__.return_value = pipe
         alert_queue_producer = MagicMock(spec=RabbitMQProducer)
         suggestion_queue_producer = MagicMock(spec=RabbitMQProducer)
         return PriceService(
@@ -77,10 +105,18 @@ class TestPriceService:
             suggestion_queue_producer=suggestion_queue_producer,
         )
 
+    @pytest.fixture
+    def pipe(self, service):
+        """Pipeline do adaptador Redis: os retornos dos comandos são definidos em pipe.results."""
+        pipe = service.redis_adapter.pipeline.return_value.__aenter__.return_value
+        pipe.results = []
+        return pipe
+
     @pytest.mark.asyncio
-    async def test_get_by_seller_id_and_sku_found(self, service, repository_mock):
+    async def test_get_by_seller_id_and_sku_found(self, service, repository_mock, pipe):
         """Deve retornar o preço quando seller_id e sku existem."""
-        service.redis_adapter.get_json.return_value = None
+        # Valor e tempo restante da chave, lidos juntos para o refresh-ahead
+        pipe.results = [None, None]
 
         price = await service.get_by_seller_id_and_sku("1", "A")
 
@@ -93,34 +129,160 @@ class TestPriceService:
         repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
 
     @pytest.mark.asyncio
-    async def test_get_by_seller_id_and_sku_not_found(self, service, repository_mock):
+    async def test_get_by_seller_id_and_sku_not_found(self, service, repository_mock, pipe):
         """Deve lançar NotFoundException quando não encontrar o preço."""
-        service.redis_adapter.get_json.return_value = None
+        pipe.results = [None, None]
 
         with pytest.raises(NotFoundException):
             await service.get_by_seller_id_and_sku("1", "Z")
 
         repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "Z")
+        pipe.set_json.assert_called_once_with("price:1:Z", {"tombstone": True}, 30, nx=True)
+
+    @pytest.mark.asyncio
+    async def test_get_by_seller_id_and_sku_tombstone_skips_database(self, service, repository_mock, pipe):
+        """Deve lançar NotFoundException sem consultar o banco quando o cache indicar que o preço não existe."""
+        pipe.results = [{"tombstone": True}, 25.0]
+
+        with pytest.raises(NotFoundException):
+            await service.get_by_seller_id_and_sku("1", "Z")
+
+        repository_mock.find_by_seller_id_and_sku.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_by_seller_id_and_skus_loads_only_cache_misses(self, service, repository_mock, pipe):
+        """Deve resolver o cache com um MGET e buscar no banco somente os skus ausentes."""
+        service.redis_adapter.mget_json.return_value = [
+            {"seller_id": "1", "sku": "B", "de": 50, "por": 40},
+            None,
+            None,
+        ]
+        repository_mock.find_by_seller_id_and_skus.return_value = [
+            Price(id=1, seller_id="1", sku="A", de=100, por=90),
+        ]
+
+        prices = await service.get_by_seller_id_and_skus("1", ["B", "A", "Z", "A"])
+
+        assert list(prices) == ["B", "A", "Z"]
+        assert prices["B"].por == 40
+        assert prices["A"].por == 90
+        assert prices["Z"] is None
+        service.redis_adapter.mget_json.assert_awaited_once_with(["price:1:B", "price:1:A", "price:1:Z"])
+        repository_mock.find_by_seller_id_and_skus.assert_awaited_once_with("1", ["A", "Z"])
+        # O preço carregado e a lápide do sku inexistente vão ao Redis em uma única ida
+        service.redis_adapter.pipeline.assert_called_once()
+        pipe.set_json_if_newer.assert_called_once()
+        pipe.set_json.assert_called_once_with("price:1:Z", {"tombstone": True}, 30, nx=True)
+
+    @pytest.mark.asyncio
+    async def test_get_by_seller_id_and_skus_skips_tombstones(self, service, repository_mock):
+        """Skus com lápide no cache não devem ser buscados no banco."""
+        service.redis_adapter.mget_json.return_value = [{"tombstone": True}]
+
+        prices = await service.get_by_seller_id_and_skus("1", ["Z"])
+
+        assert prices == {"Z": None}
+        repository_mock.find_by_seller_id_and_skus.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_by_seller_id_and_sku_concurrent_misses_hit_database_once(self, service, repository_mock, pipe):
+        """Requisições concorrentes sem cache devem gerar uma única consulta ao banco."""
+        import asyncio
+
+        pipe.results = [None, None]
+
+        prices = await asyncio.gather(*(service.get_by_seller_id_and_sku("1", "A") for _ in range(10)))
+
+        assert all(price.sku == "A" for price in prices)
+        repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
+
+    @pytest.mark.asyncio
+    async def test_get_filtered_caches_seller_listing(self, service, repository_mock):
+        """Deve consultar o banco na primeira listagem e gravá-la sob a geração atual do seller."""
+        service.redis_adapter.get_str.return_value = "4"
+        service.redis_adapter.get_json.return_value = None
+        repository_mock.find.return_value = [Price(seller_id="1", sku="A", de=100, por=90)]
+        paginator = Paginator(request_path="/seller/v2/precos", limit=10, offset=0, sort="por:desc")
+
+        results = await service.get_filtered(paginator=paginator, filters={"seller_id": "1", "por__lt": 100.0})
+
+        assert [price.sku for price in results] == ["A"]
+        repository_mock.find.assert_awaited_once()
+        key = service.redis_adapter.set_json.call_args.args[0]
+        assert key.startswith("price-list:1:4:")
+
+    @pytest.mark.asyncio
+    async def test_get_filtered_returns_cached_listing(self, service, repository_mock):
+        """Deve responder a listagem pelo cache sem consultar o banco."""
+        service.redis_adapter.get_str.return_value = None
+        service.redis_adapter.get_json.return_value = [pack_price(Price(seller_id="1", sku="A", de=100, por=90))]
+        paginator = Paginator(request_path="/seller/v2/precos")
+
+        results = await service.get_filtered(paginator=paginator, filters={"seller_id": "1", "sku": None})
+
+        assert [price.sku for price in results] == ["A"]
+        repository_mock.find.assert_not_called()
+
+    def test_export_catalog_streams_seller_prices_by_sku(self, service, repository_mock):
+        """A exportação percorre os preços do seller no banco, em lotes, sem passar pelo cache."""
+        service.export_batch_size = 500
+
+        result = service.export_catalog("1")
+
+        assert result is repository_mock.stream.return_value
+        filters = repository_mock.stream.call_args.args[0]
+        assert filters.to_query_dict() == {"seller_id": "1"}
+        assert repository_mock.stream.call_args.kwargs == {"sort": {"sku": 1}, "batch_size": 500}
+        service.redis_adapter.get_json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_filtered_with_count_skips_listing_cache(self, service, repository_mock):
+        """O total não é cacheado: listagens com contagem vão ao banco."""
+        repository_mock.find_with_total.return_value = ([Price(seller_id="1", sku="A", de=100, por=90)], 1)
+        paginator = Paginator(request_path="/seller/v2/precos", count="exact")
+
+        results = await service.get_filtered(paginator=paginator, filters={"seller_id": "1"})
+
+        assert [price.sku for price in results] == ["A"]
+        assert paginator.total == 1
+        service.redis_adapter.get_json.assert_not_called()
+        service.redis_adapter.set_json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_filtered_requires_seller_id(self, service, repository_mock):
+        """Não deve listar preços sem o seller_id, o que varreria os preços de todos os sellers."""
+        with pytest.raises(BadRequestException):
+            await service.get_filtered(paginator=Paginator(request_path="/seller/v2/precos"), filters={"sku": "A"})
+
+        repository_mock.find.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_create_price_success(self, service, repository_mock):
+    async def test_create_price_success(self, service, repository_mock, pipe):
         price_create = Price(seller_id="2", sku="B", de=200, por=180)
+        pipe.results = [True, 1, 1]
         created_price = await service.create(price_create)
         assert created_price is not None
         assert created_price.seller_id == "2"
         assert created_price.sku == "B"
         assert created_price.de == 200
         assert created_price.por == 180
-        repository_mock.find_by_seller_id_and_sku.assert_called_once_with("2", "B")
-        repository_mock.create.assert_called_once()
+        # A unicidade é verificada pelo banco na inserção, sem consulta prévia
+        repository_mock.find_by_seller_id_and_sku.assert_not_called()
+        repository_mock.insert_if_absent.assert_called_once()
+        # Preço recém-criado: substitui a lápide e a remoção anterior no cache
+        pipe.set_json_if_newer_or_absent.assert_called_once()
+        pipe.set_json_if_newer.assert_not_called()
+        pipe.publish.assert_called_once_with("price:invalidation", "price:2:B")
 
     @pytest.mark.asyncio
     async def test_create_price_already_exists(self, service, repository_mock):
         price_create = Price(seller_id="1", sku="A", de=100, por=90)
         with pytest.raises(BadRequestException):
             await service.create(price_create)
-        repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
-        repository_mock.create.assert_not_called()
+        repository_mock.insert_if_absent.assert_called_once()
+        service.price_history_service.create.assert_not_called()
+        exc_type = repository_mock.unit_of_work.return_value.__aexit__.call_args.args[0]
+        assert issubclass(exc_type, BadRequestException)
 
     @pytest.mark.asyncio
     async def test_create_price_invalid_price(self, service, repository_mock):
@@ -128,16 +290,89 @@ class TestPriceService:
         with pytest.raises(BadRequestException) as excinfo:
             await service.create(price_create)
         assert any("de" in str(detail.message) for detail in excinfo.value.details)
-        repository_mock.create.assert_not_called()
+        repository_mock.insert_if_absent.assert_not_called()
         price_create = Price(seller_id="2", sku="B", de=100, por=0)
         with pytest.raises(BadRequestException) as excinfo:
             await service.create(price_create)
         assert any("por" in str(detail.message) for detail in excinfo.value.details)
-        repository_mock.create.assert_not_called()
+        repository_mock.insert_if_absent.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert_batch(self, service, repository_mock, pipe):
+        """Os itens válidos são gravados com um único upsert e um único insert de histórico."""
+        prices = [
+            Price(seller_id="1", sku="A", de=150, por=120),
+            Price(seller_id="1", sku="B", de=200, por=180),
+            Price(seller_id="1", sku="C", de=200, por=0),
+            Price(seller_id="1", sku="B", de=300, por=250),
+        ]
+        pipe.results = [True, True, 1, 1, 1]
+
+        results = await service.upsert_batch("1", prices)
+
+        assert [(result.sku, result.status) for result in results] == [
+            ("A", "updated"),
+            ("B", "created"),
+            ("C", "rejected"),
+            ("B", "rejected"),
+        ]
+        assert results[0].price.id == 10
+        assert results[2].details[0].field == "por"
+        assert results[3].details[0].field == "sku"
+        repository_mock.find_by_seller_id_and_skus.assert_awaited_once_with("1", ["A", "B"])
+        repository_mock.upsert_many.assert_awaited_once()
+        histories = service.price_history_service.insert_many.await_args.args[0]
+        assert [history.sku for history in histories] == ["A", "B"]
+        repository_mock.unit_of_work.assert_called_once()
+        assert [c.args[0] for c in pipe.set_json_if_newer.call_args_list] == ["price:1:A"]
+        assert [c.args[0] for c in pipe.set_json_if_newer_or_absent.call_args_list] == ["price:1:B"]
+
+    @pytest.mark.asyncio
+    async def test_upsert_batch_rejects_pending_alert_and_flags_variation(self, service, repository_mock, pipe):
+        async def find_by_seller_id_and_skus(seller_id, skus):
+            return [
+                Price(seller_id="1", sku="A", de=100, por=90, alerta_pendente=True),
+                Price(seller_id="1", sku="B", de=100, por=90),
+            ]
+
+        repository_mock.find_by_seller_id_and_skus.side_effect = find_by_seller_id_and_skus
+        pipe.results = [True, 1, 1]
+        prices = [Price(seller_id="1", sku="A", de=150, por=120), Price(seller_id="1", sku="B", de=500, por=400)]
+
+        results = await service.upsert_batch("1", prices)
+
+        assert [result.status for result in results] == ["rejected", "updated"]
+        assert results[0].details[0].field == "alerta_pendente"
+        assert repository_mock.upsert_many.await_args.args[0][0].alerta_pendente is True
+        repository_mock.after_commit.assert_called_once()
+        await asyncio.sleep(0)  # o alerta é enviado em uma tarefa
+        service.alert_queue_producer.produce.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_upsert_batch_rolled_back_sends_no_alert(self, service, repository_mock):
+        repository_mock.after_commit.side_effect = None
+        repository_mock.upsert_many.side_effect = RuntimeError("falha no upsert")
+        prices = [Price(seller_id="1", sku="A", de=500, por=400)]
+
+        with pytest.raises(RuntimeError):
+            await service.upsert_batch("1", prices)
+
+        await asyncio.sleep(0)
+        service.alert_queue_producer.produce.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert_batch_all_rejected_skips_database(self, service, repository_mock, pipe):
+        results = await service.upsert_batch("1", [Price(seller_id="1", sku="A", de=-1, por=1)])
+
+        assert results[0].status == "rejected"
+        repository_mock.unit_of_work.assert_not_called()
+        repository_mock.upsert_many.assert_not_called()
+        service.redis_adapter.pipeline.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_update_price_success(self, service, repository_mock):
+    async def test_update_price_success(self, service, repository_mock, pipe):
         price_update = Price(seller_id="1", sku="A", de=150, por=120)
+        pipe.results = [True, 1, 1]
 
         updated_price = await service.update('1', 'A', price_update)
         assert updated_price is not None
@@ -147,6 +382,48 @@ class TestPriceService:
         assert updated_price.por == 120
         repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
         repository_mock.update_by_seller_id_and_sku.assert_called_once_with("1", "A", price_update)
+        # Write-through: o preço atualizado já fica no cache
+        assert service.price_cache.local_cache.get("price:1:A") is updated_price
+
+    @pytest.mark.asyncio
+    async def test_update_price_runs_in_single_unit_of_work(self, service, repository_mock, pipe):
+        """Leitura, atualização e histórico devem compartilhar uma transação; o cache é gravado após o commit."""
+        events = []
+        unit_of_work = repository_mock.unit_of_work.return_value
+        unit_of_work.__aenter__.side_effect = lambda *_: events.append("begin")
+        unit_of_work.__aexit__.side_effect = lambda *_: events.append("commit")
+        service.price_history_service.create.side_effect = lambda *_: events.append("history")
+        pipe.set_json_if_newer.side_effect = lambda *_: events.append("cache")
+        pipe.results = [True, 1, 1]
+
+        await service.update("1", "A", Price(seller_id="1", sku="A", de=150, por=120))
+
+        repository_mock.unit_of_work.assert_called_once()
+        assert events == ["begin", "history", "commit", "cache"]
+
+    @pytest.mark.asyncio
+    async def test_update_price_history_failure_skips_cache(self, service, repository_mock, pipe):
+        """Se o histórico falhar, a transação é desfeita e o cache não recebe o preço."""
+        service.price_history_service.create.side_effect = RuntimeError("falha no histórico")
+
+        with pytest.raises(RuntimeError):
+            await service.update("1", "A", Price(seller_id="1", sku="A", de=150, por=120))
+
+        exc_type = repository_mock.unit_of_work.return_value.__aexit__.call_args.args[0]
+        assert exc_type is RuntimeError
+        pipe.set_json_if_newer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_price_records_history_through_writer(self, service, repository_mock, pipe):
+        """O histórico vai para o history_writer, que decide entre gravar na transação ou no buffer."""
+        service.history_writer = AsyncMock(spec=PriceHistoryWriter)
+        pipe.results = [True, 1, 1]
+
+        await service.update("1", "A", Price(seller_id="1", sku="A", de=150, por=120))
+
+        history = service.history_writer.write.await_args.args[0]
+        assert (history.sku, history.por) == ("A", 120)
+        service.price_history_service.create.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_update_price_not_found(self, service, repository_mock):
@@ -176,6 +453,9 @@ class TestPriceService:
         await service.delete("1", "A")
         repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
         repository_mock.delete_by_seller_id_and_sku.assert_called_once_with("1", "A")
+        pipe = service.redis_adapter.pipeline.return_value.__aenter__.return_value
+        pipe.incr.assert_called_once_with("price-list-gen:1")
+        pipe.publish.assert_called_once_with(service.price_cache.invalidation_channel, "price:1:A")
 
     @pytest.mark.asyncio
     async def test_delete_by_seller_id_and_sku_not_found(self, service, repository_mock):
@@ -188,13 +468,16 @@ class TestPriceService:
     @pytest.mark.asyncio
     async def test_create_price_limite_superior_valores(self, service, repository_mock):
         price_create = Price(seller_id="3", sku="C", de=2**31 - 1, por=2**31 - 1)
-        repository_mock.find_by_seller_id_and_sku.return_value = False
         created_price = await service.create(price_create)
         assert created_price is not None
         assert created_price.de == 2**31 - 1
         assert created_price.por == 2**31 - 1
-        repository_mock.find_by_seller_id_and_sku.assert_called_once_with("3", "C")
-        repository_mock.create.assert_called_once()
+        repository_mock.insert_if_absent.assert_called_once()
+        # write_through: preço, geração das listagens do seller e aviso às réplicas, no mesmo pipeline
+        pipe = service.redis_adapter.pipeline.return_value.__aenter__.return_value
+        pipe.set_json_if_newer_or_absent.assert_called_once()
+        pipe.incr.assert_called_once_with("price-list-gen:3")
+        pipe.publish.assert_called_once_with(service.price_cache.invalidation_channel, "price:3:C")
 
     @pytest.mark.asyncio
     async def test_update_price_limite_superior_valores(self, service, repository_mock):
@@ -215,6 +498,9 @@ class TestPriceService:
         assert updated_price.por == 2**31 - 1
         repository_mock.find_by_seller_id_and_sku.assert_called_once_with("1", "A")
         repository_mock.update_by_seller_id_and_sku.assert_called_once_with("1", "A", price_update)
+        pipe = service.redis_adapter.pipeline.return_value.__aenter__.return_value
+        pipe.incr.assert_called_once_with("price-list-gen:1")
+        pipe.publish.assert_called_once_with(service.price_cache.invalidation_channel, "price:1:A")
 
     @pytest.mark.asyncio
     async def test_find_price_in_cache_hit(self, service):
@@ -257,16 +543,49 @@ class TestPriceService:
 
     @pytest.mark.asyncio
     async def test_detects_variation_triggers_alert(self, service):
-        # Deve retornar True e criar task se variação > 50%
+        # Deve retornar o alerta, sem enviá-lo, se variação > 50%
         entity = Price(seller_id="1", sku="A", de=100, por=200, alerta_pendente=False)
         result = service._detects_variation(100, entity)
-        assert result is True
+        assert result["seller_id"] == "1"
+        assert result["sku"] == "A"
+        assert result["status"] == "pendente"
+        await asyncio.sleep(0)
+        service.alert_queue_producer.produce.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_detects_variation_no_alert(self, service):
         entity = Price(seller_id="1", sku="A", de=100, por=120, alerta_pendente=False)
         result = service._detects_variation(100, entity)
-        assert result is False
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_update_price_variation_sends_alert_after_commit(self, service, repository_mock, pipe):
+        pipe.results = [True, 1, 1]
+        callbacks = []
+        repository_mock.after_commit.side_effect = callbacks.append
+
+        await service.update("1", "A", Price(seller_id="1", sku="A", de=500, por=400))
+
+        await asyncio.sleep(0)
+        service.alert_queue_producer.produce.assert_not_called()
+        for callback in callbacks:
+            callback()
+        await asyncio.sleep(0)
+        alerta = service.alert_queue_producer.produce.call_args.args[0]
+        assert alerta["sku"] == "A"
+
+    @pytest.mark.asyncio
+    async def test_update_price_variation_rolled_back_sends_no_alert(self, service, repository_mock):
+        # O callback de after_commit não é executado quando a unidade de trabalho é desfeita
+        repository_mock.after_commit.side_effect = None
+        service.history_writer.write = AsyncMock(side_effect=RuntimeError("falha no histórico"))
+
+        with pytest.raises(RuntimeError):
+            await service.update("1", "A", Price(seller_id="1", sku="A", de=500, por=400))
+
+        repository_mock.after_commit.assert_called_once()
+        await asyncio.sleep(0)
+        service.alert_queue_producer.produce.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_request_price_suggestion(self, service):
@@ -0,0 +1,50 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.worker.tasks.history_partition_task import HistoryPartitionTask
+
+
+@pytest.fixture
+def repository():
+    repo = AsyncMock()
+    repo.maintain_partitions.return_value = {
+        "created": ["pc_preco_historico_p202701"],
+        "expired": ["pc_preco_historico_p202409"],
+    }
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_process_creates_and_expires_partitions(repository):
+    task = HistoryPartitionTask(repository, months_ahead=3, retention_months=24, archive=True)
+
+    result = await task.process()
+
+    repository.maintain_partitions.assert_awaited_once_with(3, 24, True)
+    assert result == {"created": ["pc_preco_historico_p202701"], "expired": ["pc_preco_historico_p202409"]}
+
+
+@pytest.mark.asyncio
+async def test_process_without_retention_keeps_partitions(repository):
+    task = HistoryPartitionTask(repository, retention_months=0)
+
+    await task.process()
+
+    repository.maintain_partitions.assert_awaited_once_with(3, 0, True)
+
+
+@pytest.mark.asyncio
+async def test_run_survives_failures_and_stops_on_close(repository):
+    task = HistoryPartitionTask(repository, interval_seconds=1)
+
+    async def fail_then_close(months_ahead, retention_months, archive):
+        await task.close()
+        raise RuntimeError("banco indisponível")
+
+    repository.maintain_partitions.side_effect = fail_then_close
+
+    await task.run()
+
+    repository.maintain_partitions.assert_awaited_once()
+    assert task._running is False
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.integrations.cache.cache_policy import CachePolicyRegistry
 from app.worker.tasks.suggest_price_task import SuggestPriceTask
 
 
@@ -50,12 +51,26 @@ async def test_process_sets_cache_and_commits(task, redis_adapter, consumer):
     message.has_value.return_value = True
     task.generate_price_suggestion = AsyncMock(return_value="42.0")
     await task.process(message)
-    redis_adapter.set_json.assert_awaited_with(
-        "suggestion:123", {"status": "done", "suggested_price": "42.0"}, expires_in_seconds=300
-    )
+    redis_adapter.set_json.assert_awaited_once()
+    assert redis_adapter.set_json.call_args.args == ("suggestion:123", {"status": "done", "suggested_price": "42.0"})
+    # TTL da família "suggestion" (300s) com até 60s de variação
+    assert 300 <= redis_adapter.set_json.call_args.kwargs["expires_in_seconds"] <= 360
     consumer.commit_message.assert_called_once_with(message)
 
 
+@pytest.mark.asyncio
+async def test_process_uses_configured_cache_policy(redis_adapter, consumer):
+    policies = CachePolicyRegistry({"suggestion": {"ttl_seconds": 120}})
+    task = SuggestPriceTask(redis_adapter, consumer, "http://fake-ia", "fake-model", cache_policies=policies)
+    message = MagicMock()
+    message.value = {"job_id": "123"}
+    task.generate_price_suggestion = AsyncMock(return_value="42.0")
+
+    await task.process(message)
+
+    assert redis_adapter.set_json.call_args.kwargs == {"expires_in_seconds": 120}
+
+
 @pytest.mark.asyncio
 async def test_run_processes_message(task, consumer):
     # Simula um ciclo do loop com uma mensagem válida e depois para
@@ -12,6 +12,8 @@ def test_worker_container_providers():
     assert container.alert_service is not None
     assert container.create_alert_task is not None
     assert container.suggest_price_task is not None
+    assert container.price_history_repository is not None
+    assert container.history_partition_task is not None
 
 
 def test_worker_container_config():
@@ -26,8 +26,9 @@ def test_init_container_calls_config_and_wire():
 def test_get_tasks_returns_tasks():
     ca_task = MagicMock()
     sp_task = MagicMock()
-    tasks = WorkerMain.get_tasks(create_alert_task=ca_task, suggest_price_task=sp_task)
-    assert ca_task in tasks and sp_task in tasks
+    hp_task = MagicMock()
+    tasks = WorkerMain.get_tasks(create_alert_task=ca_task, suggest_price_task=sp_task, history_partition_task=hp_task)
+    assert ca_task in tasks and sp_task in tasks and hp_task in tasks
 
 
 def test_init_sets_logger_and_signals(worker_main):
@@ -64,14 +65,26 @@ def test_handler_sig_calls_close_and_sys_exit(worker_main):
 async def test_run_calls_init_and_gather(monkeypatch):
     wm = WorkerMain()
     wm.init = MagicMock()
+    wm.prewarm_database = AsyncMock()
     wm.get_tasks = MagicMock(return_value=[AsyncMock(), AsyncMock()])
     wm.tasks = wm.get_tasks()
     monkeypatch.setattr("asyncio.gather", AsyncMock())
     await wm.run()
     wm.init.assert_called_once()
+    wm.prewarm_database.assert_awaited_once()
     assert len(wm.tasks) == 2
 
 
+@pytest.mark.asyncio
+async def test_prewarm_database_opens_configured_connections():
+    sql_client = MagicMock()
+    sql_client.prewarm = AsyncMock()
+
+    await WorkerMain.prewarm_database(sql_client=sql_client, connections=4)
+
+    sql_client.prewarm.assert_awaited_once_with(4)
+
+
 def test_main_guard_runs(monkeypatch):
     import importlib
     import sys